@@ -3,10 +3,14 @@
 from flask import Flask, render_template, jsonify, request
 from flask_cors import CORS
 import json
+import os
 import numpy as np
 from fuzzy_controler.fuzzy_engine import FuzzyController
 from simulation.temporal_simulation import TemporalSimulation
+from simulation.metrics import OnlineMetrics
+from simulation.result_cache import SimulationResultCache
 from mqtt.mqtt_client import MQTTClient
+from mqtt.publisher import BatchPublisher
 import threading
 import time
 
@@ -15,8 +19,15 @@ CORS(app)
 
 # Instâncias globais
 fuzzy_controller = FuzzyController()
+fuzzy_controller.enable_cache(maxsize=1024)  # modo exato: /api/calculate é consultado repetidamente
 mqtt_client = MQTTClient()
-simulation = TemporalSimulation(fuzzy_controller, mqtt_client)
+# A simulação publica em lotes por uma thread de fundo (não espera pelo broker)
+simulation_publisher = BatchPublisher(mqtt_client)
+simulation = TemporalSimulation(fuzzy_controller, simulation_publisher)
+# Resultados de simulações com seed (reproduzíveis) ficam em disco
+result_cache = SimulationResultCache(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.simulation_cache')
+)
 
 # Estado global
 system_state = {
@@ -28,8 +39,13 @@ system_state = {
     'message_count': 0,
     'simulation_data': [],
     'simulation_running': False,
-    'simulation_progress': 0
+    'simulation_progress': 0,
+    'simulation_metrics': None  # OnlineMetrics da simulação em andamento
 }
+# Resolução dos resultados de simulação enviados ao dashboard (minutos)
+DASHBOARD_INTERVAL_MINUTES = 5
+# Protege o histórico de mensagens (requisições em paralelo com threaded=True)
+state_lock = threading.Lock()
 
 @app.route('/')
 def index():
@@ -51,13 +67,11 @@ def calculate():
         carga_termica = float(data.get('carga_termica', 40))
         
         # Calcula potência CRAC usando controlador fuzzy
-        potencia_crac = fuzzy_controller.calculate(
-            erro, delta_erro, temp_externa, carga_termica
+        # (evaluate não guarda estado: cada requisição recebe os próprios detalhes)
+        potencia_crac, inference_details = fuzzy_controller.evaluate(
+            erro, delta_erro, temp_externa, carga_termica, trace='full'
         )
         
-        # Obtém detalhes do processo de inferência
-        inference_details = fuzzy_controller.get_inference_details()
-        
         # Atualiza estado global
         system_state['current_power'] = potencia_crac
         
@@ -73,22 +87,23 @@ def calculate():
         mqtt_client.publish_control_data(mqtt_data)
         
         # Armazena mensagem no histórico
-        system_state['mqtt_messages'].append({
-            'topic': 'datacenter/fuzzy/control',
-            'data': mqtt_data,
-            'timestamp': time.time()
-        })
-        system_state['message_count'] += 1
-        # Mantém apenas últimas 50 mensagens
-        if len(system_state['mqtt_messages']) > 50:
-            system_state['mqtt_messages'] = system_state['mqtt_messages'][-50:]
+        with state_lock:
+            system_state['mqtt_messages'].append({
+                'topic': 'datacenter/fuzzy/control',
+                'data': mqtt_data,
+                'timestamp': time.time()
+            })
+            system_state['message_count'] += 1
+            # Mantém apenas últimas 50 mensagens
+            if len(system_state['mqtt_messages']) > 50:
+                system_state['mqtt_messages'] = system_state['mqtt_messages'][-50:]
         
         return jsonify({
             'success': True,
             'potencia_crac': round(potencia_crac, 2),
             'inference_details': inference_details
         })
-        
+    
     except Exception as e:
         return jsonify({
             'success': False,
@@ -126,11 +141,15 @@ def start_simulation():
         temp_inicial = float(data.get('temp_inicial', 22.0))
         temp_externa_base = float(data.get('temp_externa_base', 25.0))
         carga_base = float(data.get('carga_base', 40.0))
+        seed = data.get('seed')  # perturbações reproduzíveis (opcional)
+        seed = int(seed) if seed is not None else None
         
         # Limpa dados da simulação anterior
+        live_metrics = OnlineMetrics()
         system_state['simulation_data'] = []
         system_state['simulation_running'] = True
         system_state['simulation_progress'] = 0
+        system_state['simulation_metrics'] = live_metrics
         
         # Executa simulação em thread separada
         def run_simulation_thread():
@@ -138,32 +157,55 @@ def start_simulation():
                 def update_progress(progress):
                     system_state['simulation_progress'] = progress
                 
-                results = simulation.run_24h_simulation(
-                    temp_inicial=temp_inicial,
-                    temp_externa_base=temp_externa_base,
-                    carga_base=carga_base,
-                    progress_callback=update_progress
-                )
+                def run():
+                    results = simulation.run_24h_simulation(
+                        temp_inicial=temp_inicial,
+                        temp_externa_base=temp_externa_base,
+                        carga_base=carga_base,
+                        progress_callback=update_progress,
+                        publish_interval=DASHBOARD_INTERVAL_MINUTES,
+                        seed=seed,
+                        live_metrics=live_metrics
+                    )
+                    # Calcula métricas (resolução completa, passo de 1 minuto)
+                    return results, simulation.calculate_metrics(results)
                 
-                # Calcula métricas
-                metrics = simulation.calculate_metrics(results)
+                if seed is None:
+                    # Sem seed cada execução tem perturbações diferentes: não há o que reaproveitar
+                    results, metrics = run()
+                    cached = False
+                else:
+                    key = result_cache.scenario_key(
+                        simulation,
+                        temp_inicial=temp_inicial,
+                        temp_externa_base=temp_externa_base,
+                        carga_base=carga_base,
+                        seed=seed,
+                        duration_minutes=simulation.DURATION_MINUTES
+                    )
+                    results, metrics, cached = result_cache.get_or_run(key, run)
+                    if cached:
+                        live_metrics.update_batch(results['temperature'], results['erro'],
+                                                  results['power_crac'])
                 
-                # Armazena dados completos para recuperação
+                # Armazena dados para recuperação (um ponto a cada 5 min no dashboard)
                 system_state['simulation_data'] = {
-                    'results': results,
+                    'results': results.downsample(DASHBOARD_INTERVAL_MINUTES),
                     'metrics': metrics,
+                    'cached': cached,
                     'completed': True
                 }
                 system_state['simulation_running'] = False
                 system_state['simulation_progress'] = 100
                 
-                # Publica métricas finais via MQTT
+                # Publica métricas finais via MQTT (depois dos passos ainda na fila)
+                simulation_publisher.flush(timeout=5.0)
                 mqtt_client.publish_control_data({
                     'type': 'simulation_complete',
                     'metrics': metrics,
                     'timestamp': time.time()
                 })
-                
+            
             except Exception as e:
                 print(f"Erro na simulação: {e}")
                 system_state['simulation_running'] = False
@@ -181,7 +223,7 @@ def start_simulation():
             'success': True,
             'message': 'Simulação iniciada. Acompanhe os dados via MQTT.'
         })
-        
+    
     except Exception as e:
         return jsonify({
             'success': False,
@@ -191,12 +233,25 @@ def start_simulation():
 @app.route('/api/simulation/status', methods=['GET'])
 def simulation_status():
     """Retorna status da simulação"""
+    data = system_state['simulation_data']
+    if isinstance(data, dict) and 'results' in data:
+        # Resultados em colunas (SimulationResults) -> listas JSON
+        data = dict(data, results=data['results'].to_dict())
+    
+    live_metrics = system_state['simulation_metrics']
+    
     return jsonify({
         'running': system_state['simulation_running'],
         'progress': system_state['simulation_progress'],
-        'data': system_state['simulation_data']
+        'live_metrics': live_metrics.snapshot() if live_metrics is not None else None,
+        'data': data
     })
 
+@app.route('/api/simulation/cache/stats', methods=['GET'])
+def simulation_cache_stats():
+    """Retorna contadores do cache de resultados de simulação"""
+    return jsonify(result_cache.stats())
+
 @app.route('/api/rules', methods=['GET'])
 def get_rules():
     """Retorna a base de regras fuzzy"""
@@ -212,13 +267,21 @@ def get_rules():
             'error': str(e)
         }), 400
 
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Retorna contadores do cache do controlador fuzzy"""
+    return jsonify(fuzzy_controller.cache_stats())
+
 @app.route('/api/mqtt/status', methods=['GET'])
 def mqtt_status():
     """Retorna status da conexão MQTT"""
     return jsonify({
         'connected': mqtt_client.is_connected(),
         'broker': mqtt_client.broker,
-        'port': mqtt_client.port
+        'port': mqtt_client.port,
+        'publisher': simulation_publisher.stats(),
+        'buffer': mqtt_client.buffer_stats(),
+        'topics': mqtt_client.topic_stats()
     })
 
 @app.route('/api/alerts', methods=['GET'])
@@ -241,7 +304,7 @@ def get_simulation_messages():
     """Retorna mensagens da simulação via MQTT"""
     # Filtra apenas mensagens de simulação
     simulation_messages = [
-        msg for msg in system_state['mqtt_messages'] 
+        msg for msg in system_state['mqtt_messages']
         if msg.get('data', {}).get('type') == 'simulation'
     ]
     return jsonify({
@@ -261,7 +324,7 @@ def check_alerts(temp, power):
         }
         alerts.append(alert)
         mqtt_client.publish_alert(alert)
-        
+    
     elif temp > 26:
         alert = {
             'level': 'critical',
@@ -294,16 +357,16 @@ if __name__ == '__main__':
     print("📡 Conectando ao broker MQTT...")
     
     # Tenta conectar ao MQTT (modo simulação se falhar)
-    mqtt_ok = mqtt_client.connect()
+    # Não bloqueia se o broker não estiver no ar: o cliente reconecta sozinho
+    mqtt_ok = mqtt_client.connect(timeout=2.0)
     
     if mqtt_ok:
         print("✅ MQTT conectado com sucesso!")
         print(f"   Broker: {mqtt_client.broker}:{mqtt_client.port}")
     else:
-        print("⚠️  MQTT em modo simulação (broker não disponível)")
-        print("   Para ativar MQTT:")
-        print("   1. sudo systemctl start mosquitto")
-        print("   2. Reinicie o servidor")
+        print("⚠️  Broker MQTT não disponível: tentando reconectar em segundo plano")
+        print("   Mensagens ficam em buffer até a conexão. Para ativar MQTT:")
+        print("   sudo systemctl start mosquitto")
     
     print("\n🌐 Acesse: http://localhost:5500")
     print("📊 Dashboard MQTT: http://localhost:5500/mqtt_dashboard")
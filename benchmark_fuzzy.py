@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks do controlador fuzzy
+Compara o caminho antigo (despacho por string + lambda por termo) com a
+fuzzificação por tabela de pontos de quebra
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import timeit
+import numpy as np
+
+from fuzzy_controler.fuzzy_engine import FuzzyController
+
+VARIABLES = ['erro', 'delta_erro', 'temp_externa', 'carga_termica']
+
+
+def legacy_get_membership(mf, variable, term, value):
+    """Caminho antigo de MembershipFunctions.get_membership (if/elif + lambda)"""
+    if variable == 'erro':
+        return mf.erro_mf[term](value)
+    elif variable == 'delta_erro':
+        return mf.delta_erro_mf[term](value)
+    elif variable == 'temp_externa':
+        return mf.temp_externa_mf[term](value)
+    elif variable == 'carga_termica':
+        return mf.carga_termica_mf[term](value)
+    elif variable == 'potencia_crac':
+        return mf.potencia_crac_mf[term](value)
+    else:
+        raise ValueError(f"Variável desconhecida: {variable}")
+
+
+def legacy_fuzzification(mf, inputs):
+    """Fuzzificação antiga: um get_membership por termo de cada variável"""
+    return {
+        variable: {
+            term: legacy_get_membership(mf, variable, term, value)
+            for term in mf.variables[variable][0]
+        }
+        for variable, value in inputs.items()
+    }
+
+
+def _time_per_call(func, number):
+    """Menor tempo médio por chamada (µs) entre 5 repetições"""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def _report(name, before, after):
+    print(f"   {name:<42} {before:>9.2f} µs {after:>9.2f} µs {before / after:>7.1f}x")
+
+
+def run_benchmarks():
+    fuzzy = FuzzyController()
+    mf = fuzzy.mf
+    
+    inputs = {
+        'erro': np.clip(1.2, -10, 10),
+        'delta_erro': np.clip(-0.3, -5, 5),
+        'temp_externa': np.clip(27.0, 10, 35),
+        'carga_termica': np.clip(55.0, 0, 100)
+    }
+    array = np.random.default_rng(0).uniform(-10, 10, 10000)
+    
+    print("=" * 78)
+    print("⏱️  MICRO-BENCHMARKS DA FUZZIFICAÇÃO")
+    print("=" * 78)
+    print(f"   {'Caso':<42} {'Antes':>12} {'Depois':>12} {'Ganho':>8}")
+    print("-" * 78)
+    
+    _report(
+        "erro escalar (7 termos)",
+        _time_per_call(lambda: [legacy_get_membership(mf, 'erro', t, inputs['erro'])
+                                for t in mf.erro_terms], 20000),
+        _time_per_call(lambda: mf.fuzzify('erro', inputs['erro']), 20000)
+    )
+    _report(
+        "fuzzificação completa (4 variáveis)",
+        _time_per_call(lambda: legacy_fuzzification(mf, inputs), 10000),
+        _time_per_call(lambda: fuzzy.fuzzification(*inputs.values()), 10000)
+    )
+    _report(
+        "erro array (10000 valores)",
+        _time_per_call(lambda: np.column_stack([mf.erro_mf[t](array) for t in mf.erro_terms]), 100),
+        _time_per_call(lambda: mf.fuzzify('erro', array), 100)
+    )
+    
+    print("-" * 78)
+    for trace in FuzzyController.TRACE_LEVELS:
+        per_call = _time_per_call(lambda: fuzzy.calculate(*inputs.values(), trace=trace), 5000)
+        print(f"   calculate() escalar, trace={trace!r:<10} {per_call:>9.2f} µs/chamada")
+    print("=" * 78)
+
+
+if __name__ == '__main__':
+    run_benchmarks()
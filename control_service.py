@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Serviço de controle via MQTT (sem Flask)
+Assina os sensores dos CRACs, roda o controlador fuzzy em lote a cada tick
+e publica os comandos de potência. Uso:
+    python control_service.py --broker localhost --interval 1.0
+"""
+
+import argparse
+import threading
+from fuzzy_controler.fuzzy_engine import FuzzyController
+from mqtt.mqtt_client import MQTTClient
+from mqtt.control_loop import ControlLoop
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serviço de controle fuzzy de CRACs via MQTT")
+    parser.add_argument('--broker', default='localhost')
+    parser.add_argument('--port', type=int, default=1883)
+    parser.add_argument('--interval', type=float, default=1.0, help="intervalo entre ticks (s)")
+    parser.add_argument('--setpoint', type=float, default=22.0, help="setpoint padrão (°C)")
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("❄️  SERVIÇO DE CONTROLE FUZZY (MQTT)")
+    print("=" * 60)
+    
+    mqtt_client = MQTTClient(args.broker, args.port)
+    loop = ControlLoop(FuzzyController(), mqtt_client, setpoint=args.setpoint).start()
+    
+    print(f"\n🔄 Conectando ao broker MQTT ({args.broker}:{args.port})...")
+    if not mqtt_client.connect(timeout=2.0):
+        print("⚠️  Broker não disponível: tentando reconectar em segundo plano")
+    print(f"📡 Sensores: {ControlLoop.SENSOR_TOPIC}")
+    print(f"🎛️  Comandos: {ControlLoop.COMMAND_TOPIC}")
+    print(f"⏱️  Tick a cada {args.interval}s\n")
+    
+    stop_event = threading.Event()
+    try:
+        loop.run(args.interval, stop_event)
+    except KeyboardInterrupt:
+        print(f"\n\n👋 Encerrando serviço... {loop.stats()}")
+    finally:
+        stop_event.set()
+        mqtt_client.disconnect()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+import threading
+from collections import OrderedDict
+
+class CalculationCache:
+    """
+    Cache LRU limitado para os resultados de FuzzyController.calculate
+    Chave: entradas (já saturadas) quantizadas com passo 'quantum'
+    - quantum=None: modo exato, a chave são os próprios valores de entrada
+    - quantum>0: entradas próximas (mesma célula de tamanho quantum)
+      compartilham o resultado, calculado no ponto quantizado
+    """
+    
+    def __init__(self, maxsize=1024, quantum=None):
+        if maxsize <= 0:
+            raise ValueError("maxsize deve ser positivo")
+        if quantum is not None and quantum <= 0:
+            raise ValueError("quantum deve ser positivo (ou None para modo exato)")
+        
+        self.maxsize = maxsize
+        self.quantum = quantum
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @property
+    def exact(self):
+        """Modo exato (sem quantização)"""
+        return self.quantum is None
+    
+    def key(self, values):
+        """Chave do cache e valores representativos (quantizados) das entradas"""
+        if self.quantum is None:
+            return tuple(values), tuple(values)
+        
+        key = tuple(round(v / self.quantum) for v in values)
+        return key, tuple(k * self.quantum for k in key)
+    
+    def get(self, key):
+        """Retorna o valor armazenado (ou None) e atualiza a ordem LRU"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key, value):
+        """Armazena um valor, descartando o menos usado se estiver cheio"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        """Esvazia o cache (os contadores são mantidos)"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        """Contadores de acertos/falhas/descartes"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'quantum': self.quantum,
+                'exact': self.quantum is None,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -4,17 +4,118 @@ class Defuzzification:
     """Métodos de defuzzificação"""
     
     def centroid(self, output_aggregation, mf):
-        """Defuzzificação por centroide (centro de área)"""
-        universe = mf.potencia_crac_universe
-        aggregated_mf = np.zeros_like(universe)
+        """
+        Defuzzificação por centroide (centro de área)
+        Usa as curvas dos termos de saída pré-calculadas em
+        mf.potencia_crac_curves: apenas recorta (min) e agrega (max) as linhas
+        """
+        activations = np.array([
+            output_aggregation.get(term, 0.0) for term in mf.potencia_crac_terms
+        ], dtype=float)
         
-        for term, activation in output_aggregation.items():
-            if activation > 0:
-                term_mf = mf.potencia_crac_mf[term](universe)
-                aggregated_mf = np.maximum(aggregated_mf, np.minimum(term_mf, activation))
+        if not np.any(activations > 0):
+            return 50.0
         
-        if np.sum(aggregated_mf) == 0:
+        universe = mf.potencia_crac_universe
+        aggregated_mf = np.minimum(mf.potencia_crac_curves, activations[:, np.newaxis]).max(axis=0)
+        
+        area = np.sum(aggregated_mf)
+        if area == 0:
             return 50.0
         
-        centroid = np.sum(universe * aggregated_mf) / np.sum(aggregated_mf)
+        centroid = np.sum(universe * aggregated_mf) / area
         return float(centroid)
+    
+    def centroid_batch(self, output_aggregation, mf):
+        """
+        Centroide vetorizado para várias inferências
+        output_aggregation: matriz (N, n_termos) na ordem de potencia_crac_terms
+        """
+        universe = mf.potencia_crac_universe
+        term_curves = mf.potencia_crac_curves
+        
+        aggregated_mf = np.zeros((output_aggregation.shape[0], universe.size))
+        for k in range(term_curves.shape[0]):
+            np.maximum(aggregated_mf,
+                       np.minimum(term_curves[k], output_aggregation[:, k:k + 1]),
+                       out=aggregated_mf)
+        
+        area = np.sum(aggregated_mf, axis=1)
+        centroid = np.full(area.shape, 50.0)
+        nonzero = area != 0
+        centroid[nonzero] = np.sum(universe * aggregated_mf[nonzero], axis=1) / area[nonzero]
+        return centroid
+    
+    def centroid_analytic(self, output_aggregation, mf):
+        """
+        Defuzzificação por centroide exato (forma fechada)
+        Os termos de saída são triangulares/trapezoidais, então o conjunto
+        recortado (min) e agregado (max) é linear por partes. Por
+        inclusão-exclusão ele é a soma (com sinal) dos polígonos fixos
+        mf.potencia_crac_segments recortados na menor ativação do seu grupo
+        de termos: cada segmento tem área e momento em forma fechada da
+        altura de recorte, sem amostrar potencia_crac_universe
+        """
+        activations = [
+            output_aggregation.get(term, 0.0) for term in mf.potencia_crac_terms
+        ]
+        heights = [min([activations[k] for k in group]) for group in mf.potencia_crac_overlaps]
+        
+        area = 0.0
+        moment = 0.0
+        for group, sign, x0, y0, x1, y1 in mf.potencia_crac_segment_rows:
+            h = heights[group]
+            if h <= 0:
+                continue
+            if y0 <= h and y1 <= h:
+                xc, gc = x1, y1
+            elif y0 >= h and y1 >= h:
+                xc, gc = x0, h
+            else:
+                # Segmento cortado pela altura h: reta até xc, topo plano depois
+                xc, gc = x0 + (x1 - x0) * (h - y0) / (y1 - y0), h
+            ga, gb = min(y0, h), min(y1, h)
+            # Integrais exatas de g(x) e x·g(x) nos dois trechos lineares
+            w0, w1 = xc - x0, x1 - xc
+            area += sign * (w0 * (ga + gc) + w1 * (gc + gb)) / 2
+            moment += sign * (w0 * (ga * (2 * x0 + xc) + gc * (x0 + 2 * xc))
+                              + w1 * (gc * (2 * xc + x1) + gb * (xc + 2 * x1))) / 6
+        
+        if area <= 0:
+            return 50.0
+        
+        return float(moment / area)
+    
+    def centroid_analytic_batch(self, output_aggregation, mf):
+        """
+        Centroide exato vetorizado para várias inferências (mesma decomposição
+        de centroid_analytic, todos os segmentos e linhas de uma vez)
+        output_aggregation: matriz (N, n_termos) na ordem de potencia_crac_terms
+        """
+        activations = np.asarray(output_aggregation, dtype=float)
+        heights = np.stack([
+            activations[:, list(group)].min(axis=1) for group in mf.potencia_crac_overlaps
+        ], axis=1)
+        group, sign, x0, y0, x1, y1 = mf.potencia_crac_segments.T
+        h = heights[:, group.astype(int)]
+        
+        # Ponto em que o segmento atinge h (preso às pontas): reta até xc,
+        # topo plano depois; fora do segmento um dos trechos tem largura zero
+        dy = y1 - y0
+        t = np.clip((h - y0) / np.where(dy != 0, dy, np.inf), 0.0, 1.0)
+        xc = x0 + (x1 - x0) * t
+        gc = np.minimum(y0 + dy * t, h)
+        ga = np.minimum(y0, h)
+        gb = np.minimum(y1, h)
+        
+        # Integrais exatas de g(x) e x·g(x) nos dois trechos lineares
+        w0 = xc - x0
+        w1 = x1 - xc
+        area = (w0 * (ga + gc) + w1 * (gc + gb)) / 2 @ sign
+        moment = (w0 * (ga * (2 * x0 + xc) + gc * (x0 + 2 * xc))
+                  + w1 * (gc * (2 * xc + x1) + gb * (xc + 2 * x1))) / 6 @ sign
+        
+        centroid = np.full(activations.shape[0], 50.0)
+        nonzero = area > 0
+        centroid[nonzero] = moment[nonzero] / area[nonzero]
+        return centroid
@@ -1,7 +1,10 @@
+import hashlib
+import json
 import numpy as np
 from .membership_functions import MembershipFunctions
 from .fuzzy_rules import FuzzyRules
 from .defuzzification import Defuzzification
+from .calculation_cache import CalculationCache
 
 class FuzzyController:
     """
@@ -9,46 +12,67 @@ class FuzzyController:
     Tipo: Mamdani com defuzzificação por centroide
     """
     
-    def __init__(self):
+    # Métodos de defuzzificação disponíveis (nome -> método de Defuzzification)
+    DEFUZZIFICATION_METHODS = {
+        'centroid': ('centroid', 'centroid_batch'),                          # amostrado no universo
+        'centroid_analytic': ('centroid_analytic', 'centroid_analytic_batch')  # forma fechada
+    }
+    
+    # Faixas de saturação das entradas (universos das funções de pertinência)
+    INPUT_RANGES = {
+        'erro': (-10, 10),
+        'delta_erro': (-5, 5),
+        'temp_externa': (10, 35),
+        'carga_termica': (0, 100)
+    }
+    
+    # Níveis de registro da inferência em last_inference (ver calculate)
+    TRACE_LEVELS = ('none', 'summary', 'full')
+    
+    def __init__(self, defuzzification='centroid', surface_lut=None,
+                 cache_size=0, cache_quantum=None, trace='full'):
+        if defuzzification not in self.DEFUZZIFICATION_METHODS:
+            raise ValueError(f"Método de defuzzificação desconhecido: {defuzzification}")
+        if trace not in self.TRACE_LEVELS:
+            raise ValueError(f"Nível de trace desconhecido: {trace}")
+        
         self.mf = MembershipFunctions()
-        self.rules = FuzzyRules()
+        self.rules = FuzzyRules(self.mf)
         self.defuzz = Defuzzification()
+        self.defuzzification = defuzzification
+        single, batch = self.DEFUZZIFICATION_METHODS[defuzzification]
+        self._defuzzify = getattr(self.defuzz, single)
+        self._defuzzify_batch = getattr(self.defuzz, batch)
+        self.trace = trace
         self.last_inference = None
         
+        # Superfície pré-calculada (SurfaceLUT): quando definida, calculate e
+        # calculate_batch respondem por interpolação em vez da inferência
+        self.surface_lut = None
+        if surface_lut is not None:
+            self.use_surface_lut(surface_lut)
+        
+        # Cache LRU opcional na frente de calculate (ver enable_cache)
+        self.cache = None
+        if cache_size:
+            self.enable_cache(cache_size, cache_quantum)
+    
     def fuzzification(self, erro, delta_erro, temp_externa, carga_termica):
         """
         Converte valores crisp em graus de pertinência
         """
-        fuzzy_inputs = {
-            'erro': {},
-            'delta_erro': {},
-            'temp_externa': {},
-            'carga_termica': {}
+        values = {
+            'erro': erro,
+            'delta_erro': delta_erro,
+            'temp_externa': temp_externa,
+            'carga_termica': carga_termica
         }
         
-        # Fuzzifica erro
-        for term in self.mf.erro_terms:
-            fuzzy_inputs['erro'][term] = self.mf.get_membership(
-                'erro', term, erro
-            )
-        
-        # Fuzzifica delta_erro
-        for term in self.mf.delta_erro_terms:
-            fuzzy_inputs['delta_erro'][term] = self.mf.get_membership(
-                'delta_erro', term, delta_erro
-            )
-        
-        # Fuzzifica temperatura externa
-        for term in self.mf.temp_externa_terms:
-            fuzzy_inputs['temp_externa'][term] = self.mf.get_membership(
-                'temp_externa', term, temp_externa
-            )
-        
-        # Fuzzifica carga térmica
-        for term in self.mf.carga_termica_terms:
-            fuzzy_inputs['carga_termica'][term] = self.mf.get_membership(
-                'carga_termica', term, carga_termica
-            )
+        # Uma passada pela tabela de pontos de quebra por variável
+        fuzzy_inputs = {}
+        for variable, value in values.items():
+            terms = self.mf.variables[variable][0]
+            fuzzy_inputs[variable] = dict(zip(terms, self.mf.fuzzify(variable, value)))
         
         return fuzzy_inputs
     
@@ -57,91 +81,302 @@ class FuzzyController:
         Aplica as regras fuzzy e agrega os resultados
         Método: Mamdani (min-max)
         """
+        memberships = [
+            [fuzzy_inputs[var][term] for term in terms]
+            for var, terms in zip(self.rules.antecedents, self.rules.antecedent_terms)
+        ]
+        
+        # Apenas as regras cujas células têm todos os antecedentes ativos
+        # (AND = min)
+        fired = self.rules.active_rules(memberships)
+        
+        # Agrega usando máximo (OR)
+        output_aggregation = {term: 0.0 for term in self.mf.potencia_crac_terms}
         activated_rules = []
-        output_aggregation = {}
-        
-        # Inicializa agregação para cada termo de saída
-        for term in self.mf.potencia_crac_terms:
-            output_aggregation[term] = 0.0
-        
-        # Aplica cada regra
-        for rule in self.rules.rules_base:
-            # Calcula força de ativação da regra (AND = min)
-            activation = min(
-                fuzzy_inputs['erro'][rule['erro']],
-                fuzzy_inputs['delta_erro'][rule['delta_erro']],
-                fuzzy_inputs['temp_externa'][rule['temp_externa']],
-                fuzzy_inputs['carga_termica'][rule['carga_termica']]
+        for i, activation in fired:
+            rule = self.rules.rules_base[i]
+            activated_rules.append({
+                'rule': rule,
+                'activation': float(activation)
+            })
+            output_term = rule['potencia_crac']
+            output_aggregation[output_term] = max(
+                output_aggregation[output_term],
+                float(activation)
             )
-            
-            if activation > 0:
-                activated_rules.append({
-                    'rule': rule,
-                    'activation': activation
-                })
-                
-                # Agrega usando máximo (OR)
-                output_term = rule['potencia_crac']
-                output_aggregation[output_term] = max(
-                    output_aggregation[output_term],
-                    activation
-                )
         
         return activated_rules, output_aggregation
     
-    def calculate(self, erro, delta_erro, temp_externa, carga_termica):
+    def use_surface_lut(self, surface_lut):
+        """
+        Ativa (ou desativa, com None) o modo SurfaceLUT
+        A tabela precisa ter sido gerada para esta base de regras/funções
+        """
+        if surface_lut is not None and surface_lut.fingerprint != self.fingerprint():
+            raise ValueError("SurfaceLUT gerada para outra base de regras/funções de pertinência")
+        self.surface_lut = surface_lut
+        if self.cache is not None:
+            self.cache.clear()
+    
+    def enable_cache(self, maxsize=1024, quantum=None):
+        """
+        Ativa o cache LRU de calculate para entradas repetidas
+        quantum=None mantém o modo exato; com quantum>0 as entradas são
+        quantizadas (ex.: 0.01 agrupa leituras que diferem menos de 0.01)
+        """
+        self.cache = CalculationCache(maxsize, quantum)
+    
+    def disable_cache(self):
+        """Desativa o cache (volta a calcular toda chamada)"""
+        self.cache = None
+    
+    def cache_stats(self):
+        """Contadores do cache (acertos, falhas, descartes)"""
+        if self.cache is None:
+            return {'enabled': False}
+        return dict(self.cache.stats(), enabled=True)
+    
+    def fingerprint(self):
+        """
+        Identificador (hash) da base de regras, funções de pertinência e método
+        de defuzzificação: muda sempre que a superfície de controle pode mudar
+        """
+        config = {
+            'membership': {
+                var: {term: term_params[term] for term in terms}
+                for var, (terms, term_params) in self.mf.variables.items()
+            },
+            'universe': [
+                float(self.mf.potencia_crac_universe[0]),
+                float(self.mf.potencia_crac_universe[-1]),
+                int(self.mf.potencia_crac_universe.size)
+            ],
+            'rules': self.rules.rules_base,
+            'defuzzification': self.defuzzification
+        }
+        encoded = json.dumps(config, sort_keys=True).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()[:16]
+    
+    def calculate(self, erro, delta_erro, temp_externa, carga_termica, use_lut=True, trace=None,
+                  use_cache=True):
         """
         Calcula a saída crisp do controlador fuzzy
+        Com SurfaceLUT ativa (e use_lut=True) responde por interpolação
+        Com cache ativo, entradas repetidas não repetem o cálculo
+        trace (padrão: self.trace) define o que fica em last_inference:
+        - 'full': pertinências, regras ativadas e agregação
+        - 'summary': entradas, agregação, nº de regras ativadas e saída
+        - 'none': nada é registrado (last_inference não é alterado)
+        use_cache=False ignora o cache (ex.: simulação, entradas que não se repetem)
+        Com vários threads usando o mesmo controlador, use evaluate()
+        """
+        potencia_crac, record = self._evaluate(
+            erro, delta_erro, temp_externa, carga_termica, use_lut, trace, use_cache
+        )
+        if record is not None:
+            self.last_inference = record
+        return potencia_crac
+    
+    def evaluate(self, erro, delta_erro, temp_externa, carga_termica, use_lut=True, trace='full',
+                 use_cache=True):
+        """
+        Versão sem estado de calculate: retorna (potencia_crac, detalhes)
+        Os detalhes vêm no formato de get_inference_details (None com
+        trace='none') e last_inference não é alterado, então vários threads
+        podem usar o mesmo controlador sem trocar resultados entre si
+        """
+        potencia_crac, record = self._evaluate(
+            erro, delta_erro, temp_externa, carga_termica, use_lut, trace, use_cache
+        )
+        return potencia_crac, self._format_details(record)
+    
+    def _evaluate(self, erro, delta_erro, temp_externa, carga_termica, use_lut, trace, use_cache):
+        """
+        Calcula (potencia_crac, registro) sem alterar o estado do controlador
+        O registro pode estar no cache e ser compartilhado: é somente leitura
+        """
+        if trace is None:
+            trace = self.trace
+        elif trace not in self.TRACE_LEVELS:
+            raise ValueError(f"Nível de trace desconhecido: {trace}")
+        
+        # Referências locais: enable_cache/use_surface_lut podem ser chamados
+        # por outro thread durante o cálculo
+        cache = self.cache if use_cache else None
+        surface_lut = self.surface_lut if use_lut else None
+        
+        if cache is None:
+            return self._calculate(erro, delta_erro, temp_externa, carga_termica, surface_lut, trace)
+        
+        # Cache LRU (chave nas entradas saturadas)
+        key, values = cache.key(self._saturate(erro, delta_erro, temp_externa, carga_termica))
+        key += (surface_lut is not None, trace)
+        
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        
+        result = self._calculate(*values, surface_lut=surface_lut, trace=trace)
+        cache.put(key, result)
+        return result
+    
+    def _saturate(self, erro, delta_erro, temp_externa, carga_termica):
+        """Satura as entradas escalares nas faixas de INPUT_RANGES"""
+        return [
+            min(max(float(value), lower), upper)
+            for value, (lower, upper) in zip(
+                (erro, delta_erro, temp_externa, carga_termica),
+                self.INPUT_RANGES.values()
+            )
+        ]
+    
+    def _calculate(self, erro, delta_erro, temp_externa, carga_termica, surface_lut=None, trace='full'):
         """
+        Cálculo sem cache (inferência completa ou SurfaceLUT)
+        Retorna (potencia_crac, registro da inferência ou None)
+        """
+        if surface_lut is not None:
+            return self._calculate_lut(surface_lut, erro, delta_erro, temp_externa, carga_termica, trace)
+        
         # SATURAÇÃO: Limita valores extremos aos ranges das funções de pertinência
         # Isso garante que valores muito altos/baixos sejam tratados como os extremos válidos
-        erro = np.clip(erro, -10, 10)              # Erro: -10 a +10°C
-        delta_erro = np.clip(delta_erro, -5, 5)    # Delta: -5 a +5
-        temp_externa = np.clip(temp_externa, 10, 35)  # Temp Externa: 10 a 35°C
-        carga_termica = np.clip(carga_termica, 0, 100)  # Carga: 0 a 100%
+        inputs = self._saturate(erro, delta_erro, temp_externa, carga_termica)
+        
+        if trace != 'full':
+            return self._calculate_compact(inputs, trace)
         
         # 1. Fuzzificação
-        fuzzy_inputs = self.fuzzification(
-            erro, delta_erro, temp_externa, carga_termica
-        )
+        fuzzy_inputs = self.fuzzification(*inputs)
         
         # 2. Inferência
         activated_rules, output_aggregation = self.inference(fuzzy_inputs)
         
         # 3. Defuzzificação (centroide)
-        potencia_crac = self.defuzz.centroid(
-            output_aggregation, 
+        potencia_crac = self._defuzzify(
+            output_aggregation,
             self.mf
         )
         
         # Limita saída entre 0 e 100
-        potencia_crac = np.clip(potencia_crac, 0, 100)
-        
-        # Salva detalhes da última inferência
-        self.last_inference = {
-            'inputs': {
-                'erro': erro,
-                'delta_erro': delta_erro,
-                'temp_externa': temp_externa,
-                'carga_termica': carga_termica
-            },
+        potencia_crac = min(max(potencia_crac, 0.0), 100.0)
+        
+        # Detalhes da inferência
+        return potencia_crac, {
+            'inputs': dict(zip(self.INPUT_RANGES, inputs)),
             'fuzzy_inputs': fuzzy_inputs,
             'activated_rules': activated_rules,
+            'activated_rules_count': len(activated_rules),
             'output_aggregation': output_aggregation,
-            'potencia_crac': potencia_crac
+            'potencia_crac': potencia_crac,
+            'trace': 'full'
         }
+    
+    def _calculate_compact(self, inputs, trace):
+        """
+        Inferência sem montar os dicionários de pertinências nem a lista de
+        regras ativadas (trace 'none' e 'summary'): mesma saída de _calculate
+        """
+        memberships = [
+            self.mf.fuzzify(variable, value)
+            for variable, value in zip(self.rules.antecedents, inputs)
+        ]
+        fired = self.rules.active_rules(memberships)
         
-        return potencia_crac
+        # Agrega usando máximo (OR)
+        rules_base = self.rules.rules_base
+        output_aggregation = dict.fromkeys(self.mf.potencia_crac_terms, 0.0)
+        for i, activation in fired:
+            term = rules_base[i]['potencia_crac']
+            if activation > output_aggregation[term]:
+                output_aggregation[term] = float(activation)
+        
+        potencia_crac = min(max(self._defuzzify(output_aggregation, self.mf), 0.0), 100.0)
+        
+        if trace == 'none':
+            return potencia_crac, None
+        return potencia_crac, {
+            'inputs': dict(zip(self.INPUT_RANGES, inputs)),
+            'fuzzy_inputs': {},
+            'activated_rules': [],
+            'activated_rules_count': len(fired),
+            'output_aggregation': output_aggregation,
+            'potencia_crac': potencia_crac,
+            'trace': 'summary'
+        }
+    
+    def _calculate_lut(self, surface_lut, erro, delta_erro, temp_externa, carga_termica, trace='full'):
+        """Modo SurfaceLUT: saturação + interpolação na superfície pré-calculada"""
+        inputs = self._saturate(erro, delta_erro, temp_externa, carga_termica)
+        potencia_crac = surface_lut.interpolate(*inputs)
+        
+        if trace == 'none':
+            return potencia_crac, None
+        
+        # Sem inferência: não há pertinências nem regras ativadas
+        return potencia_crac, {
+            'inputs': dict(zip(self.INPUT_RANGES, inputs)),
+            'fuzzy_inputs': {},
+            'activated_rules': [],
+            'activated_rules_count': 0,
+            'output_aggregation': {},
+            'potencia_crac': potencia_crac,
+            'trace': 'summary'
+        }
+    
+    def calculate_batch(self, erro, delta_erro, temp_externa, carga_termica, use_lut=True):
+        """
+        Calcula a saída crisp para vários conjuntos de entradas de uma vez
+        Aceita arrays NumPy (ou escalares, com broadcast) e retorna um array
+        de potencia_crac com o mesmo formato, equivalente a chamar calculate()
+        para cada elemento
+        """
+        erro, delta_erro, temp_externa, carga_termica = np.broadcast_arrays(
+            np.asarray(erro, dtype=float),
+            np.asarray(delta_erro, dtype=float),
+            np.asarray(temp_externa, dtype=float),
+            np.asarray(carga_termica, dtype=float)
+        )
+        shape = erro.shape
+        
+        surface_lut = self.surface_lut if use_lut else None
+        if surface_lut is not None:
+            return np.asarray(surface_lut.interpolate(
+                erro, delta_erro, temp_externa, carga_termica
+            )).reshape(shape)
+        
+        # SATURAÇÃO (mesmos limites de calculate)
+        inputs = {
+            variable: np.clip(values, *self.INPUT_RANGES[variable])
+            for variable, values in zip(self.INPUT_RANGES, (erro, delta_erro, temp_externa, carga_termica))
+        }
+        
+        # 1. Fuzzificação: matriz (N, n_termos) por variável
+        memberships = [
+            self.mf.fuzzify(var, inputs[var].ravel()) for var in self.rules.antecedents
+        ]
+        
+        # 2. Inferência: força de cada regra (N, n_regras) e agregação (N, n_termos_saida)
+        activation = self.rules.firing_strengths(memberships)
+        output_aggregation = self.rules.aggregate(activation)
+        
+        # 3. Defuzzificação (centroide)
+        potencia_crac = self._defuzzify_batch(output_aggregation, self.mf)
+        
+        return np.clip(potencia_crac, 0, 100).reshape(shape)
     
     def get_inference_details(self):
         """Retorna detalhes da última inferência"""
-        if self.last_inference is None:
+        return self._format_details(self.last_inference)
+    
+    def _format_details(self, record):
+        """Converte um registro de inferência no formato de get_inference_details"""
+        if record is None:
             return None
         
         return {
-            'inputs': self.last_inference['inputs'],
-            'fuzzy_values': self.last_inference['fuzzy_inputs'],
-            'activated_rules_count': len(self.last_inference['activated_rules']),
+            'inputs': record['inputs'],
+            'fuzzy_values': record['fuzzy_inputs'],
+            'activated_rules_count': record['activated_rules_count'],
             'activated_rules': [
                 {
                     'rule_id': i,
@@ -154,9 +389,10 @@ class FuzzyController:
                     },
                     'output': r['rule']['potencia_crac']
                 }
-                for i, r in enumerate(self.last_inference['activated_rules'][:10])  # Top 10
+                for i, r in enumerate(record['activated_rules'][:10])  # Top 10
             ],
-            'output': self.last_inference['potencia_crac']
+            'output': record['potencia_crac'],
+            'trace': record['trace']
         }
     
     def get_membership_functions_data(self):
@@ -1,3 +1,7 @@
+import itertools
+import numpy as np
+from .membership_functions import MembershipFunctions
+
 class FuzzyRules:
     """
     Base de regras fuzzy CORRIGIDA para controle de refrigeração
@@ -17,8 +21,9 @@ class FuzzyRules:
     - NB (Negativo Big): erro < -4°C → Temp MUITO ABAIXO → CRAC MÍNIMO (MB)
     """
     
-    def __init__(self):
+    def __init__(self, mf=None):
         self.rules_base = self._create_rules_base()
+        self.compile(mf if mf is not None else MembershipFunctions())
     
     def _create_rules_base(self):
         """
@@ -223,26 +228,102 @@ class FuzzyRules:
         
         return rules
     
+    def compile(self, mf):
+        """
+        Compila a base de regras para a forma indexada (inteiros)
+        - antecedent_idx: (n_regras, 4) índices dos termos de cada antecedente
+        - consequent_idx: (n_regras,) índice do termo de saída
+        - cell_rules: regras de cada célula de antecedentes (avaliação esparsa)
+        """
+        self.antecedents = ['erro', 'delta_erro', 'temp_externa', 'carga_termica']
+        self.antecedent_terms = [mf.variables[var][0] for var in self.antecedents]
+        self.output_terms = mf.potencia_crac_terms
+        
+        self.antecedent_idx = np.array([
+            [terms.index(rule[var]) for var, terms in zip(self.antecedents, self.antecedent_terms)]
+            for rule in self.rules_base
+        ], dtype=np.intp).reshape(-1, len(self.antecedents))
+        self.consequent_idx = np.array(
+            [self.output_terms.index(rule['potencia_crac']) for rule in self.rules_base],
+            dtype=np.intp
+        )
+        
+        # Máscara das regras de cada termo de saída (usada na agregação)
+        self._output_masks = [self.consequent_idx == k for k in range(len(self.output_terms))]
+        
+        # Regras de cada célula de antecedentes (usado na avaliação esparsa)
+        self.cell_rules = {}
+        for i, cell in enumerate(map(tuple, self.antecedent_idx.tolist())):
+            self.cell_rules.setdefault(cell, []).append(i)
+    
+    def firing_strengths(self, memberships):
+        """
+        Força de ativação de todas as regras (AND = min)
+        memberships: lista com o vetor (ou matriz (N, n_termos)) de pertinência
+        de cada antecedente, na ordem de self.antecedents
+        Retorna array (..., n_regras)
+        """
+        activation = None
+        for j, degrees in enumerate(memberships):
+            gathered = np.asarray(degrees)[..., self.antecedent_idx[:, j]]
+            if activation is None:
+                activation = gathered
+            else:
+                np.minimum(activation, gathered, out=activation)
+        return activation
+    
+    def active_rules(self, memberships):
+        """
+        Avaliação esparsa: enumera apenas os termos com pertinência não nula
+        de cada antecedente (no máximo 2 termos adjacentes por variável) e
+        indexa as regras dessas células. O custo não depende do tamanho da base.
+        Retorna lista de (índice_da_regra, ativação) em ordem de rules_base
+        """
+        active_terms = []
+        for degrees in memberships:
+            terms = [(j, mu) for j, mu in enumerate(degrees) if mu > 0]
+            if not terms:
+                return []
+            active_terms.append(terms)
+        
+        fired = []
+        for combination in itertools.product(*active_terms):
+            rule_ids = self.cell_rules.get(tuple(j for j, _ in combination))
+            if rule_ids:
+                activation = min(mu for _, mu in combination)
+                fired.extend((i, activation) for i in rule_ids)
+        
+        fired.sort()
+        return fired
+    
+    def aggregate(self, activation):
+        """
+        Agrega as forças de ativação por termo de saída (OR = max)
+        Retorna array (..., n_termos_saida) na ordem de potencia_crac_terms
+        """
+        output = np.zeros(activation.shape[:-1] + (len(self.output_terms),))
+        for k, mask in enumerate(self._output_masks):
+            if np.any(mask):
+                output[..., k] = activation[..., mask].max(axis=-1)
+        return output
+    
     def get_applicable_rules(self, erro_memberships, delta_erro_memberships, 
                             temp_externa_memberships, carga_termica_memberships):
         """
         Retorna regras aplicáveis com seus graus de ativação
         """
-        applicable_rules = []
-        
-        for rule in self.rules_base:
-            # Calcula grau de ativação da regra (mínimo dos antecedentes)
-            activation = min(
-                erro_memberships.get(rule['erro'], 0),
-                delta_erro_memberships.get(rule['delta_erro'], 0),
-                temp_externa_memberships.get(rule['temp_externa'], 0),
-                carga_termica_memberships.get(rule['carga_termica'], 0)
+        memberships = [
+            [values.get(term, 0) for term in terms]
+            for values, terms in zip(
+                [erro_memberships, delta_erro_memberships,
+                 temp_externa_memberships, carga_termica_memberships],
+                self.antecedent_terms
             )
-            
-            if activation > 0:
-                applicable_rules.append({
-                    'rule': rule,
-                    'activation': activation
-                })
-        
-        return applicable_rules
+        ]
+        return [
+            {
+                'rule': self.rules_base[i],
+                'activation': float(activation)
+            }
+            for i, activation in self.active_rules(memberships)
+        ]
@@ -1,3 +1,5 @@
+import itertools
+
 import numpy as np
 
 class MembershipFunctions:
@@ -26,57 +28,222 @@ class MembershipFunctions:
     def _define_membership_functions(self):
         """Define todas as funções de pertinência"""
         
+        # Parâmetros de cada termo: (formato, pontos de quebra)
         # ERRO DE TEMPERATURA (ajustado para melhor cobertura)
-        self.erro_mf = {
-            'NB': lambda x: self._trapmf(x, [-10, -10, -6, -3]),     # Negativo Grande: < -3°C
-            'NM': lambda x: self._trimf(x, [-5, -3, -1.5]),          # Negativo Médio: -5 a -1.5°C
-            'NS': lambda x: self._trimf(x, [-2.5, -1, 0]),           # Negativo Pequeno: -2.5 a 0°C
-            'ZE': lambda x: self._trimf(x, [-1, 0, 1]),              # Zero: -1 a +1°C
-            'PS': lambda x: self._trimf(x, [0, 1.5, 3]),             # Positivo Pequeno: 0 a +3°C
-            'PM': lambda x: self._trimf(x, [2, 4, 6]),               # Positivo Médio: +2 a +6°C
-            'PB': lambda x: self._trapmf(x, [5, 7, 10, 10])          # Positivo Grande: > +5°C
+        self.erro_params = {
+            'NB': ('trap', [-10, -10, -6, -3]),     # Negativo Grande: < -3°C
+            'NM': ('tri', [-5, -3, -1.5]),          # Negativo Médio: -5 a -1.5°C
+            'NS': ('tri', [-2.5, -1, 0]),           # Negativo Pequeno: -2.5 a 0°C
+            'ZE': ('tri', [-1, 0, 1]),              # Zero: -1 a +1°C
+            'PS': ('tri', [0, 1.5, 3]),             # Positivo Pequeno: 0 a +3°C
+            'PM': ('tri', [2, 4, 6]),               # Positivo Médio: +2 a +6°C
+            'PB': ('trap', [5, 7, 10, 10])          # Positivo Grande: > +5°C
         }
         
         # DELTA ERRO
-        self.delta_erro_mf = {
-            'NB': lambda x: self._trapmf(x, [-5, -5, -4, -2]),       # Negativo Grande
-            'NM': lambda x: self._trimf(x, [-4, -2, -1]),            # Negativo Médio
-            'NS': lambda x: self._trimf(x, [-2, -1, 0]),             # Negativo Pequeno
-            'ZE': lambda x: self._trimf(x, [-1, 0, 1]),              # Zero
-            'PS': lambda x: self._trimf(x, [0, 1, 2]),               # Positivo Pequeno
-            'PM': lambda x: self._trimf(x, [1, 2, 4]),               # Positivo Médio
-            'PB': lambda x: self._trapmf(x, [2, 4, 5, 5])            # Positivo Grande
+        self.delta_erro_params = {
+            'NB': ('trap', [-5, -5, -4, -2]),       # Negativo Grande
+            'NM': ('tri', [-4, -2, -1]),            # Negativo Médio
+            'NS': ('tri', [-2, -1, 0]),             # Negativo Pequeno
+            'ZE': ('tri', [-1, 0, 1]),              # Zero
+            'PS': ('tri', [0, 1, 2]),               # Positivo Pequeno
+            'PM': ('tri', [1, 2, 4]),               # Positivo Médio
+            'PB': ('trap', [2, 4, 5, 5])            # Positivo Grande
         }
         
         # TEMPERATURA EXTERNA
-        self.temp_externa_mf = {
-            'Baixa': lambda x: self._trapmf(x, [10, 10, 15, 20]),
-            'Media': lambda x: self._trimf(x, [15, 22, 28]),
-            'Alta': lambda x: self._trapmf(x, [25, 30, 35, 35])
+        self.temp_externa_params = {
+            'Baixa': ('trap', [10, 10, 15, 20]),
+            'Media': ('tri', [15, 22, 28]),
+            'Alta': ('trap', [25, 30, 35, 35])
         }
         
         # CARGA TÉRMICA
-        self.carga_termica_mf = {
-            'Baixa': lambda x: self._trapmf(x, [0, 0, 20, 40]),
-            'Media': lambda x: self._trimf(x, [30, 50, 70]),
-            'Alta': lambda x: self._trapmf(x, [60, 80, 100, 100])
+        self.carga_termica_params = {
+            'Baixa': ('trap', [0, 0, 20, 40]),
+            'Media': ('tri', [30, 50, 70]),
+            'Alta': ('trap', [60, 80, 100, 100])
         }
         
         # POTÊNCIA CRAC (SAÍDA) - REDISTRIBUÍDA para melhor cobertura
-        self.potencia_crac_mf = {
-            'MB': lambda x: self._trapmf(x, [0, 0, 5, 15]),          # Muito Baixa: 0-15%
-            'B': lambda x: self._trimf(x, [10, 25, 40]),             # Baixa: 10-40%
-            'M': lambda x: self._trimf(x, [30, 50, 70]),             # Média: 30-70%
-            'A': lambda x: self._trimf(x, [60, 75, 90]),             # Alta: 60-90%
-            'MA': lambda x: self._trapmf(x, [85, 95, 100, 100])      # Muito Alta: 85-100%
+        self.potencia_crac_params = {
+            'MB': ('trap', [0, 0, 5, 15]),          # Muito Baixa: 0-15%
+            'B': ('tri', [10, 25, 40]),             # Baixa: 10-40%
+            'M': ('tri', [30, 50, 70]),             # Média: 30-70%
+            'A': ('tri', [60, 75, 90]),             # Alta: 60-90%
+            'MA': ('trap', [85, 95, 100, 100])      # Muito Alta: 85-100%
+        }
+        
+        self.erro_mf = self._build_mf(self.erro_params)
+        self.delta_erro_mf = self._build_mf(self.delta_erro_params)
+        self.temp_externa_mf = self._build_mf(self.temp_externa_params)
+        self.carga_termica_mf = self._build_mf(self.carga_termica_params)
+        self.potencia_crac_mf = self._build_mf(self.potencia_crac_params)
+        
+        # Curvas dos termos de saída pré-calculadas sobre o universo (5, N),
+        # na ordem de potencia_crac_terms (usadas na defuzzificação)
+        self.potencia_crac_curves = np.array([
+            self.potencia_crac_mf[term](self.potencia_crac_universe)
+            for term in self.potencia_crac_terms
+        ])
+        self.potencia_crac_curves.setflags(write=False)
+        
+        # Geometria exata (vértices) dos termos de saída, para a
+        # defuzzificação analítica
+        self.potencia_crac_vertices = [
+            self._vertices(*self.potencia_crac_params[term])
+            for term in self.potencia_crac_terms
+        ]
+        # Decomposição do conjunto agregado para o centroide analítico:
+        # max_k min(μ_k, h_k) = Σ ±min(μ_S, min h_S) sobre os grupos S de termos
+        # que se sobrepõem (inclusão-exclusão), com μ_S = min dos μ_k de S.
+        # Segmentos (grupo, sinal, x0, y0, x1, y1) dos polígonos μ_S
+        self.potencia_crac_overlaps, self.potencia_crac_segments = self._output_geometry()
+        self.potencia_crac_segment_rows = [
+            (int(row[0]),) + tuple(row[1:]) for row in self.potencia_crac_segments.tolist()
+        ]
+        
+        # Termos e parâmetros indexados pelo nome da variável
+        self.variables = {
+            'erro': (self.erro_terms, self.erro_params),
+            'delta_erro': (self.delta_erro_terms, self.delta_erro_params),
+            'temp_externa': (self.temp_externa_terms, self.temp_externa_params),
+            'carga_termica': (self.carga_termica_terms, self.carga_termica_params),
+            'potencia_crac': (self.potencia_crac_terms, self.potencia_crac_params)
+        }
+        
+        self._term_functions = {
+            'erro': self.erro_mf,
+            'delta_erro': self.delta_erro_mf,
+            'temp_externa': self.temp_externa_mf,
+            'carga_termica': self.carga_termica_mf,
+            'potencia_crac': self.potencia_crac_mf
         }
+        
+        # Tabela compacta de pontos de quebra por variável: linha (a, b, c, d)
+        # por termo (triangulares como (a, b, b, c)) + indicador trapezoidal
+        self._scalar_table = {}
+        self._term_index = {}
+        for variable, (terms, term_params) in self.variables.items():
+            rows = []
+            for term in terms:
+                shape, params = term_params[term]
+                if shape == 'trap':
+                    rows.append(tuple(float(p) for p in params) + (True,))
+                else:
+                    a, b, c = (float(p) for p in params)
+                    rows.append((a, b, b, c, False))
+            self._scalar_table[variable] = rows
+            self._term_index[variable] = {term: j for j, term in enumerate(terms)}
+        
+        # Colunas (n_termos, 1) para o caminho vetorizado, com as comparações
+        # estritas/não estritas de _trimf e _trapmf: subida até rise_end
+        # (exclusive), descida depois de fall_start; entre os dois, topo
+        self._array_table = {}
+        for variable, table in self._scalar_table.items():
+            columns = np.array([
+                (a, b - a + 1e-10, d, d - c + 1e-10,
+                 b if trap else np.nextafter(b, np.inf), c)
+                for a, b, c, d, trap in table
+            ])
+            self._array_table[variable] = tuple(columns.T[:, :, np.newaxis])
+    
+    def _build_mf(self, term_params):
+        """Cria as funções de pertinência (term -> função) a partir dos parâmetros"""
+        mf = {}
+        for term, (shape, params) in term_params.items():
+            func = self._trapmf if shape == 'trap' else self._trimf
+            mf[term] = lambda x, func=func, params=params: func(x, params)
+        return mf
+    
+    def _vertices(self, shape, params):
+        """
+        Vértices (xs, ys) do polígono de uma função triangular/trapezoidal
+        Ombros verticais (a == b ou c == d) mantêm só o vértice de altura 1,
+        como no caminho escalar (_trapmf vale 1 em x == a quando a == b)
+        """
+        if shape == 'trap':
+            xs, ys = list(params), [0.0, 1.0, 1.0, 0.0]
+        else:
+            xs, ys = list(params), [0.0, 1.0, 0.0]
+        
+        if xs[0] == xs[1]:
+            xs, ys = xs[1:], ys[1:]
+        if xs[-1] == xs[-2]:
+            xs, ys = xs[:-1], ys[:-1]
+        return xs, ys
+    
+    def _output_geometry(self):
+        """
+        Grupos de termos de saída com suporte em comum e segmentos dos polígonos
+        μ_S. Entre as abscissas fixas (vértices e cruzamentos entre segmentos
+        de termos diferentes) cada termo é uma reta e a ordem entre eles não
+        muda, então μ_S também é linear por partes nessas abscissas
+        """
+        lower = float(self.potencia_crac_universe[0])
+        upper = float(self.potencia_crac_universe[-1])
+        knots = {lower, upper}
+        sloped = []
+        for k, (xs, ys) in enumerate(self.potencia_crac_vertices):
+            knots.update(x for x in xs if lower < x < upper)
+            sloped.extend(
+                (k, xs[i], ys[i], xs[i + 1], ys[i + 1])
+                for i in range(len(xs) - 1) if ys[i] != ys[i + 1]
+            )
+        
+        for i, (ki, ax0, ay0, ax1, ay1) in enumerate(sloped):
+            for kj, bx0, by0, bx1, by1 in sloped[i + 1:]:
+                left, right = max(ax0, bx0), min(ax1, bx1)
+                if ki == kj or left >= right:
+                    continue
+                slope_a = (ay1 - ay0) / (ax1 - ax0)
+                slope_b = (by1 - by0) / (bx1 - bx0)
+                if slope_a != slope_b:
+                    x = (by0 - ay0 + slope_a * ax0 - slope_b * bx0) / (slope_a - slope_b)
+                    if left < x < right:
+                        knots.add(x)
+        
+        knots = np.array(sorted(knots))
+        values = np.array([
+            np.interp(knots, xs, ys, left=0.0, right=0.0)
+            for xs, ys in self.potencia_crac_vertices
+        ])
+        
+        overlaps = []
+        segments = []
+        for size in range(1, len(values) + 1):
+            for group in itertools.combinations(range(len(values)), size):
+                group_values = values[list(group)].min(axis=0)
+                if not np.any(group_values > 0):
+                    continue
+                # Polígono de μ_S no suporte, sem vértices intermediários colineares
+                support = np.flatnonzero(group_values > 0)
+                first, last = max(support[0] - 1, 0), min(support[-1] + 1, knots.size - 1)
+                points = [(knots[first], group_values[first])]
+                for i in range(first + 1, last + 1):
+                    x, y = knots[i], group_values[i]
+                    if len(points) > 1:
+                        (xa, ya), (xb, yb) = points[-2], points[-1]
+                        if abs((yb - ya) * (x - xa) - (y - ya) * (xb - xa)) < 1e-12:
+                            points[-1] = (x, y)
+                            continue
+                    points.append((x, y))
+                
+                sign = 1.0 if size % 2 else -1.0
+                for (x0, y0), (x1, y1) in zip(points[:-1], points[1:]):
+                    segments.append((len(overlaps), sign, x0, y0, x1, y1))
+                overlaps.append(group)
+        
+        segments = np.array(segments)
+        segments.setflags(write=False)
+        return tuple(overlaps), segments
     
     def _trimf(self, x, params):
         """Função de pertinência triangular"""
         a, b, c = params
         if isinstance(x, np.ndarray):
             result = np.zeros_like(x, dtype=float)
-            result = np.maximum(np.minimum((x - a) / (b - a + 1e-10), 
+            result = np.maximum(np.minimum((x - a) / (b - a + 1e-10),
                                           (c - x) / (c - b + 1e-10)), 0)
             return result
         else:
@@ -105,20 +272,72 @@ class MembershipFunctions:
             else:  # c < x <= d
                 return (d - x) / (d - c + 1e-10)
     
+    def fuzzify(self, variable, value):
+        """
+        Fuzzifica uma variável em uma única passada pela tabela de pontos de quebra
+        - escalar: lista com a pertinência de cada termo (ordem de <variável>_terms)
+        - array: matriz (N, n_termos)
+        Mesma semântica de _trimf/_trapmf no caminho escalar
+        """
+        if variable not in self._scalar_table:
+            raise ValueError(f"Variável desconhecida: {variable}")
+        
+        if isinstance(value, (int, float)) or np.ndim(value) == 0:
+            return self._fuzzify_scalar(self._scalar_table[variable], float(value))
+        return self._fuzzify_array(variable, value)
+    
+    def _fuzzify_scalar(self, table, x):
+        """Pertinências de um valor escalar (sem lambdas nem numpy)"""
+        memberships = []
+        for a, b, c, d, trap in table:
+            if trap:
+                if x < a or x > d:
+                    memberships.append(0.0)
+                elif x < b:
+                    memberships.append((x - a) / (b - a + 1e-10))
+                elif x <= c:
+                    memberships.append(1.0)
+                else:
+                    memberships.append((d - x) / (d - c + 1e-10))
+            else:
+                if x <= a or x >= d:
+                    memberships.append(0.0)
+                elif x <= b:
+                    memberships.append((x - a) / (b - a + 1e-10))
+                else:
+                    memberships.append((d - x) / (d - c + 1e-10))
+        return memberships
+    
+    def _fuzzify_array(self, variable, values):
+        """
+        Pertinências de um array de valores: matriz (N, n_termos)
+        Todos os termos de uma vez, só com min/max (sem np.where):
+        min(max(subida, x >= rise_end), max(descida, x <= fall_start), 1)
+        escolhe exatamente o trecho do caminho escalar; fora do suporte dá 0
+        """
+        a, rise_width, d, fall_width, rise_end, fall_start = self._array_table[variable]
+        x = np.asarray(values, dtype=float).ravel()
+        
+        # Cálculo em (n_termos, N): laço interno contíguo sobre os valores
+        degree = x - a
+        degree /= rise_width
+        np.maximum(degree, x >= rise_end, out=degree)
+        falling = d - x
+        falling /= fall_width
+        np.maximum(falling, x <= fall_start, out=falling)
+        np.minimum(degree, falling, out=degree)
+        np.minimum(degree, 1.0, out=degree)
+        return degree.T
+    
     def get_membership(self, variable, term, value):
         """Retorna o grau de pertinência de um valor em um termo linguístico"""
-        if variable == 'erro':
-            return self.erro_mf[term](value)
-        elif variable == 'delta_erro':
-            return self.delta_erro_mf[term](value)
-        elif variable == 'temp_externa':
-            return self.temp_externa_mf[term](value)
-        elif variable == 'carga_termica':
-            return self.carga_termica_mf[term](value)
-        elif variable == 'potencia_crac':
-            return self.potencia_crac_mf[term](value)
-        else:
+        if variable not in self._scalar_table:
             raise ValueError(f"Variável desconhecida: {variable}")
+        
+        if isinstance(value, (int, float)) or np.ndim(value) == 0:
+            row = self._scalar_table[variable][self._term_index[variable][term]]
+            return self._fuzzify_scalar([row], float(value))[0]
+        return self._term_functions[variable][term](value)
     
     def get_all_membership_data(self):
         """Retorna dados de todas as funções de pertinência para visualização"""
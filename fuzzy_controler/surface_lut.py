@@ -0,0 +1,205 @@
+import bisect
+import json
+import os
+import numpy as np
+
+class SurfaceLUT:
+    """
+    Superfície de controle pré-calculada (lookup table)
+    Amostra o espaço de entrada 4-D (erro, delta_erro, temp_externa,
+    carga_termica) em uma grade e responde por interpolação multilinear:
+    custo O(1) por chamada, sem executar a inferência Mamdani
+    """
+    
+    INPUTS = ['erro', 'delta_erro', 'temp_externa', 'carga_termica']
+    
+    # Pontos uniformes por eixo (os pontos de quebra das funções de
+    # pertinência são sempre acrescentados à grade)
+    DEFAULT_POINTS = (41, 21, 11, 11)
+    
+    # Distância (fração da faixa) dos nós extras em torno das bordas dos termos
+    EDGE_OFFSET = 1e-6
+    
+    # Pontos aleatórios da estimativa de erro feita em build()
+    ERROR_SAMPLES = 50000
+    
+    def __init__(self, axes, table, fingerprint=None, error_estimate=None):
+        self.axes = [np.asarray(axis, dtype=float) for axis in axes]
+        self.table = table
+        self.fingerprint = fingerprint
+        # Estatísticas de erro por amostragem (estimate_error), não um limite garantido
+        self.error_estimate = error_estimate
+        
+        # Listas Python para a busca escalar (bisect) sem overhead do NumPy
+        self._axes_lists = [axis.tolist() for axis in self.axes]
+        self._lower = [axis[0] for axis in self._axes_lists]
+        self._upper = [axis[-1] for axis in self._axes_lists]
+        
+        # Vista plana da tabela e deslocamentos dos 16 vértices de uma célula
+        self._flat = np.asarray(table).reshape(-1)
+        strides = np.cumprod((1,) + tuple(axis.size for axis in self.axes[:0:-1]))[::-1].tolist()
+        self._strides = strides
+        self._corners = [
+            (sum(offset * stride for offset, stride in zip(corner, strides)), corner)
+            for corner in np.ndindex(2, 2, 2, 2)
+        ]
+    
+    @classmethod
+    def build_axes(cls, controller, points=None):
+        """
+        Grade de cada entrada: pontos uniformes + pontos de quebra das funções
+        Nas bordas do suporte de cada termo a superfície pode ter degraus
+        (células sem regra caem no valor padrão de 50%), então a grade também
+        ganha nós logo antes e logo depois de cada borda
+        """
+        points = points or cls.DEFAULT_POINTS
+        axes = []
+        for variable, n in zip(cls.INPUTS, points):
+            lower, upper = controller.INPUT_RANGES[variable]
+            step = (upper - lower) * cls.EDGE_OFFSET
+            nodes = [np.linspace(lower, upper, n)]
+            for _, params in controller.mf.variables[variable][1].values():
+                nodes.append(params)
+                nodes.append([params[0] - step, params[0] + step,
+                              params[-1] - step, params[-1] + step])
+            axis = np.unique(np.concatenate(nodes))
+            axes.append(axis[(axis >= lower) & (axis <= upper)])
+        return axes
+    
+    @classmethod
+    def build(cls, controller, points=None, chunk_size=20000, error_samples=ERROR_SAMPLES):
+        """
+        Calcula a tabela com a inferência exata do controlador
+        (em blocos, para limitar a memória da inferência vetorizada)
+        error_samples: pontos aleatórios de estimate_error (0 = sem estimativa)
+        """
+        axes = cls.build_axes(controller, points)
+        shape = tuple(axis.size for axis in axes)
+        table = np.empty(int(np.prod(shape)))
+        
+        for start in range(0, table.size, chunk_size):
+            flat = np.arange(start, min(start + chunk_size, table.size))
+            idx = np.unravel_index(flat, shape)
+            table[flat] = controller.calculate_batch(
+                *[axis[i] for axis, i in zip(axes, idx)], use_lut=False
+            )
+        
+        lut = cls(axes, table.reshape(shape), fingerprint=controller.fingerprint())
+        if error_samples:
+            lut.error_estimate = lut.estimate_error(controller, samples=error_samples)
+        return lut
+    
+    def interpolate(self, erro, delta_erro, temp_externa, carga_termica):
+        """Interpolação multilinear na grade (entradas saturadas nas faixas)"""
+        values = (erro, delta_erro, temp_externa, carga_termica)
+        if all(isinstance(v, (int, float)) or np.ndim(v) == 0 for v in values):
+            return self._interpolate_scalar(values)
+        return self._interpolate_array(values)
+    
+    def _interpolate_scalar(self, values):
+        """Caminho escalar: bisect em cada eixo + 16 vértices da célula"""
+        base = 0
+        weights = []
+        for x, axis, lower, upper, stride in zip(values, self._axes_lists, self._lower,
+                                                 self._upper, self._strides):
+            x = min(max(float(x), lower), upper)
+            i = min(bisect.bisect_right(axis, x) - 1, len(axis) - 2)
+            t = (x - axis[i]) / (axis[i + 1] - axis[i])
+            base += i * stride
+            weights.append((1 - t, t))
+        
+        (w0, w1, w2, w3) = weights
+        flat = self._flat
+        result = 0.0
+        for offset, (a, b, c, d) in self._corners:
+            result += w0[a] * w1[b] * w2[c] * w3[d] * flat[base + offset]
+        return float(result)
+    
+    def _interpolate_array(self, values):
+        """Caminho vetorizado (arrays com broadcast)"""
+        values = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in values])
+        shape = values[0].shape
+        
+        indices = []
+        weights = []
+        for x, axis in zip(values, self.axes):
+            x = np.clip(x.ravel(), axis[0], axis[-1])
+            i = np.clip(np.searchsorted(axis, x, side='right') - 1, 0, axis.size - 2)
+            indices.append(i)
+            weights.append((x - axis[i]) / (axis[i + 1] - axis[i]))
+        
+        result = np.zeros(indices[0].shape)
+        for corner in np.ndindex(2, 2, 2, 2):
+            weight = np.ones_like(result)
+            for t, offset in zip(weights, corner):
+                weight *= t if offset else 1 - t
+            result += weight * self.table[tuple(i + offset for i, offset in zip(indices, corner))]
+        
+        return result.reshape(shape)
+    
+    def estimate_error(self, controller, samples=ERROR_SAMPLES, seed=0, threshold=5.0):
+        """
+        Erro da interpolação contra a inferência exata em pontos aleatórios
+        Retorna o número de amostras e, sobre elas, o erro absoluto máximo,
+        médio, RMS, percentil 99 e a fração acima de threshold (em % de potência)
+        São estatísticas da amostra: max_abs_sampled não é um limite do erro
+        (perto das bordas dos termos a superfície tem degraus)
+        """
+        rng = np.random.default_rng(seed)
+        inputs = [
+            rng.uniform(*controller.INPUT_RANGES[variable], samples) for variable in self.INPUTS
+        ]
+        
+        exact = controller.calculate_batch(*inputs, use_lut=False)
+        error = np.abs(self.interpolate(*inputs) - exact)
+        
+        return {
+            'samples': int(samples),
+            'max_abs_sampled': float(np.max(error)),
+            'mean_abs': float(np.mean(error)),
+            'rms': float(np.sqrt(np.mean(error ** 2))),
+            'p99_abs': float(np.percentile(error, 99)),
+            'threshold': threshold,
+            'fraction_over_threshold': float(np.mean(error > threshold))
+        }
+    
+    def save(self, path):
+        """
+        Salva a tabela em <path>.npy e os metadados (eixos, versão) em <path>.json
+        """
+        path = os.path.splitext(path)[0]
+        np.save(path + '.npy', np.asarray(self.table))
+        with open(path + '.json', 'w') as f:
+            json.dump({
+                'inputs': self.INPUTS,
+                'axes': self._axes_lists,
+                'fingerprint': self.fingerprint,
+                'error_estimate': self.error_estimate
+            }, f)
+    
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Carrega a tabela salva (memory-mapped por padrão)"""
+        path = os.path.splitext(path)[0]
+        with open(path + '.json') as f:
+            meta = json.load(f)
+        table = np.load(path + '.npy', mmap_mode='r' if mmap else None)
+        return cls(meta['axes'], table, fingerprint=meta.get('fingerprint'),
+                   error_estimate=meta.get('error_estimate'))
+    
+    @classmethod
+    def load_or_build(cls, controller, path, points=None):
+        """
+        Carrega a tabela de disco se ela foi gerada para a mesma base de regras
+        e funções de pertinência (fingerprint); caso contrário recalcula e salva
+        """
+        base = os.path.splitext(path)[0]
+        if os.path.exists(base + '.npy') and os.path.exists(base + '.json'):
+            lut = cls.load(base)
+            expected_shape = tuple(axis.size for axis in cls.build_axes(controller, points))
+            if lut.fingerprint == controller.fingerprint() and lut.table.shape == expected_shape:
+                return lut
+        
+        lut = cls.build(controller, points)
+        lut.save(base)
+        return lut
@@ -0,0 +1,149 @@
+import json
+import math
+import threading
+import time
+import numpy as np
+
+class ControlLoop:
+    """
+    Malha de controle fechada via MQTT (serviço sem Flask)
+    Sensores publicam em datacenter/sensors/<dispositivo>/<grandeza> um valor
+    numérico (texto ou JSON); grandezas aceitas em FIELDS. A cada tick, todos
+    os dispositivos com temperatura nova são avaliados em uma única inferência
+    em lote (calculate_batch), cada um com seu próprio erro_anterior, e a
+    potência vai para datacenter/crac/<dispositivo>/command
+    O estado dos dispositivos fica em arrays (um elemento por dispositivo)
+    """
+    
+    SENSOR_TOPIC = 'datacenter/sensors/+/+'
+    COMMAND_TOPIC = 'datacenter/crac/{device}/command'
+    FIELDS = ('temperature', 'temp_externa', 'carga_termica', 'setpoint')
+    # Valores usados até o dispositivo publicar a grandeza
+    DEFAULTS = {'temp_externa': 25.0, 'carga_termica': 40.0}
+    
+    def __init__(self, fuzzy_controller, mqtt_client, setpoint=22.0, command_qos=1,
+                 capacity=1024):
+        self.fuzzy = fuzzy_controller
+        self.mqtt_client = mqtt_client
+        self.command_qos = command_qos
+        self._defaults = dict(self.DEFAULTS, temperature=np.nan, setpoint=setpoint)
+        self._lock = threading.Lock()
+        
+        self.devices = []
+        self._index = {}
+        self._state = {field: np.full(capacity, self._defaults[field]) for field in self.FIELDS}
+        self._erro_anterior = np.full(capacity, np.nan)
+        self._dirty = np.zeros(capacity, dtype=bool)
+        
+        self.ticks = 0
+        self.commands = 0
+        self.messages = 0
+        self.ignored = 0
+        self.last_tick_seconds = 0.0
+    
+    def start(self):
+        """Assina os tópicos dos sensores"""
+        self.mqtt_client.subscribe(self.SENSOR_TOPIC, self.handle_message)
+        return self
+    
+    def _device_index(self, device):
+        """Índice do dispositivo nos arrays de estado (cria se for novo). Chamado com _lock"""
+        index = self._index.get(device)
+        if index is not None:
+            return index
+        
+        index = len(self.devices)
+        capacity = self._dirty.size
+        if index == capacity:
+            # Dobra a capacidade dos arrays
+            for field in self.FIELDS:
+                self._state[field] = np.append(self._state[field], np.full(capacity, self._defaults[field]))
+            self._erro_anterior = np.append(self._erro_anterior, np.full(capacity, np.nan))
+            self._dirty = np.append(self._dirty, np.zeros(capacity, dtype=bool))
+        
+        self.devices.append(device)
+        self._index[device] = index
+        return index
+    
+    def update(self, device, field, value):
+        """Registra uma leitura; nova temperatura marca o dispositivo para o próximo tick"""
+        if field not in self.FIELDS:
+            raise ValueError(f"Grandeza desconhecida: {field}")
+        value = float(value)
+        # NaN/Infinity (aceitos por json.loads) contaminariam o erro_anterior
+        if not math.isfinite(value):
+            raise ValueError(f"Valor não finito para {field}: {value}")
+        with self._lock:
+            index = self._device_index(device)
+            self._state[field][index] = value
+            if field == 'temperature':
+                self._dirty[index] = True
+    
+    def handle_message(self, topic, payload):
+        """Callback das mensagens dos sensores (mensagens inválidas ou não finitas são ignoradas)"""
+        self.messages += 1
+        try:
+            _, _, device, field = topic.split('/')
+            value = json.loads(payload)
+            if isinstance(value, dict):
+                value = value[field]
+            self.update(device, field, value)
+        except (ValueError, KeyError, TypeError):
+            self.ignored += 1
+    
+    def tick(self):
+        """
+        Uma rodada de controle: inferência em lote para os dispositivos com
+        temperatura nova e publicação dos comandos
+        Retorna {dispositivo: potencia_crac}
+        """
+        start = time.perf_counter()
+        with self._lock:
+            n = len(self.devices)
+            indices = np.flatnonzero(self._dirty[:n])
+            if indices.size == 0:
+                return {}
+            
+            erro = self._state['temperature'][indices] - self._state['setpoint'][indices]
+            erro_anterior = self._erro_anterior[indices]
+            # Primeira leitura do dispositivo: sem variação
+            delta_erro = np.where(np.isnan(erro_anterior), 0.0, erro - erro_anterior)
+            temp_externa = self._state['temp_externa'][indices]
+            carga_termica = self._state['carga_termica'][indices]
+            
+            self._erro_anterior[indices] = erro
+            self._dirty[indices] = False
+            devices = [self.devices[i] for i in indices]
+        
+        potencia_crac = self.fuzzy.calculate_batch(erro, delta_erro, temp_externa, carga_termica)
+        
+        timestamp = time.time()
+        for device, power, device_erro in zip(devices, potencia_crac.tolist(), erro.tolist()):
+            command = {'potencia_crac': power, 'erro': device_erro, 'timestamp': timestamp}
+            self.mqtt_client.publish(self.COMMAND_TOPIC.format(device=device), json.dumps(command),
+                                     qos=self.command_qos)
+        
+        self.ticks += 1
+        self.commands += len(devices)
+        self.last_tick_seconds = time.perf_counter() - start
+        return dict(zip(devices, potencia_crac.tolist()))
+    
+    def run(self, interval=1.0, stop_event=None):
+        """Executa tick() a cada interval segundos até stop_event ser sinalizado"""
+        stop_event = stop_event or threading.Event()
+        next_tick = time.monotonic()
+        while not stop_event.is_set():
+            self.tick()
+            next_tick += interval
+            stop_event.wait(max(0.0, next_tick - time.monotonic()))
+    
+    def stats(self):
+        """Contadores do serviço"""
+        return {
+            'devices': len(self.devices),
+            'ticks': self.ticks,
+            'commands': self.commands,
+            'messages': self.messages,
+            'ignored': self.ignored,
+            'last_tick_ms': self.last_tick_seconds * 1000
+        }
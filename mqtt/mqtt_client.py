@@ -1,15 +1,54 @@
 import paho.mqtt.client as mqtt
 import json
+import threading
 import time
+from collections import deque
+from . import telemetry_codec
+from .topic_policy import TopicPolicy, TopicRateLimiter
 
 class MQTTClient:
-    """Cliente MQTT para monitoramento"""
+    """
+    Cliente MQTT para monitoramento
+    Reconexão automática (loop do paho, espera exponencial entre
+    reconnect_delay[0] e reconnect_delay[1] segundos) e buffer offline:
+    depois de connect(), mensagens publicadas sem conexão vão para um
+    buffer circular limitado (buffer_size; as mais antigas são descartadas)
+    e são reenviadas em ordem ao reconectar
+    Publicações QoS>=1 que o paho recusa por falta de conexão ficam na fila
+    do próprio paho (reenviadas por ele ao reconectar, logo após o buffer) e
+    não entram no buffer, para não chegarem duas vezes; essa fila é limitada
+    a buffer_size e, cheia, as mensagens seguem para o buffer
+    Cada tópico tem sua política (TopicPolicy): QoS, retain, limite de taxa
+    e coalescência; policies sobrescreve DEFAULT_POLICIES por nome de tópico
+    """
     
-    def __init__(self, broker="localhost", port=1883):
+    # Formato dos dados de controle: JSON ou binário compacto (telemetry_codec);
+    # registros sem esquema binário (ex.: métricas finais) seguem em JSON
+    PAYLOAD_FORMATS = ('json', 'binary')
+    
+    # temp é um escalar derivado de control, publicado a cada passo:
+    # QoS 0 evita um PUBACK por mensagem. Alertas e dados de controle mantêm QoS 1
+    DEFAULT_POLICIES = {
+        'alert': TopicPolicy(qos=1),
+        'control': TopicPolicy(qos=1),
+        'temp': TopicPolicy(qos=0)
+    }
+    
+    # Códigos do paho em que a mensagem não foi aceita, mas pode ser reenviada
+    RETRY_CODES = (mqtt.MQTT_ERR_NO_CONN, mqtt.MQTT_ERR_QUEUE_SIZE)
+    
+    def __init__(self, broker="localhost", port=1883, payload_format='json',
+                 buffer_size=1000, reconnect_delay=(1, 30), client_factory=None,
+                 policies=None):
+        if payload_format not in self.PAYLOAD_FORMATS:
+            raise ValueError(f"Formato de payload desconhecido: {payload_format}")
         self.broker = broker
         self.port = port
-        # Compatível com paho-mqtt 1.6.1
-        self.client = mqtt.Client()
+        self.payload_format = payload_format
+        # Compatível com paho-mqtt 1.6.1 (client_factory: substituto em testes)
+        self.client = (client_factory or mqtt.Client)()
+        self.client.reconnect_delay_set(*reconnect_delay)
+        self.client.max_queued_messages_set(buffer_size)
         self.connected = False
         
         self.topics = {
@@ -18,15 +57,42 @@ class MQTTClient:
             'temp': 'datacenter/fuzzy/temp'
         }
         
+        self.policies = dict(self.DEFAULT_POLICIES, **(policies or {}))
+        unknown = set(self.policies) - set(self.topics)
+        if unknown:
+            raise ValueError(f"Políticas para tópicos desconhecidos: {sorted(unknown)}")
+        self._limiters = {name: TopicRateLimiter(policy) for name, policy in self.policies.items()}
+        self._timers = {}
+        self._policy_lock = threading.Lock()
+        # Assinaturas (filtro -> qos), refeitas a cada reconexão
+        self._subscriptions = {}
+        
+        # Conexão pronta (sinalizada pelo callback, sem espera fixa)
+        self._ready = threading.Event()
+        self._started = False
+        # Buffer offline (tópico, payload, qos) e contadores
+        self._lock = threading.Lock()
+        self._buffer = deque(maxlen=buffer_size)
+        self.buffered = 0
+        self.buffer_dropped = 0
+        self.replayed = 0
+        self.paho_queued = 0
+        self.publish_errors = 0
+        self.reconnects = 0
+        
         # Configura callbacks
         self.client.on_connect = self._on_connect
         self.client.on_disconnect = self._on_disconnect
     
     def _on_connect(self, client, userdata, flags, rc):
-        """Callback quando conecta"""
+        """Callback quando conecta (também a cada reconexão)"""
         if rc == 0:
             self.connected = True
             print(f"🟢 MQTT conectado ao broker {self.broker}:{self.port}")
+            for topic_filter, qos in list(self._subscriptions.items()):
+                self.client.subscribe(topic_filter, qos)
+            self._replay()
+            self._ready.set()
         else:
             self.connected = False
             print(f"❌ Falha na conexão MQTT. Código: {rc}")
@@ -34,54 +100,218 @@ class MQTTClient:
     def _on_disconnect(self, client, userdata, rc):
         """Callback quando desconecta"""
         self.connected = False
+        self._ready.clear()
         if rc != 0:
-            print(f"⚠️ MQTT desconectado inesperadamente. Código: {rc}")
+            self.reconnects += 1
+            print(f"⚠️ MQTT desconectado inesperadamente. Código: {rc} (reconectando...)")
     
-    def connect(self):
-        """Conecta ao broker MQTT"""
+    def connect(self, timeout=0.0):
+        """
+        Inicia a conexão ao broker sem bloquear; o loop do paho reconecta
+        sozinho se o broker cair ou ainda não estiver no ar.
+        Espera até timeout segundos pela conexão e retorna se ela está pronta
+        """
         try:
-            self.client.connect(self.broker, self.port, 60)
+            self.client.connect_async(self.broker, self.port, 60)
             self.client.loop_start()
-            time.sleep(0.5)  # Aguarda conexão estabelecer
-            return self.connected
+            self._started = True
         except Exception as e:
             print(f"❌ Erro ao conectar MQTT: {e}")
             self.connected = False
             return False
+        return self.wait_until_ready(timeout)
+    
+    def wait_until_ready(self, timeout=None):
+        """Aguarda a conexão (e o reenvio do buffer); False se o tempo esgotar"""
+        return self._ready.wait(timeout)
     
     def disconnect(self):
-        """Desconecta do broker"""
+        """Desconecta do broker (publica antes as mensagens coalescidas pendentes)"""
+        self.flush_pending()
+        self._started = False
         self.client.loop_stop()
         self.client.disconnect()
         self.connected = False
+        self._ready.clear()
     
-    def publish_alert(self, alert_data):
-        """Publica alerta"""
-        if self.connected and self.client.is_connected():
+    def _encode(self, data):
+        """Payload de controle (registro ou lista): binário se configurado e possível, senão JSON"""
+        if self.payload_format == 'binary':
             try:
-                payload = json.dumps(alert_data)
-                result = self.client.publish(self.topics['alert'], payload, qos=1)
-                return result.rc == mqtt.MQTT_ERR_SUCCESS
-            except Exception as e:
-                print(f"⚠️ Erro ao publicar alerta: {e}")
-                return False
+                return telemetry_codec.encode(data)
+            except ValueError:
+                pass
+        return json.dumps(data)
+    
+    def _send(self, topic, payload, qos, retain):
+        """Publica no paho; retorna o código do paho (MQTT_ERR_SUCCESS se aceita)"""
+        try:
+            return self.client.publish(topic, payload, qos=qos, retain=retain).rc
+        except Exception as e:
+            # Ex.: tópico com curingas ou payload inválido
+            print(f"⚠️ Erro ao publicar em {topic}: {e}")
+            return mqtt.MQTT_ERR_INVAL
+    
+    def _kept_by_paho(self, rc, qos):
+        """
+        Sem conexão, o paho guarda as mensagens QoS>=1 e as reenvia sozinho ao
+        reconectar (is_connected() segue True até o on_disconnect). Chamado com _lock
+        """
+        if rc == mqtt.MQTT_ERR_NO_CONN and qos > 0:
+            self.paho_queued += 1
+            return True
         return False
     
-    def publish_control_data(self, data):
-        """Publica dados de controle"""
-        if self.connected and self.client.is_connected():
-            try:
-                payload = json.dumps(data)
-                self.client.publish(self.topics['control'], payload, qos=1)
-                self.client.publish(self.topics['temp'], str(data.get('erro', 0)), qos=1)
+    def _drain(self):
+        """
+        Reenvia o buffer offline em ordem. Chamado com _lock
+        Para se a conexão cair (MQTT_ERR_NO_CONN) ou a fila do paho estiver cheia;
+        mensagens com outros erros são descartadas e contadas.
+        Retorna True se o buffer ficou vazio
+        """
+        while self._buffer:
+            topic, payload, qos, retain = self._buffer[0]
+            rc = self._send(topic, payload, qos, retain)
+            if self._kept_by_paho(rc, qos):
+                self._buffer.popleft()
+                return False
+            if rc in self.RETRY_CODES:
+                return False
+            self._buffer.popleft()
+            if rc == mqtt.MQTT_ERR_SUCCESS:
+                self.replayed += 1
+            else:
+                self.publish_errors += 1
+        return True
+    
+    def _publish(self, topic, payload, qos=1, retain=False):
+        """
+        Publica ou, sem conexão (após connect()), guarda no buffer offline
+        Conectado, esvazia antes o buffer para manter a ordem
+        Retorna True se a mensagem foi publicada ou guardada para reenvio;
+        False se foi recusada (erro diferente de falta de conexão, contado em errors)
+        """
+        with self._lock:
+            rc = mqtt.MQTT_ERR_NO_CONN
+            if self.is_connected() and self._drain():
+                rc = self._send(topic, payload, qos, retain)
+                if self._kept_by_paho(rc, qos):
+                    return True
+            if rc == mqtt.MQTT_ERR_SUCCESS:
                 return True
-            except Exception as e:
-                print(f"⚠️ Erro ao publicar dados de controle: {e}")
-                self.connected = False
+            if rc not in self.RETRY_CODES:
+                self.publish_errors += 1
                 return False
-        return False
+            if not self._started:
+                return False
+            if len(self._buffer) == self._buffer.maxlen:
+                self.buffer_dropped += 1
+            self._buffer.append((topic, payload, qos, retain))
+            self.buffered += 1
+            return True
+    
+    def _replay(self):
+        """Reenvia o buffer offline ao reconectar"""
+        with self._lock:
+            self._drain()
+    
+    def _publish_topic(self, name, payload):
+        """
+        Publica no tópico 'name' segundo a sua política
+        Retorna False se a mensagem foi descartada (limite de taxa ou sem conexão)
+        """
+        policy = self.policies[name]
+        with self._policy_lock:
+            action, delay = self._limiters[name].offer(payload, time.monotonic())
+            if action == 'defer':
+                timer = threading.Timer(delay, self._flush_topic, (name,))
+                timer.daemon = True
+                self._timers[name] = timer
+                timer.start()
+        
+        if action == 'send':
+            return self._publish(self.topics[name], payload, policy.qos, policy.retain)
+        return action != 'drop'
+    
+    def _flush_topic(self, name):
+        """Publica a mensagem coalescida do tópico (fim do intervalo)"""
+        policy = self.policies[name]
+        with self._policy_lock:
+            self._timers.pop(name, None)
+            payload = self._limiters[name].take_pending(time.monotonic())
+        if payload is not None:
+            self._publish(self.topics[name], payload, policy.qos, policy.retain)
+    
+    def flush_pending(self):
+        """Publica já as mensagens coalescidas que aguardam o fim do intervalo"""
+        with self._policy_lock:
+            timers = list(self._timers.values())
+        for timer in timers:
+            timer.cancel()
+        for name in self.policies:
+            self._flush_topic(name)
+    
+    def publish(self, topic, payload, qos=1, retain=False):
+        """Publicação em um tópico qualquer (fora de topics), com buffer offline"""
+        return self._publish(topic, payload, qos, retain)
+    
+    def subscribe(self, topic_filter, callback, qos=1):
+        """
+        Assina topic_filter (aceita + e #); callback(topic, payload) é chamado
+        na thread de rede do paho. A assinatura é refeita a cada reconexão
+        """
+        self.client.message_callback_add(
+            topic_filter, lambda client, userdata, msg: callback(msg.topic, msg.payload)
+        )
+        self._subscriptions[topic_filter] = qos
+        if self.is_connected():
+            self.client.subscribe(topic_filter, qos)
+    
+    def publish_alert(self, alert_data):
+        """Publica alerta"""
+        return self._publish_topic('alert', json.dumps(alert_data))
+    
+    def publish_control_data(self, data):
+        """Publica dados de controle (o resultado é o do tópico control)"""
+        payload = self._encode(data)
+        sent = self._publish_topic('control', payload)
+        self._publish_topic('temp', str(data.get('erro', 0)))
+        return sent
+    
+    def publish_batch(self, records):
+        """
+        Publica vários registros de controle em uma única mensagem
+        (lista JSON ou pacote binário). O tópico temp recebe apenas o erro mais recente
+        """
+        payload = self._encode(records)
+        sent = self._publish_topic('control', payload)
+        self._publish_topic('temp', str(records[-1].get('erro', 0)))
+        return sent
     
     def is_connected(self):
         """Verifica se está conectado"""
         # Verifica tanto a flag quanto o estado real do cliente
         return self.connected and self.client.is_connected()
+    
+    def accepts_messages(self):
+        """Conectado ou reconectando (mensagens vão para o buffer offline)"""
+        return self._started or self.is_connected()
+    
+    def buffer_stats(self):
+        """Contadores do buffer offline, dos erros de publicação e das reconexões"""
+        with self._lock:
+            return {
+                'pending': len(self._buffer),
+                'capacity': self._buffer.maxlen,
+                'buffered': self.buffered,
+                'dropped': self.buffer_dropped,
+                'replayed': self.replayed,
+                'paho_queued': self.paho_queued,
+                'errors': self.publish_errors,
+                'reconnects': self.reconnects
+            }
+    
+    def topic_stats(self):
+        """Política e contadores (enviadas, coalescidas, descartadas) por tópico"""
+        with self._policy_lock:
+            return {name: limiter.stats() for name, limiter in self._limiters.items()}
@@ -0,0 +1,165 @@
+import queue
+import threading
+import time
+
+# Marca o fim da fila para a thread de publicação
+_STOP = object()
+
+class BatchPublisher:
+    """
+    Publicação MQTT assíncrona em lotes
+    publish_control_data() só enfileira o registro (fila limitada) e retorna;
+    uma thread de fundo junta até batch_size registros, ou o que chegar em
+    linger segundos, e publica uma única mensagem com a lista de registros
+    (MQTTClient.publish_batch). Tem a mesma interface usada por
+    TemporalSimulation (is_connected / publish_control_data), então pode
+    substituir o MQTTClient na simulação sem que ela espere pelo broker
+    Backpressure com a fila cheia: block=True espera até timeout segundos
+    (None = indefinidamente); block=False ou tempo esgotado descarta o registro
+    """
+    
+    def __init__(self, mqtt_client, batch_size=50, linger=0.2, maxsize=10000,
+                 block=True, timeout=1.0):
+        if batch_size <= 0 or maxsize <= 0:
+            raise ValueError("batch_size e maxsize devem ser positivos")
+        if linger < 0:
+            raise ValueError("linger não pode ser negativo")
+        
+        self.mqtt_client = mqtt_client
+        self.batch_size = batch_size
+        self.linger = linger
+        self.block = block
+        self.timeout = timeout
+        self._queue = queue.Queue(maxsize)
+        self._thread = None
+        self._lock = threading.Lock()
+        # Registros aceitos e ainda não publicados (para flush)
+        self._pending = 0
+        self._idle = threading.Condition(self._lock)
+        
+        self.submitted = 0
+        self.dropped = 0
+        self.published = 0
+        self.batches = 0
+        self.failed = 0
+    
+    def start(self):
+        """Inicia a thread de publicação (idempotente)"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='mqtt-batch-publisher')
+                self._thread.daemon = True
+                self._thread.start()
+        return self
+    
+    def stop(self, timeout=None):
+        """Publica o que estiver na fila e encerra a thread"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        self._thread = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+    
+    def is_connected(self):
+        """
+        A simulação publica enquanto o cliente aceitar mensagens: conectado ou
+        reconectando com buffer offline (MQTTClient.accepts_messages)
+        """
+        client = self.mqtt_client
+        return getattr(client, 'accepts_messages', client.is_connected)()
+    
+    def publish_control_data(self, data):
+        """
+        Enfileira um registro para publicação em lote
+        Retorna False se ele foi descartado (fila cheia)
+        """
+        if self._thread is None:
+            self.start()
+        
+        with self._lock:
+            self.submitted += 1
+            self._pending += 1
+        try:
+            self._queue.put(data, self.block, self.timeout)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                self._done(1)
+            return False
+    
+    def flush(self, timeout=None):
+        """Aguarda a publicação de tudo que foi enfileirado; False se o tempo esgotar"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+    
+    def _done(self, count):
+        """Chamado com _lock: registros saíram do sistema (publicados, falhos ou descartados)"""
+        self._pending -= count
+        if self._pending == 0:
+            self._idle.notify_all()
+    
+    def _next_batch(self):
+        """Bloqueia pelo primeiro registro e junta outros até batch_size ou linger"""
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+        
+        batch = [item]
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+    
+    def _run(self):
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                self._publish(batch)
+            if stop:
+                return
+    
+    def _publish(self, batch):
+        try:
+            ok = self.mqtt_client.publish_batch(batch)
+        except Exception as e:
+            print(f"⚠️ Erro ao publicar lote MQTT: {e}")
+            ok = False
+        
+        with self._lock:
+            if ok:
+                self.published += len(batch)
+                self.batches += 1
+            else:
+                self.failed += len(batch)
+            self._done(len(batch))
+    
+    def stats(self):
+        """Contadores de registros enfileirados, publicados, descartados e falhos"""
+        with self._lock:
+            return {
+                'submitted': self.submitted,
+                'queued': self._queue.qsize(),
+                'pending': self._pending,
+                'published': self.published,
+                'batches': self.batches,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'batch_size': self.batch_size,
+                'linger': self.linger,
+                'maxsize': self._queue.maxsize
+            }
@@ -0,0 +1,117 @@
+import json
+import struct
+
+# Formato binário compacto para registros de telemetria (alternativa ao JSON)
+#   cabeçalho: magic (2 bytes) | versão (u8) | esquema (u8) | nº de registros (u16)
+#   corpo: registros de layout fixo, little-endian, sem nomes de campos
+# Grandezas físicas em float32, timestamp em float64
+# O bit SINGLE do esquema marca um registro publicado como objeto (não lista),
+# para que decode devolva a mesma forma que o JSON
+MAGIC = b'FZ'
+VERSION = 1
+HEADER = struct.Struct('<2sBBH')
+MAX_RECORDS = 0xFFFF
+SINGLE = 0x80
+
+class TelemetrySchema:
+    """Layout fixo de um tipo de registro (campos na ordem do pacote)"""
+    
+    def __init__(self, schema_id, fields, record_type=None):
+        self.schema_id = schema_id
+        self.fields = tuple(fields)
+        # Campo 'type' constante (não vai no pacote, é reconstruído na leitura)
+        self.record_type = record_type
+        self.struct = struct.Struct('<' + ''.join('d' if f == 'timestamp' else 'f' for f in self.fields))
+        self._keys = set(self.fields) | ({'type'} if record_type else set())
+    
+    def matches(self, record):
+        return record.keys() == self._keys and record.get('type') == self.record_type
+    
+    def pack(self, record):
+        return self.struct.pack(*[record[field] for field in self.fields])
+    
+    def unpack_all(self, body):
+        records = []
+        for values in self.struct.iter_unpack(body):
+            record = dict(zip(self.fields, values))
+            if self.record_type:
+                record['type'] = self.record_type
+            records.append(record)
+        return records
+
+
+SCHEMAS = {
+    schema.schema_id: schema for schema in (
+        # Passos da simulação (TemporalSimulation._publish_simulation_data)
+        TelemetrySchema(1, ('time_minutes', 'temperature', 'power_crac', 'temp_externa',
+                            'carga_termica', 'erro', 'setpoint', 'timestamp'), 'simulation'),
+        # Cálculos manuais (/api/calculate)
+        TelemetrySchema(2, ('erro', 'delta_erro', 'temp_externa', 'carga_termica',
+                            'potencia_crac', 'timestamp'))
+    )
+}
+
+
+def schema_for(record):
+    """Esquema binário do registro (None se ele não tiver layout fixo)"""
+    for schema in SCHEMAS.values():
+        if schema.matches(record):
+            return schema
+    return None
+
+
+def encode(data):
+    """
+    Empacota um registro (dicionário) ou uma lista de registros do mesmo esquema;
+    decode devolve a mesma forma
+    ValueError se algum registro não tiver esquema binário (use JSON)
+    """
+    single = isinstance(data, dict)
+    records = [data] if single else data
+    if not records or len(records) > MAX_RECORDS:
+        raise ValueError(f"Número de registros deve estar entre 1 e {MAX_RECORDS}")
+    schema = schema_for(records[0])
+    if schema is None or not all(schema.matches(record) for record in records[1:]):
+        raise ValueError("Registros sem esquema binário comum")
+    
+    header = HEADER.pack(MAGIC, VERSION, schema.schema_id | (SINGLE if single else 0), len(records))
+    return header + b''.join(schema.pack(record) for record in records)
+
+
+def is_binary(payload):
+    return payload[:len(MAGIC)] == MAGIC
+
+
+def decode(payload):
+    """Registro (dicionário) ou lista de registros de um payload binário, como em encode"""
+    if len(payload) < HEADER.size:
+        raise ValueError("Payload binário truncado")
+    magic, version, schema_id, count = HEADER.unpack_from(payload)
+    if magic != MAGIC:
+        raise ValueError("Payload não é do formato binário de telemetria")
+    if version != VERSION:
+        raise ValueError(f"Versão de payload não suportada: {version}")
+    single = bool(schema_id & SINGLE)
+    schema = SCHEMAS.get(schema_id & ~SINGLE)
+    if schema is None:
+        raise ValueError(f"Esquema de payload desconhecido: {schema_id}")
+    
+    body = payload[HEADER.size:]
+    if len(body) != count * schema.struct.size or (single and count != 1):
+        raise ValueError("Tamanho do payload não confere com o cabeçalho")
+    records = schema.unpack_all(body)
+    return records[0] if single else records
+
+
+def decode_payload(payload):
+    """
+    Decodifica uma mensagem de qualquer formato publicado pelo MQTTClient:
+    binário (registro ou lista, como no JSON), JSON ou texto simples (ex.: tópico temp)
+    """
+    if is_binary(payload):
+        return decode(payload)
+    text = payload.decode('utf-8')
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
@@ -0,0 +1,83 @@
+import math
+
+class TopicPolicy:
+    """
+    Política de publicação de um tópico MQTT
+    - qos: nível de QoS (0 = sem confirmação, 1/2 = com PUBACK/PUBREC)
+    - retain: o broker guarda a última mensagem para novos assinantes
+    - min_interval: intervalo mínimo entre publicações (segundos); 0 = sem limite
+    - coalesce: dentro do intervalo guarda só o valor mais recente e o publica
+      ao fim dele; sem coalesce, mensagens dentro do intervalo são descartadas
+    """
+    
+    def __init__(self, qos=1, retain=False, min_interval=0.0, coalesce=False):
+        if qos not in (0, 1, 2):
+            raise ValueError("qos deve ser 0, 1 ou 2")
+        if min_interval < 0:
+            raise ValueError("min_interval não pode ser negativo")
+        self.qos = qos
+        self.retain = retain
+        self.min_interval = min_interval
+        self.coalesce = coalesce
+    
+    def to_dict(self):
+        return {
+            'qos': self.qos,
+            'retain': self.retain,
+            'min_interval': self.min_interval,
+            'coalesce': self.coalesce
+        }
+
+
+class TopicRateLimiter:
+    """
+    Estado do limite de taxa de um tópico (não é thread-safe: o MQTTClient
+    chama sob lock). offer() decide o destino de cada mensagem:
+    - ('send', 0): publicar agora
+    - ('defer', atraso): guardada; publicar take_pending() após o atraso
+    - ('coalesced', None): substituiu a mensagem já guardada
+    - ('drop', None): descartada pelo limite de taxa
+    """
+    
+    def __init__(self, policy):
+        self.policy = policy
+        self.last_sent = -math.inf
+        self.pending = None
+        self.scheduled = False
+        
+        self.sent = 0
+        self.coalesced = 0
+        self.limited = 0
+    
+    def offer(self, payload, now):
+        wait = self.last_sent + self.policy.min_interval - now
+        if wait <= 0 and self.pending is None:
+            self.last_sent = now
+            self.sent += 1
+            return 'send', 0
+        
+        if not self.policy.coalesce:
+            self.limited += 1
+            return 'drop', None
+        
+        if self.pending is not None:
+            self.coalesced += 1
+        self.pending = payload
+        if self.scheduled:
+            return 'coalesced', None
+        self.scheduled = True
+        return 'defer', max(wait, 0.0)
+    
+    def take_pending(self, now):
+        """Mensagem guardada (ou None), marcada como publicada em now"""
+        payload = self.pending
+        self.pending = None
+        self.scheduled = False
+        if payload is not None:
+            self.last_sent = now
+            self.sent += 1
+        return payload
+    
+    def stats(self):
+        return dict(self.policy.to_dict(), sent=self.sent, coalesced=self.coalesced,
+                    limited=self.limited, pending=self.pending is not None)
@@ -7,6 +7,7 @@ Execute em um terminal separado enquanto o sistema está rodando
 import paho.mqtt.client as mqtt
 import json
 from datetime import datetime
+from mqtt.telemetry_codec import decode_payload, is_binary
 
 # Callback quando conecta
 def on_connect(client, userdata, flags, rc):
@@ -37,13 +38,17 @@ def on_message(client, userdata, msg):
     print(f"\n[{timestamp}] 📨 Tópico: {topic}")
     
     try:
-        # Tenta decodificar como JSON
-        payload = json.loads(msg.payload.decode())
-        print(f"Dados: {json.dumps(payload, indent=2, ensure_ascii=False)}")
-    except:
-        # Se não for JSON, mostra como texto
-        payload = msg.payload.decode()
-        print(f"Mensagem: {payload}")
+        # Formato binário compacto, JSON ou texto simples
+        payload = decode_payload(msg.payload)
+        if is_binary(msg.payload):
+            count = len(payload) if isinstance(payload, list) else 1
+            print(f"Formato binário ({len(msg.payload)} bytes, {count} registros)")
+        if isinstance(payload, str):
+            print(f"Mensagem: {payload}")
+        else:
+            print(f"Dados: {json.dumps(payload, indent=2, ensure_ascii=False)}")
+    except Exception as e:
+        print(f"⚠️ Mensagem não decodificada ({len(msg.payload)} bytes): {e}")
     
     print("-" * 60)
 
@@ -0,0 +1,160 @@
+import numpy as np
+
+class DisturbanceProfile:
+    """
+    Perfil de perturbação: gera a trajetória inteira de uma grandeza
+    (temperatura externa ou carga térmica) de uma vez, para todos os instantes
+    base pode ser escalar ou array (N,) para N cenários em lote
+    """
+    
+    def __init__(self, base=0.0, noise_std=0.0, limits=None):
+        self.base = base
+        self.noise_std = noise_std
+        self.limits = limits
+    
+    def mean(self, time_points):
+        """Componente determinística (sem base nem ruído) em cada instante"""
+        return np.zeros_like(time_points, dtype=float)
+    
+    def noise_scale(self, time_points):
+        """Desvio padrão do ruído em cada instante"""
+        return self.noise_std
+    
+    def generate(self, time_points, rng, n_scenarios=None):
+        """
+        Trajetória (passos,) ou (N, passos) com base + perfil + ruído gaussiano
+        O ruído vem de uma única chamada vetorizada ao Generator rng
+        """
+        time_points = np.asarray(time_points, dtype=float)
+        base = np.asarray(self.base, dtype=float)
+        if n_scenarios is None:
+            shape = time_points.shape
+        else:
+            shape = (n_scenarios, time_points.size)
+            if base.ndim == 1:
+                base = base[:, np.newaxis]
+        
+        values = base + self.mean(time_points)
+        scale = self.noise_scale(time_points)
+        if np.any(np.asarray(scale) > 0):
+            values = values + rng.standard_normal(shape) * scale
+        else:
+            values = np.broadcast_to(values, shape).copy()
+        
+        if self.limits is not None:
+            values = np.clip(values, *self.limits)
+        return values
+
+
+class SinusoidProfile(DisturbanceProfile):
+    """
+    Senoide diária: base + amplitude * sin(2*pi*(t - phase)/period) + ruído
+    (padrão da temperatura externa: ±5°C em 24h, ruído de 0.5°C)
+    """
+    
+    def __init__(self, base=25.0, amplitude=5.0, period=1440, phase=0.0,
+                 noise_std=0.5, limits=(10, 35)):
+        super().__init__(base, noise_std, limits)
+        self.amplitude = amplitude
+        self.period = period
+        self.phase = phase
+    
+    def mean(self, time_points):
+        return self.amplitude * np.sin(2 * np.pi * (time_points - self.phase) / self.period)
+
+
+class BusinessHoursProfile(DisturbanceProfile):
+    """
+    Perfil de uso por horário comercial (repete a cada dia)
+    base + business_offset entre start e end (minutos do dia), senão
+    base + off_offset; o ruído também muda de intensidade
+    """
+    
+    def __init__(self, base=40.0, business_offset=20.0, off_offset=-10.0,
+                 business_std=5.0, off_std=3.0, start=480, end=1080, limits=(0, 100)):
+        super().__init__(base, None, limits)
+        self.business_offset = business_offset
+        self.off_offset = off_offset
+        self.business_std = business_std
+        self.off_std = off_std
+        self.start = start
+        self.end = end
+    
+    def _business_hours(self, time_points):
+        minute_of_day = np.mod(time_points, 1440)
+        return (minute_of_day >= self.start) & (minute_of_day < self.end)
+    
+    def mean(self, time_points):
+        return np.where(self._business_hours(time_points), self.business_offset, self.off_offset)
+    
+    def noise_scale(self, time_points):
+        return np.where(self._business_hours(time_points), self.business_std, self.off_std)
+
+
+class CSVProfile(DisturbanceProfile):
+    """
+    Reprodução de uma série medida (CSV com cabeçalho)
+    Os valores da coluna são interpolados linearmente nos instantes simulados;
+    com period (minutos) a série é repetida, senão fica constante nas pontas
+    """
+    
+    def __init__(self, path, column, time_column='time', period=None,
+                 noise_std=0.0, limits=None):
+        super().__init__(0.0, noise_std, limits)
+        data = np.genfromtxt(path, delimiter=',', names=True)
+        self.path = path
+        self.times = np.atleast_1d(data[time_column]).astype(float)
+        self.values = np.atleast_1d(data[column]).astype(float)
+        self.period = period
+        
+        order = np.argsort(self.times)
+        self.times = self.times[order]
+        self.values = self.values[order]
+    
+    def mean(self, time_points):
+        if self.period:
+            time_points = np.mod(time_points, self.period)
+        return np.interp(time_points, self.times, self.values)
+
+
+class DisturbanceGenerator:
+    """
+    Gera as trajetórias de temperatura externa e carga térmica de uma
+    simulação a partir de uma semente: a mesma semente reproduz as
+    perturbações bit a bit. Cada perfil tem seu próprio fluxo aleatório
+    (streams), então gerar em blocos ou de uma vez dá a mesma sequência
+    """
+    
+    def __init__(self, temp_externa=None, carga_termica=None):
+        self.temp_externa = temp_externa or SinusoidProfile()
+        self.carga_termica = carga_termica or BusinessHoursProfile()
+    
+    @classmethod
+    def default(cls, temp_externa_base=25.0, carga_base=40.0):
+        """Perfis padrão da simulação de 24h (senoide + horário comercial)"""
+        return cls(SinusoidProfile(base=temp_externa_base),
+                   BusinessHoursProfile(base=carga_base))
+    
+    @staticmethod
+    def streams(seed=None):
+        """
+        Generators independentes (temperatura externa, carga térmica)
+        seed: inteiro, None (entropia do sistema), np.random.Generator
+        (gera dois filhos) ou um par já criado por streams (devolvido como está)
+        """
+        if isinstance(seed, tuple):
+            return seed
+        if isinstance(seed, np.random.Generator):
+            return tuple(seed.spawn(2))
+        return tuple(np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(2))
+    
+    def generate(self, time_points, seed=None, n_scenarios=None):
+        """
+        Retorna (T_ext, Q_est) para todos os instantes
+        seed: ver streams; para gerar em blocos, passe o mesmo par de streams
+        a cada bloco
+        """
+        rng_temp, rng_carga = self.streams(seed)
+        T_ext = self.temp_externa.generate(time_points, rng_temp, n_scenarios)
+        Q_est = self.carga_termica.generate(time_points, rng_carga, n_scenarios)
+        return T_ext, Q_est
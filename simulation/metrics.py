@@ -0,0 +1,106 @@
+import math
+import numpy as np
+
+class OnlineMetrics:
+    """
+    Métricas de desempenho acumuladas passo a passo (O(1) por amostra)
+    Definição única das métricas de TemporalSimulation.calculate_metrics,
+    sem guardar a trajetória: serve para simulações longas em streaming,
+    métricas ao vivo no dashboard e combinação de resultados parciais (merge)
+    A energia é a soma de PCRAC x step_size (minutos por amostra), que não
+    depende da resolução da simulação
+    """
+    
+    # Faixa desejada e limites críticos de temperatura (°C)
+    BAND = (20, 24)
+    CRITICAL = (18, 26)
+    
+    def __init__(self, step_size=1):
+        self.step_size = step_size
+        self.count = 0
+        self.sum_sq_erro = 0.0
+        self.in_range = 0
+        self.violations = 0
+        self.energy = 0.0
+        self.sum_temp = 0.0
+        self.min_temp = math.inf
+        self.max_temp = -math.inf
+    
+    def update(self, temperature, erro, power_crac):
+        """Acumula uma amostra"""
+        self.count += 1
+        self.sum_sq_erro += erro * erro
+        if self.BAND[0] <= temperature <= self.BAND[1]:
+            self.in_range += 1
+        if temperature < self.CRITICAL[0] or temperature > self.CRITICAL[1]:
+            self.violations += 1
+        self.energy += power_crac * self.step_size
+        self.sum_temp += temperature
+        if temperature < self.min_temp:
+            self.min_temp = temperature
+        if temperature > self.max_temp:
+            self.max_temp = temperature
+    
+    def update_batch(self, temperature, erro, power_crac):
+        """Acumula um bloco de amostras (arrays) de uma vez"""
+        temperature = np.asarray(temperature, dtype=float).ravel()
+        if temperature.size == 0:
+            return
+        erro = np.asarray(erro, dtype=float).ravel()
+        
+        self.count += temperature.size
+        self.sum_sq_erro += float(np.sum(erro**2))
+        self.in_range += int(np.sum((temperature >= self.BAND[0]) & (temperature <= self.BAND[1])))
+        self.violations += int(np.sum((temperature < self.CRITICAL[0]) | (temperature > self.CRITICAL[1])))
+        self.energy += float(np.sum(power_crac)) * self.step_size
+        self.sum_temp += float(np.sum(temperature))
+        self.min_temp = min(self.min_temp, float(np.min(temperature)))
+        self.max_temp = max(self.max_temp, float(np.max(temperature)))
+    
+    def merge(self, other):
+        """
+        Incorpora um acumulador parcial (ex.: outro trecho da simulação ou
+        outro processo); o resultado equivale a ter visto todas as amostras
+        """
+        self.count += other.count
+        self.sum_sq_erro += other.sum_sq_erro
+        self.in_range += other.in_range
+        self.violations += other.violations
+        self.energy += other.energy
+        self.sum_temp += other.sum_temp
+        self.min_temp = min(self.min_temp, other.min_temp)
+        self.max_temp = max(self.max_temp, other.max_temp)
+        return self
+    
+    @classmethod
+    def combine(cls, accumulators):
+        """Novo acumulador com a soma de vários parciais"""
+        total = cls()
+        for accumulator in accumulators:
+            total.merge(accumulator)
+        return total
+    
+    def add_step(self, step):
+        """Consumidor do stream de iter_simulation (SimulationStep)"""
+        self.update(step.temperature, step.erro, step.power_crac)
+    
+    def result(self):
+        """Métricas no formato de calculate_metrics"""
+        if self.count == 0:
+            raise ValueError("Nenhuma amostra acumulada")
+        
+        return {
+            'rmse': math.sqrt(self.sum_sq_erro / self.count),
+            'percent_in_range': self.in_range / self.count * 100,
+            'violations': self.violations,
+            'energy_consumption': self.energy,
+            'avg_temp': self.sum_temp / self.count,
+            'max_temp': self.max_temp,
+            'min_temp': self.min_temp
+        }
+    
+    def snapshot(self):
+        """Métricas parciais (None antes da primeira amostra), ex.: dashboard ao vivo"""
+        if self.count == 0:
+            return None
+        return dict(self.result(), samples=self.count)
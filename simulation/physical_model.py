@@ -3,21 +3,38 @@ import numpy as np
 class PhysicalModel:
     """Modelo físico do data center"""
     
-    def __init__(self):
-        self.a = 0.9   # Inércia térmica
-        self.b = -0.08 # Ganho CRAC
-        self.c = 0.05  # Impacto carga térmica
-        self.d = 0.02  # Influência temp externa
-        self.e = 3.5   # Offset base
+    # Coeficientes ajustáveis (ver update_temperature)
+    COEFFICIENTS = ('a', 'b', 'c', 'd', 'e')
+    
+    def __init__(self, a=0.9, b=-0.08, c=0.05, d=0.02, e=3.5):
+        self.a = a   # Inércia térmica
+        self.b = b   # Ganho CRAC
+        self.c = c   # Impacto carga térmica
+        self.d = d   # Influência temp externa
+        self.e = e   # Offset base
     
     def update_temperature(self, T_current, P_crac, Q_est, T_ext):
         """
         Função de transferência do sistema:
         T[n+1] = 0.9*T[n] - 0.08*PCRAC + 0.05*Qest + 0.02*Text + 3.5
+        Aceita escalares ou arrays NumPy (vários cenários de uma vez)
         """
-        T_next = (self.a * T_current + 
-                  self.b * P_crac + 
-                  self.c * Q_est + 
-                  self.d * T_ext + 
+        T_next = (self.a * T_current +
+                  self.b * P_crac +
+                  self.c * Q_est +
+                  self.d * T_ext +
                   self.e)
         return T_next
+    
+    def discretize(self, dt):
+        """
+        Modelo equivalente para um passo de dt minutos (os coeficientes são
+        por minuto), com as entradas constantes durante o passo:
+        a' = a**dt e b, c, d, e escalados por (1 - a**dt) / (1 - a)
+        Com dt=1 retorna o próprio modelo
+        """
+        if dt == 1:
+            return self
+        a_dt = self.a ** dt
+        gain = (1 - a_dt) / (1 - self.a) if self.a != 1 else dt
+        return type(self)(a_dt, self.b * gain, self.c * gain, self.d * gain, self.e * gain)
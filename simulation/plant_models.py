@@ -0,0 +1,207 @@
+from abc import ABC, abstractmethod
+import numpy as np
+from .physical_model import PhysicalModel
+
+class PlantModel(ABC):
+    """
+    Interface dos modelos da planta (sala/zonas do data center)
+    O estado é um array (..., n_states) e as entradas são arrays (..., n_zones):
+    todas as zonas (e cenários, nas dimensões iniciais) avançam juntas
+    - initial_state(temperature): estado com as zonas na temperatura dada
+    - step(state, P_crac, Q_est, T_ext): próximo estado
+    - output(state): temperatura de cada zona (..., n_zones)
+    Subclasses sem algum dos três métodos não podem ser instanciadas
+    """
+    
+    n_zones = 1
+    
+    @abstractmethod
+    def initial_state(self, temperature):
+        """Estado inicial com as zonas na temperatura dada"""
+    
+    @abstractmethod
+    def step(self, state, P_crac, Q_est, T_ext):
+        """Próximo estado"""
+    
+    @abstractmethod
+    def output(self, state):
+        """Temperatura de cada zona"""
+
+
+class ARXPlant(PlantModel):
+    """
+    Modelo ARX de primeira ordem do PhysicalModel aplicado a cada zona,
+    sem acoplamento: T[n+1] = a*T[n] + b*PCRAC + c*Qest + d*Text + e
+    """
+    
+    def __init__(self, model=None, n_zones=1):
+        self.model = model or PhysicalModel()
+        self.n_zones = n_zones
+    
+    def initial_state(self, temperature):
+        return np.broadcast_to(np.asarray(temperature, dtype=float), (self.n_zones,)).copy()
+    
+    def step(self, state, P_crac, Q_est, T_ext):
+        return self.model.update_temperature(state, P_crac, Q_est, T_ext)
+    
+    def output(self, state):
+        return state
+
+
+class MultiZonePlant(ARXPlant):
+    """
+    Várias zonas (fileiras de racks / CRACs) acopladas por um volume de ar
+    comum e, opcionalmente, por troca de calor direta entre zonas.
+    Estado: [T_zona_1 .. T_zona_n, T_ar]
+    - cada zona segue o ARX e troca calor com o ar comum e com as outras zonas:
+      T_i[n+1] = ARX(T_i, P_i, Q_i, Text) + coupling * (T_ar - T_i)
+                 + sum_j exchange[i, j] * (T_j - T_i)
+    - o ar comum se aproxima da média das zonas:
+      T_ar[n+1] = T_ar + air_exchange * (média(T_i) - T_ar)
+    coupling pode ser escalar ou um valor por zona; exchange é uma matriz
+    n x n não negativa (diagonal ignorada), None = sem troca direta
+    """
+    
+    def __init__(self, n_zones, model=None, coupling=0.05, air_exchange=0.2, exchange=None):
+        super().__init__(model, n_zones)
+        self.coupling = np.broadcast_to(np.asarray(coupling, dtype=float), (n_zones,)).copy()
+        self.air_exchange = air_exchange
+        self.exchange = None
+        if exchange is not None:
+            self.exchange = np.asarray(exchange, dtype=float)
+            if self.exchange.shape != (n_zones, n_zones):
+                raise ValueError("A matriz de troca de calor deve ser n_zonas x n_zonas")
+            if np.any(self.exchange < 0):
+                raise ValueError("Coeficientes de troca de calor devem ser não negativos")
+    
+    @staticmethod
+    def chain_exchange(n_zones, coefficient=0.05):
+        """Matriz de troca para zonas em fileira: cada uma troca calor com as vizinhas"""
+        exchange = np.zeros((n_zones, n_zones))
+        neighbors = np.arange(n_zones - 1)
+        exchange[neighbors, neighbors + 1] = coefficient
+        exchange[neighbors + 1, neighbors] = coefficient
+        return exchange
+    
+    def initial_state(self, temperature):
+        zones = super().initial_state(temperature)
+        return np.append(zones, zones.mean())
+    
+    def step(self, state, P_crac, Q_est, T_ext):
+        zones = state[..., :-1]
+        air = state[..., -1:]
+        
+        next_zones = self.model.update_temperature(zones, P_crac, Q_est, T_ext)
+        next_zones = next_zones + self.coupling * (air - zones)
+        if self.exchange is not None:
+            # sum_j K_ij (T_j - T_i): os termos da diagonal se cancelam
+            next_zones = next_zones + zones @ self.exchange.T - zones * self.exchange.sum(axis=1)
+        next_air = air + self.air_exchange * (zones.mean(axis=-1, keepdims=True) - air)
+        
+        return np.concatenate([next_zones, next_air], axis=-1)
+    
+    def output(self, state):
+        return state[..., :-1]
+
+
+class StateSpacePlant(PlantModel):
+    """
+    Modelo em espaço de estados discreto (matrizes)
+        x[n+1] = A x[n] + B u[n]
+        T[n]   = C x[n]
+    com u = [PCRAC (n_zones), Qest (n_zones), Text (n_zones), 1]
+    (a última coluna de B é o termo constante/offset)
+    """
+    
+    def __init__(self, A, B, C):
+        self.A = np.asarray(A, dtype=float)
+        self.B = np.asarray(B, dtype=float)
+        self.C = np.asarray(C, dtype=float)
+        self.n_zones = self.C.shape[0]
+        
+        n_states = self.A.shape[0]
+        if self.A.shape != (n_states, n_states) or self.C.shape[1] != n_states:
+            raise ValueError("Dimensões inconsistentes de A e C")
+        if self.B.shape != (n_states, 3 * self.n_zones + 1):
+            raise ValueError("B deve ter formato (n_estados, 3*n_zonas + 1)")
+        
+        # Estado inicial: solução de mínimos quadrados de C x = T
+        self._C_pinv = np.linalg.pinv(self.C)
+    
+    @classmethod
+    def from_arx(cls, n_zones=1, model=None):
+        """Representação em espaço de estados do ARX por zona (sem acoplamento)"""
+        model = model or PhysicalModel()
+        identity = np.eye(n_zones)
+        B = np.hstack([model.b * identity, model.c * identity, model.d * identity,
+                       np.full((n_zones, 1), model.e)])
+        return cls(model.a * identity, B, identity)
+    
+    def initial_state(self, temperature):
+        temperature = np.broadcast_to(np.asarray(temperature, dtype=float), (self.n_zones,))
+        return self._C_pinv @ temperature
+    
+    def step(self, state, P_crac, Q_est, T_ext):
+        P_crac, Q_est, T_ext = np.broadcast_arrays(P_crac, Q_est, T_ext)
+        u = np.concatenate([P_crac, Q_est, T_ext, np.ones(T_ext.shape[:-1] + (1,))], axis=-1)
+        return state @ self.A.T + u @ self.B.T
+    
+    def output(self, state):
+        return state @ self.C.T
+
+
+class ClosedLoopEngine:
+    """
+    Malha fechada controlador fuzzy + modelo da planta, vetorizada por zona
+    A cada passo: uma inferência em lote (calculate_batch) para todas as
+    zonas e uma atualização vetorizada do estado da planta
+    """
+    
+    def __init__(self, controller, plant, setpoint=22.0):
+        self.controller = controller
+        self.plant = plant
+        self.setpoint = np.broadcast_to(np.asarray(setpoint, dtype=float), (plant.n_zones,)).copy()
+        self.reset()
+    
+    def reset(self, temperature=None):
+        """Reinicia o estado da planta e do controlador (erro_anterior)"""
+        temperature = self.setpoint if temperature is None else temperature
+        self.state = self.plant.initial_state(temperature)
+        self.erro_anterior = np.zeros(self.plant.n_zones)
+    
+    def step(self, Q_est, T_ext):
+        """
+        Avança um passo para todas as zonas
+        Retorna (temperatura após o passo, PCRAC, erro), arrays (n_zones,)
+        """
+        n_zones = self.plant.n_zones
+        Q_est = np.broadcast_to(np.asarray(Q_est, dtype=float), (n_zones,))
+        T_ext = np.broadcast_to(np.asarray(T_ext, dtype=float), (n_zones,))
+        
+        erro = self.plant.output(self.state) - self.setpoint
+        delta_erro = erro - self.erro_anterior
+        
+        P_crac = self.controller.calculate_batch(erro, delta_erro, T_ext, Q_est)
+        self.state = self.plant.step(self.state, P_crac, Q_est, T_ext)
+        self.erro_anterior = erro
+        
+        return self.plant.output(self.state), P_crac, erro
+    
+    def run(self, Q_est, T_ext, temperature=None):
+        """
+        Executa uma trajetória de perturbações
+        Q_est e T_ext: arrays (passos,) ou (passos, n_zones)
+        Retorna dicionário de arrays (passos, n_zones): temperature, power_crac, erro
+        """
+        self.reset(temperature)
+        n_steps = len(Q_est)
+        shape = (n_steps, self.plant.n_zones)
+        results = {name: np.empty(shape) for name in ('temperature', 'power_crac', 'erro')}
+        
+        for i in range(n_steps):
+            temperature, P_crac, erro = self.step(Q_est[i], T_ext[i])
+            results['temperature'][i] = temperature
+            results['power_crac'][i] = P_crac
+            results['erro'][i] = erro
+        
+        return results
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import numpy as np
+from .results import SimulationResults
+
+class SimulationResultCache:
+    """
+    Cache em disco de resultados de simulação (resultados + métricas)
+    Endereçado por conteúdo: a chave é o hash dos parâmetros do cenário
+    (incluindo seed, coeficientes do modelo e fingerprint do controlador fuzzy)
+    Cada entrada é um arquivo .npz comprimido; quando o diretório passa de
+    max_bytes, as entradas usadas há mais tempo (mtime) são descartadas
+    """
+    
+    # Muda quando o formato dos arquivos ou dos resultados mudar
+    FORMAT_VERSION = 2
+    
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes deve ser positivo")
+        
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def key(self, params):
+        """Hash dos parâmetros do cenário (dicionário serializável em JSON)"""
+        config = dict(params, format_version=self.FORMAT_VERSION)
+        encoded = json.dumps(config, sort_keys=True).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()[:32]
+    
+    def scenario_key(self, simulation, **params):
+        """
+        Chave de um cenário de TemporalSimulation: parâmetros da execução
+        + setpoint, coeficientes do modelo físico e fingerprint das regras/MFs
+        """
+        model = simulation.model
+        return self.key(dict(
+            params,
+            setpoint=simulation.setpoint,
+            model={name: getattr(model, name) for name in model.COEFFICIENTS},
+            fuzzy=simulation.fuzzy.fingerprint()
+        ))
+    
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.npz')
+    
+    def get(self, key):
+        """Retorna (SimulationResults, métricas) ou None; marca a entrada como usada"""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as archive:
+                columns = {name: archive[name] for name in SimulationResults.COLUMNS}
+                setpoint = archive['setpoint']
+                metrics = json.loads(str(archive['metrics']))
+            os.utime(path)
+        except (OSError, KeyError, ValueError):
+            # Ausente, removida por outro processo ou corrompida
+            with self._lock:
+                self.misses += 1
+            return None
+        
+        with self._lock:
+            self.hits += 1
+        setpoint = setpoint.item() if setpoint.ndim == 0 else setpoint
+        return SimulationResults(columns, setpoint), metrics
+    
+    def put(self, key, results, metrics):
+        """Armazena resultados e métricas (escrita atômica) e aplica o limite de tamanho"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(
+                    f,
+                    setpoint=np.asarray(results.setpoint, dtype=float),
+                    metrics=np.array(json.dumps(metrics)),
+                    **{name: results[name] for name in SimulationResults.COLUMNS}
+                )
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._evict()
+    
+    def get_or_run(self, key, run):
+        """
+        Resultado do cache ou, na falta, de run() -> (results, metrics),
+        que é então armazenado. Retorna (results, metrics, hit)
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached + (True,)
+        results, metrics = run()
+        self.put(key, results, metrics)
+        return results, metrics, False
+    
+    def _entries(self):
+        """Entradas (caminho, tamanho, mtime) da mais antiga para a mais recente"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.npz'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        entries.sort(key=lambda entry: entry[2])
+        return entries
+    
+    def _evict(self):
+        """Descarta as entradas menos usadas até caber em max_bytes"""
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            for path, size, _ in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self.evictions += 1
+    
+    def clear(self):
+        """Remove todas as entradas (os contadores são mantidos)"""
+        with self._lock:
+            for path, _, _ in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+    
+    def stats(self):
+        """Contadores de acertos/falhas/descartes e ocupação do diretório"""
+        with self._lock:
+            entries = self._entries()
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(entries),
+                'bytes': sum(size for _, size, _ in entries),
+                'max_bytes': self.max_bytes,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
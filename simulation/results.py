@@ -0,0 +1,83 @@
+from collections import namedtuple
+import numpy as np
+
+# Registro de um passo da simulação em streaming (ver iter_simulation)
+SimulationStep = namedtuple(
+    'SimulationStep',
+    ['time', 'temperature', 'power_crac', 'temp_externa', 'carga_termica', 'erro']
+)
+
+class SimulationResults:
+    """
+    Resultados de simulação em colunas (arrays NumPy pré-alocados)
+    Uma coluna por grandeza; o setpoint é constante e fica como atributo.
+    Em simulações em lote/multizona as colunas têm formato (N, passos) e
+    'time' (passos,); o setpoint pode então ter um valor por linha
+    Conversão para o formato JSON antigo (listas) só na borda da API: to_dict()
+    """
+    
+    COLUMNS = ('time', 'temperature', 'power_crac', 'temp_externa', 'carga_termica', 'erro')
+    
+    def __init__(self, columns, setpoint):
+        missing = set(self.COLUMNS) - set(columns)
+        if missing:
+            raise ValueError(f"Colunas ausentes nos resultados: {sorted(missing)}")
+        self.columns = {name: columns[name] for name in self.COLUMNS}
+        self.setpoint = setpoint
+    
+    @classmethod
+    def allocate(cls, time_points, setpoint, n_scenarios=None, dtype=np.float64):
+        """Reserva as colunas para todos os passos (memória conhecida de antemão)"""
+        time_points = np.asarray(time_points)
+        shape = time_points.shape if n_scenarios is None else (n_scenarios, time_points.size)
+        columns = {name: np.empty(shape, dtype=dtype) for name in cls.COLUMNS[1:]}
+        columns['time'] = time_points
+        return cls(columns, setpoint)
+    
+    def __getitem__(self, name):
+        if name == 'setpoint':
+            return self._setpoint_column()
+        return self.columns[name]
+    
+    def _setpoint_column(self):
+        """Setpoint repetido em cada passo (um valor por zona/cenário, se houver)"""
+        setpoint = np.asarray(self.setpoint, dtype=float)
+        if setpoint.ndim:
+            setpoint = setpoint[:, np.newaxis]
+        return np.broadcast_to(setpoint, self.columns['temperature'].shape).copy()
+    
+    def __len__(self):
+        """Número de passos simulados"""
+        return self.columns['time'].size
+    
+    @property
+    def step_size(self):
+        """Passo entre amostras (minutos); 1 se houver um único ponto"""
+        time_points = self.columns['time']
+        return float(time_points[1] - time_points[0]) if time_points.size > 1 else 1
+    
+    def keys(self):
+        return self.columns.keys()
+    
+    @property
+    def nbytes(self):
+        """Memória ocupada pelas colunas (bytes)"""
+        return sum(column.nbytes for column in self.columns.values())
+    
+    def downsample(self, interval_minutes=5):
+        """
+        Mantém um ponto a cada interval_minutes (dashboard/JSON)
+        As métricas devem ser calculadas na resolução completa
+        """
+        time_points = self.columns['time']
+        keep = np.flatnonzero(np.isclose(np.mod(time_points, interval_minutes), 0))
+        return SimulationResults(
+            {name: column[..., keep] for name, column in self.columns.items()},
+            self.setpoint
+        )
+    
+    def to_dict(self):
+        """Formato JSON da API: listas por grandeza, incluindo a coluna setpoint"""
+        data = {name: column.tolist() for name, column in self.columns.items()}
+        data['setpoint'] = self._setpoint_column().tolist()
+        return data
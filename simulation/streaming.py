@@ -0,0 +1,70 @@
+import csv
+from .results import SimulationStep
+
+class CSVStepWriter:
+    """
+    Consumidor do stream de simulação: grava cada passo em CSV
+    (linha a linha, memória constante). Use como context manager
+    """
+    
+    def __init__(self, path, every=1):
+        self.path = path
+        self.every = max(1, int(every))
+        self._file = None
+        self._writer = None
+        self._index = 0
+    
+    def open(self):
+        self._file = open(self.path, 'w', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(SimulationStep._fields)
+        return self
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self):
+        return self.open()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def write(self, step):
+        """Grava um passo (um a cada 'every')"""
+        if self._index % self.every == 0:
+            self._writer.writerow(step)
+        self._index += 1
+
+
+class MQTTStepPublisher:
+    """
+    Consumidor do stream de simulação: publica um passo a cada
+    interval_minutes via MQTT (mesmo formato de run_24h_simulation)
+    """
+    
+    def __init__(self, simulation, interval_minutes=5):
+        self.simulation = simulation
+        self.interval_minutes = interval_minutes
+        self._last_slot = None
+    
+    def publish(self, step):
+        """Publica o primeiro passo de cada intervalo"""
+        slot = int(step.time // self.interval_minutes)
+        if slot != self._last_slot:
+            self.simulation._publish_simulation_data(*step)
+            self._last_slot = slot
+
+
+def consume(stream, *consumers):
+    """
+    Percorre o stream de passos entregando cada um a todos os consumidores
+    (funções que recebem um SimulationStep). Retorna o número de passos
+    """
+    count = 0
+    for step in stream:
+        for consumer in consumers:
+            consumer(step)
+        count += 1
+    return count
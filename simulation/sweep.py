@@ -0,0 +1,165 @@
+import csv
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .physical_model import PhysicalModel
+from .temporal_simulation import TemporalSimulation
+from fuzzy_controler.fuzzy_engine import FuzzyController
+
+# Controlador de cada processo do pool (compilado uma vez por processo)
+_worker_controller = None
+_worker_options = None
+
+
+def _get_controller(controller_options):
+    """Controlador fuzzy do processo atual (recriado se as opções mudarem)"""
+    global _worker_controller, _worker_options
+    if _worker_controller is None or _worker_options != controller_options:
+        _worker_controller = FuzzyController(trace='none', **controller_options)
+        _worker_options = dict(controller_options)
+    return _worker_controller
+
+
+def run_scenario(params, controller_options=None):
+    """
+    Executa uma simulação de 24h com os parâmetros dados e retorna as métricas
+    (função de módulo para poder ser enviada aos processos do pool)
+    """
+    controller = _get_controller(controller_options or {})
+    model = PhysicalModel(**{k: params[k] for k in PhysicalModel.COEFFICIENTS})
+    simulation = TemporalSimulation(controller, setpoint=params['setpoint'], model=model)
+    
+    results = simulation.run_24h_simulation(
+        temp_inicial=params['temp_inicial'],
+        temp_externa_base=params['temp_externa_base'],
+        carga_base=params['carga_base'],
+        verbose=False,
+        seed=params['seed']
+    )
+    return simulation.calculate_metrics(results)
+
+
+def _run_chunk_item(args):
+    """Adaptador para executor.map (um argumento por chamada)"""
+    params, controller_options = args
+    return run_scenario(params, controller_options)
+
+
+class ParameterSweep:
+    """
+    Varredura de parâmetros da simulação de 24h em vários processos
+    grid: dicionário parâmetro -> lista de valores; o produto cartesiano
+    define os cenários. Parâmetros omitidos usam DEFAULTS
+    (setpoint, temp_inicial, temp_externa_base, carga_base, seed e os
+    coeficientes a..e do PhysicalModel)
+    """
+    
+    DEFAULTS = {
+        'setpoint': 22.0,
+        'temp_inicial': 22.0,
+        'temp_externa_base': 25.0,
+        'carga_base': 40.0,
+        'seed': 0,
+        'a': 0.9,
+        'b': -0.08,
+        'c': 0.05,
+        'd': 0.02,
+        'e': 3.5
+    }
+    
+    METRICS = ['rmse', 'percent_in_range', 'violations', 'energy_consumption',
+               'avg_temp', 'max_temp', 'min_temp']
+    
+    def __init__(self, grid, max_workers=None, chunksize=None, controller_options=None):
+        unknown = set(grid) - set(self.DEFAULTS)
+        if unknown:
+            raise ValueError(f"Parâmetros desconhecidos na varredura: {sorted(unknown)}")
+        
+        self.grid = grid
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.controller_options = controller_options or {}
+        self.scenarios = self.expand_grid(grid)
+    
+    @classmethod
+    def expand_grid(cls, grid):
+        """Produto cartesiano do grid (lista de dicionários completos)"""
+        names = list(grid)
+        values = [list(np.atleast_1d(grid[name]).tolist()) for name in names]
+        return [
+            dict(cls.DEFAULTS, **dict(zip(names, combination)))
+            for combination in itertools.product(*values)
+        ]
+    
+    def _chunksize(self):
+        """Cenários por tarefa enviada ao pool (~4 tarefas por processo)"""
+        if self.chunksize:
+            return self.chunksize
+        return max(1, math.ceil(len(self.scenarios) / (self.max_workers * 4)))
+    
+    def iter_results(self):
+        """
+        Gera (parâmetros, métricas) na ordem dos cenários, à medida que os
+        blocos ficam prontos nos processos do pool
+        """
+        tasks = ((params, self.controller_options) for params in self.scenarios)
+        
+        if self.max_workers == 1:
+            # Sem pool (depuração / ambientes sem multiprocessing)
+            for params, options in tasks:
+                yield params, run_scenario(params, options)
+            return
+        
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            for params, metrics in zip(self.scenarios,
+                                       executor.map(_run_chunk_item, tasks, chunksize=self._chunksize())):
+                yield params, metrics
+    
+    def run(self, progress_callback=None):
+        """
+        Executa todos os cenários e agrega em uma tabela por colunas:
+        dicionário coluna -> lista (parâmetros seguidos das métricas)
+        """
+        columns = list(self.DEFAULTS) + self.METRICS
+        table = {column: [] for column in columns}
+        
+        total = len(self.scenarios)
+        for done, (params, metrics) in enumerate(self.iter_results(), start=1):
+            for name in self.DEFAULTS:
+                table[name].append(params[name])
+            for name in self.METRICS:
+                table[name].append(metrics[name])
+            if progress_callback:
+                progress_callback(done / total * 100)
+        
+        return table
+    
+    @staticmethod
+    def save_csv(table, path):
+        """Salva a tabela agregada em CSV (uma linha por cenário)"""
+        columns = list(table)
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows(zip(*(table[column] for column in columns)))
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+    
+    output = sys.argv[1] if len(sys.argv) > 1 else 'sweep_results.csv'
+    sweep = ParameterSweep({
+        'setpoint': [21.0, 22.0, 23.0],
+        'temp_externa_base': [20.0, 25.0, 30.0],
+        'carga_base': [30.0, 50.0, 70.0],
+        'seed': [0, 1, 2]
+    })
+    
+    print(f"⚙️ Varredura: {len(sweep.scenarios)} cenários em {sweep.max_workers} processos")
+    start = time.perf_counter()
+    table = sweep.run()
+    ParameterSweep.save_csv(table, output)
+    print(f"✅ Concluída em {time.perf_counter() - start:.1f}s -> {output}")
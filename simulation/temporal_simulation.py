@@ -1,97 +1,276 @@
 import numpy as np
 from .physical_model import PhysicalModel
+from .results import SimulationResults, SimulationStep
+from .disturbances import DisturbanceGenerator, SinusoidProfile, BusinessHoursProfile
+from .plant_models import MultiZonePlant, ClosedLoopEngine
+from .metrics import OnlineMetrics
 from fuzzy_controler.fuzzy_engine import FuzzyController
 import time
 
 class TemporalSimulation:
     """Simulação temporal de 24 horas"""
     
-    def __init__(self, fuzzy_controller: FuzzyController, mqtt_client=None):
+    def __init__(self, fuzzy_controller: FuzzyController, mqtt_client=None,
+                 setpoint=22.0, model=None):
         self.fuzzy = fuzzy_controller
-        self.model = PhysicalModel()
-        self.setpoint = 22.0
+        self.model = model or PhysicalModel()
+        self.setpoint = setpoint
         self.mqtt_client = mqtt_client
     
-    def run_24h_simulation(self, temp_inicial=22.0, temp_externa_base=25.0, carga_base=40.0, progress_callback=None):
+    # Duração padrão da simulação (minutos)
+    DURATION_MINUTES = 1440
+    
+    def time_points(self, step_size=1, duration_minutes=DURATION_MINUTES):
+        """Instantes simulados (minutos): 0, step_size, ... até duration_minutes"""
+        if step_size <= 0:
+            raise ValueError("step_size deve ser positivo")
+        return np.arange(int(duration_minutes // step_size) + 1) * step_size
+    
+    def run_24h_simulation(self, temp_inicial=22.0, temp_externa_base=25.0, carga_base=40.0,
+                           progress_callback=None, verbose=True, step_size=1,
+                           duration_minutes=DURATION_MINUTES, publish_interval=5,
+                           seed=None, disturbances=None, live_metrics=None):
         """
-        Executa simulação de 1440 minutos (24h)
-        Otimizada para executar mais rápido
+        Executa simulação de 1440 minutos (24h) com passo step_size (minutos)
+        O modelo físico é discretizado para o passo (PhysicalModel.discretize)
+        Perturbações: disturbances (DisturbanceGenerator) ou os perfis padrão
+        com temp_externa_base/carga_base; seed as torna reproduzíveis
+        publish_interval: intervalo (minutos) das publicações MQTT
+        live_metrics: OnlineMetrics(step_size) atualizado a cada passo (métricas ao vivo)
+        verbose=False desliga as mensagens de progresso no terminal
+        Retorna SimulationResults (colunas pré-alocadas; to_dict() para JSON)
         """
-        minutes = 1440
-        # Simula a cada 5 minutos para performance, depois interpola
-        step_size = 5
-        sim_points = minutes // step_size
-        
-        results = {
-            'time': [],
-            'temperature': [],
-            'power_crac': [],
-            'temp_externa': [],
-            'carga_termica': [],
-            'erro': [],
-            'setpoint': []
-        }
-        
-        T_atual = temp_inicial
-        erro_anterior = 0
-        
-        print(f"⚙️ Simulando {minutes} minutos (otimizado)...")
-        
-        # Arrays temporários para armazenar pontos simulados
-        temp_points = []
-        time_points = []
-        
-        for i in range(sim_points + 1):
-            t = i * step_size
-            if t > minutes:
-                t = minutes
-                
+        time_points = self.time_points(step_size, duration_minutes)
+        n_steps = time_points.size
+        disturbances = disturbances or DisturbanceGenerator.default(temp_externa_base, carga_base)
+        T_ext_points, Q_est_points = disturbances.generate(time_points, seed)
+        
+        # Resultados pré-alocados
+        results = SimulationResults.allocate(time_points, self.setpoint)
+        results['temp_externa'][:] = T_ext_points
+        results['carga_termica'][:] = Q_est_points
+        temperature = results['temperature']
+        power_crac = results['power_crac']
+        erro_points = results['erro']
+        
+        T_atual = float(temp_inicial)
+        erro_anterior = 0.0
+        setpoint = self.setpoint
+        calculate = self.fuzzy.calculate
+        update_temperature = self.model.discretize(step_size).update_temperature
+        progress_every = n_steps // 10 + 1
+        publish_every = max(1, int(round(publish_interval / step_size)))
+        
+        if verbose:
+            print(f"⚙️ Simulando {duration_minutes} minutos (passo de {step_size} min)...")
+        
+        for i, (t, T_ext, Q_est) in enumerate(zip(time_points.tolist(),
+                                                  T_ext_points.tolist(),
+                                                  Q_est_points.tolist())):
             # Progresso
-            if i % (sim_points // 10 + 1) == 0:
-                progress = (t / minutes) * 100
-                print(f"   {progress:.0f}% completo")
+            if i % progress_every == 0:
+                progress = (t / duration_minutes) * 100
+                if verbose:
+                    print(f"   {progress:.0f}% completo")
                 if progress_callback:
                     progress_callback(progress)
             
-            # Temperatura externa (padrão senoidal + ruído)
-            T_ext = temp_externa_base + 5 * np.sin(2 * np.pi * t / 1440) + np.random.normal(0, 0.5)
-            T_ext = np.clip(T_ext, 10, 35)
+            # Calcula erro e variação
+            erro = T_atual - setpoint
+            delta_erro = erro - erro_anterior
+            
+            # Controlador fuzzy (caminho compilado, sem detalhes nem cache)
+            P_crac = calculate(erro, delta_erro, T_ext, Q_est, trace='none', use_cache=False)
+            
+            # Atualiza temperatura
+            T_atual = update_temperature(T_atual, P_crac, Q_est, T_ext)
             
-            # Carga térmica (perfil de uso)
-            if 480 <= t < 1080:  # 8h às 18h - horário comercial
-                Q_est = carga_base + 20 + np.random.normal(0, 5)
-            else:
-                Q_est = carga_base - 10 + np.random.normal(0, 3)
-            Q_est = np.clip(Q_est, 0, 100)
+            temperature[i] = T_atual
+            power_crac[i] = P_crac
+            erro_points[i] = erro
+            if live_metrics is not None:
+                live_metrics.update(T_atual, erro, P_crac)
+            
+            # Envia dados via MQTT
+            if i % publish_every == 0:
+                self._publish_simulation_data(t, T_atual, P_crac, T_ext, Q_est, erro)
+            
+            erro_anterior = erro
+        
+        if verbose:
+            print("✅ Simulação completa!")
+        return results
+    
+    def iter_simulation(self, duration_minutes=DURATION_MINUTES, dt=1, temp_inicial=22.0,
+                        temp_externa_base=25.0, carga_base=40.0, seed=None,
+                        disturbances=None, chunk_size=1440):
+        """
+        Simulação em streaming: gera um SimulationStep por passo, sem guardar
+        a trajetória (memória constante para semanas/meses de operação)
+        As perturbações são geradas em blocos de chunk_size passos com um
+        fluxo aleatório por perfil (DisturbanceGenerator.streams): para
+        qualquer chunk_size a sequência é a de run_24h_simulation com a mesma semente
+        """
+        n_steps = int(duration_minutes // dt) + 1
+        disturbances = disturbances or DisturbanceGenerator.default(temp_externa_base, carga_base)
+        streams = disturbances.streams(seed)
+        
+        T_atual = float(temp_inicial)
+        erro_anterior = 0.0
+        setpoint = self.setpoint
+        calculate = self.fuzzy.calculate
+        update_temperature = self.model.discretize(dt).update_temperature
+        
+        for start in range(0, n_steps, chunk_size):
+            time_points = np.arange(start, min(start + chunk_size, n_steps)) * dt
+            T_ext_points, Q_est_points = disturbances.generate(time_points, streams)
+            
+            for t, T_ext, Q_est in zip(time_points.tolist(),
+                                       T_ext_points.tolist(),
+                                       Q_est_points.tolist()):
+                erro = T_atual - setpoint
+                delta_erro = erro - erro_anterior
+                
+                P_crac = calculate(erro, delta_erro, T_ext, Q_est, trace='none', use_cache=False)
+                T_atual = update_temperature(T_atual, P_crac, Q_est, T_ext)
+                
+                yield SimulationStep(t, T_atual, P_crac, T_ext, Q_est, erro)
+                erro_anterior = erro
+    
+    def run_batch_simulation(self, temp_inicial=22.0, temp_externa_base=25.0, carga_base=40.0,
+                             progress_callback=None, verbose=True, step_size=1,
+                             duration_minutes=DURATION_MINUTES, seed=None, disturbances=None):
+        """
+        Executa N cenários independentes de 24h em paralelo (arrays NumPy)
+        temp_inicial, temp_externa_base e carga_base podem ser escalares ou
+        arrays (com broadcast para N cenários). A cada passo: uma inferência
+        vetorizada (calculate_batch) e uma atualização vetorizada do modelo
+        Não publica via MQTT; retorna SimulationResults com colunas (N, passos)
+        verbose=False desliga as mensagens de progresso no terminal
+        """
+        temp_inicial, temp_externa_base, carga_base = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(temp_inicial, dtype=float)),
+            np.atleast_1d(np.asarray(temp_externa_base, dtype=float)),
+            np.atleast_1d(np.asarray(carga_base, dtype=float))
+        )
+        n_scenarios = temp_inicial.size
+        temp_inicial = temp_inicial.ravel()
+        
+        # Mesma discretização e perturbações de run_24h_simulation
+        time_points = self.time_points(step_size, duration_minutes)
+        disturbances = disturbances or DisturbanceGenerator.default(
+            temp_externa_base.ravel(), carga_base.ravel()
+        )
+        T_ext_points, Q_est_points = disturbances.generate(time_points, seed, n_scenarios)
+        
+        results = SimulationResults.allocate(time_points, self.setpoint, n_scenarios)
+        results['temp_externa'][:] = T_ext_points
+        results['carga_termica'][:] = Q_est_points
+        
+        T_atual = temp_inicial.copy()
+        erro_anterior = np.zeros(n_scenarios)
+        model = self.model.discretize(step_size)
+        progress_every = time_points.size // 10 + 1
+        
+        if verbose:
+            print(f"⚙️ Simulando {n_scenarios} cenários de {duration_minutes} minutos...")
+        
+        for i, t in enumerate(time_points):
+            # Progresso
+            if i % progress_every == 0:
+                progress = (t / duration_minutes) * 100
+                if verbose:
+                    print(f"   {progress:.0f}% completo")
+                if progress_callback:
+                    progress_callback(progress)
+            
+            T_ext = T_ext_points[:, i]
+            Q_est = Q_est_points[:, i]
             
             # Calcula erro e variação
             erro = T_atual - self.setpoint
             delta_erro = erro - erro_anterior
             
-            # Controlador fuzzy
-            P_crac = self.fuzzy.calculate(erro, delta_erro, T_ext, Q_est)
+            # Controlador fuzzy (uma inferência para todos os cenários)
+            P_crac = self.fuzzy.calculate_batch(erro, delta_erro, T_ext, Q_est)
             
             # Atualiza temperatura
-            T_atual = self.model.update_temperature(T_atual, P_crac, Q_est, T_ext)
+            T_atual = model.update_temperature(T_atual, P_crac, Q_est, T_ext)
             
-            # Armazena pontos simulados
-            time_points.append(t)
-            temp_points.append(T_atual)
+            results['temperature'][:, i] = T_atual
+            results['power_crac'][:, i] = P_crac
+            results['erro'][:, i] = erro
             
-            results['time'].append(t)
-            results['temperature'].append(float(T_atual))
-            results['power_crac'].append(float(P_crac))
-            results['temp_externa'].append(float(T_ext))
-            results['carga_termica'].append(float(Q_est))
-            results['erro'].append(float(erro))
-            results['setpoint'].append(self.setpoint)
+            erro_anterior = erro
+        
+        if verbose:
+            print("✅ Simulação completa!")
+        return results
+    
+    def run_multizone_simulation(self, setpoints, temp_inicial=22.0, temp_externa_base=25.0,
+                                 carga_base=40.0, exchange=None, coupling=0.0, load_profiles=None,
+                                 progress_callback=None, verbose=True, step_size=1,
+                                 duration_minutes=DURATION_MINUTES, seed=None):
+        """
+        Data center com várias zonas (CRACs / fileiras de racks)
+        setpoints: um por zona (define o número de zonas)
+        temp_inicial: escalar ou um valor por zona
+        carga_base: escalar ou um valor por zona (perfil de horário comercial);
+        load_profiles: lista de DisturbanceProfile, um por zona (substitui carga_base)
+        exchange: matriz n x n de troca de calor direta entre zonas e coupling:
+        troca com o ar comum (ver MultiZonePlant); None e 0 = zonas independentes
+        A temperatura externa é comum. Cada zona tem seu erro_anterior e todas
+        são avaliadas em uma única inferência em lote por passo
+        O acoplamento entre zonas é por minuto: com zonas acopladas step_size deve ser 1
+        Retorna SimulationResults com colunas (n_zonas, passos)
+        """
+        setpoints = np.atleast_1d(np.asarray(setpoints, dtype=float))
+        n_zones = setpoints.size
+        if step_size != 1 and (exchange is not None or np.any(coupling)):
+            raise ValueError("Zonas acopladas exigem step_size=1")
+        time_points = self.time_points(step_size, duration_minutes)
+        
+        # Perturbações: temperatura externa comum, carga por zona
+        rng_temp, rng_carga = DisturbanceGenerator.streams(seed)
+        T_ext_points = SinusoidProfile(base=temp_externa_base).generate(time_points, rng_temp)
+        if load_profiles is None:
+            load = BusinessHoursProfile(base=np.broadcast_to(np.asarray(carga_base, dtype=float), (n_zones,)))
+            Q_est_points = load.generate(time_points, rng_carga, n_zones)
+        else:
+            if len(load_profiles) != n_zones:
+                raise ValueError("load_profiles deve ter um perfil por zona")
+            Q_est_points = np.stack([profile.generate(time_points, rng_carga) for profile in load_profiles])
+        
+        plant = MultiZonePlant(n_zones, self.model.discretize(step_size), coupling, exchange=exchange)
+        engine = ClosedLoopEngine(self.fuzzy, plant, setpoints)
+        engine.reset(temp_inicial)
+        
+        results = SimulationResults.allocate(time_points, setpoints, n_zones)
+        results['temp_externa'][:] = T_ext_points
+        results['carga_termica'][:] = Q_est_points
+        progress_every = time_points.size // 10 + 1
+        
+        if verbose:
+            print(f"⚙️ Simulando {n_zones} zonas por {duration_minutes} minutos...")
+        
+        for i, t in enumerate(time_points):
+            # Progresso
+            if i % progress_every == 0:
+                progress = (t / duration_minutes) * 100
+                if verbose:
+                    print(f"   {progress:.0f}% completo")
+                if progress_callback:
+                    progress_callback(progress)
             
-            # Envia dados via MQTT
-            self._publish_simulation_data(t, T_atual, P_crac, T_ext, Q_est, erro)
+            # Todas as zonas: uma inferência em lote + atualização acoplada
+            temperature, P_crac, erro = engine.step(Q_est_points[:, i], T_ext_points[i])
             
-            erro_anterior = erro
+            results['temperature'][:, i] = temperature
+            results['power_crac'][:, i] = P_crac
+            results['erro'][:, i] = erro
         
-        print("✅ Simulação completa!")
+        if verbose:
+            print("✅ Simulação completa!")
         return results
     
     def _publish_simulation_data(self, time_min, temp, power, temp_ext, carga, erro):
@@ -115,29 +294,21 @@ class TemporalSimulation:
                 pass
     
     def calculate_metrics(self, results):
-        """Calcula métricas de desempenho"""
-        temps = np.array(results['temperature'])
-        erros = np.array(results['erro'])
-        
-        # RMSE
-        rmse = np.sqrt(np.mean(erros**2))
-        
-        # Tempo em faixa (20-24°C)
-        in_range = np.sum((temps >= 20) & (temps <= 24))
-        percent_in_range = (in_range / len(temps)) * 100
-        
-        # Violações críticas (<18 ou >26)
-        violations = np.sum((temps < 18) | (temps > 26))
-        
-        # Consumo energético
-        energy = np.sum(results['power_crac'])
-        
-        return {
-            'rmse': float(rmse),
-            'percent_in_range': float(percent_in_range),
-            'violations': int(violations),
-            'energy_consumption': float(energy),
-            'avg_temp': float(np.mean(temps)),
-            'max_temp': float(np.max(temps)),
-            'min_temp': float(np.min(temps))
-        }
+        """Calcula métricas de desempenho (definições em OnlineMetrics)"""
+        metrics = OnlineMetrics(results.step_size)
+        metrics.update_batch(results['temperature'], results['erro'], results['power_crac'])
+        return metrics.result()
+    
+    def calculate_batch_metrics(self, results):
+        """
+        Métricas de desempenho por cenário (resultado de run_batch_simulation)
+        Um OnlineMetrics por linha (mesmas definições de calculate_metrics),
+        retornadas como arrays (N,)
+        """
+        rows = []
+        for temperature, erro, power_crac in zip(results['temperature'], results['erro'],
+                                                 results['power_crac']):
+            metrics = OnlineMetrics(results.step_size)
+            metrics.update_batch(temperature, erro, power_crac)
+            rows.append(metrics.result())
+        return {name: np.array([row[name] for row in rows]) for name in rows[0]}
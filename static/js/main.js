@@ -159,6 +159,14 @@ async function runSimulation() {
                 <div class="metric-value" id="simulation-points">0</div>
                 <div class="metric-label">Pontos Recebidos</div>
             </div>
+            <div class="metric" style="margin-top: 10px;">
+                <div class="metric-value" id="simulation-live-rmse">-</div>
+                <div class="metric-label">RMSE Parcial (°C)</div>
+            </div>
+            <div class="metric" style="margin-top: 10px;">
+                <div class="metric-value" id="simulation-live-range">-</div>
+                <div class="metric-label">Tempo na Faixa (parcial)</div>
+            </div>
         </div>
     `;
     document.getElementById('simulation-results').style.display = 'block';
@@ -223,6 +231,18 @@ async function startSimulationPolling() {
                 progressElement.textContent = status.progress.toFixed(0) + '%';
             }
             
+            // Métricas parciais (acumuladas durante a simulação)
+            if (status.live_metrics) {
+                const rmseElement = document.getElementById('simulation-live-rmse');
+                const rangeElement = document.getElementById('simulation-live-range');
+                if (rmseElement) {
+                    rmseElement.textContent = status.live_metrics.rmse.toFixed(3);
+                }
+                if (rangeElement) {
+                    rangeElement.textContent = status.live_metrics.percent_in_range.toFixed(1) + '%';
+                }
+            }
+            
             // Busca mensagens da simulação
             const messagesResponse = await fetch('/api/simulation/messages');
             const messagesResult = await messagesResponse.json();
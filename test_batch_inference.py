@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Teste da inferência vetorizada (calculate_batch) contra o caminho escalar
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import time
+import numpy as np
+
+from fuzzy_controler.fuzzy_engine import FuzzyController
+from testing_utils import random_inputs
+
+
+def test_batch_matches_scalar():
+    """calculate_batch deve reproduzir calculate() elemento a elemento"""
+    fuzzy = FuzzyController()
+    erro, delta_erro, temp_externa, carga_termica = random_inputs(2000)
+    
+    # Inclui os pontos de quebra das funções de pertinência
+    erro = np.concatenate([erro, [-10, -6, -3, -1.5, -1, 0, 1.5, 3, 5, 7, 10]])
+    delta_erro = np.concatenate([delta_erro, [-5, -4, -2, -1, 0, 1, 2, 4, 5, 0, 0]])
+    temp_externa = np.concatenate([temp_externa, [10, 15, 20, 22, 25, 28, 30, 35, 10, 35, 22]])
+    carga_termica = np.concatenate([carga_termica, [0, 20, 30, 40, 50, 60, 70, 80, 100, 0, 100]])
+    
+    start = time.perf_counter()
+    scalar = np.array([
+        fuzzy.calculate(e, de, te, ct)
+        for e, de, te, ct in zip(erro, delta_erro, temp_externa, carga_termica)
+    ])
+    scalar_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    batch = fuzzy.calculate_batch(erro, delta_erro, temp_externa, carga_termica)
+    batch_time = time.perf_counter() - start
+    
+    max_diff = float(np.max(np.abs(batch - scalar)))
+    print(f"   • {erro.size} entradas | escalar: {scalar_time:.3f}s | batch: {batch_time:.3f}s")
+    print(f"   • Diferença máxima: {max_diff:.2e}")
+    
+    assert batch.shape == erro.shape
+    assert max_diff < 1e-9
+
+
+def test_batch_broadcast_shape():
+    """Escalares e arrays de formatos compatíveis devem sofrer broadcast"""
+    fuzzy = FuzzyController()
+    erro = np.linspace(-8, 8, 12).reshape(3, 4)
+    
+    batch = fuzzy.calculate_batch(erro, 0.0, 25.0, 40.0)
+    
+    assert batch.shape == (3, 4)
+    for idx in np.ndindex(erro.shape):
+        assert abs(batch[idx] - fuzzy.calculate(erro[idx], 0.0, 25.0, 40.0)) < 1e-9
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("🧪 TESTE DA INFERÊNCIA VETORIZADA")
+    print("=" * 70)
+    test_batch_matches_scalar()
+    test_batch_broadcast_shape()
+    print("✅ Todos os testes passaram!")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Teste da publicação MQTT assíncrona em lotes (BatchPublisher)
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import threading
+import time
+
+from fuzzy_controler.fuzzy_engine import FuzzyController
+from simulation.temporal_simulation import TemporalSimulation
+from mqtt.publisher import BatchPublisher
+
+
+class SlowMQTTClient:
+    """Cliente MQTT falso com ida e volta ao broker de 'latency' segundos por publicação"""
+    
+    def __init__(self, latency=0.002):
+        self.latency = latency
+        self.messages = []
+        self.batches = []
+        self.gate = threading.Event()
+        self.gate.set()
+    
+    def is_connected(self):
+        return True
+    
+    def publish_control_data(self, data):
+        time.sleep(self.latency)
+        self.messages.append(data)
+        return True
+    
+    def publish_batch(self, records):
+        self.gate.wait()
+        time.sleep(self.latency)
+        self.batches.append(list(records))
+        return True
+
+
+def test_simulation_does_not_wait_for_broker():
+    """Mesmos registros, na mesma ordem, sem a latência do broker na simulação"""
+    kwargs = dict(verbose=False, seed=3, publish_interval=1)
+    
+    direct_client = SlowMQTTClient()
+    start = time.perf_counter()
+    TemporalSimulation(FuzzyController(), direct_client).run_24h_simulation(**kwargs)
+    direct = time.perf_counter() - start
+    
+    batch_client = SlowMQTTClient()
+    publisher = BatchPublisher(batch_client, batch_size=100, linger=0.05)
+    with publisher:
+        start = time.perf_counter()
+        TemporalSimulation(FuzzyController(), publisher).run_24h_simulation(**kwargs)
+        batched = time.perf_counter() - start
+        assert publisher.flush(timeout=10)
+    
+    print(f"   • Publicação síncrona {direct:.2f}s, em lotes {batched:.2f}s "
+          f"({len(batch_client.batches)} mensagens)")
+    records = [record for batch in batch_client.batches for record in batch]
+    strip = lambda r: {k: v for k, v in r.items() if k != 'timestamp'}
+    assert [strip(r) for r in records] == [strip(r) for r in direct_client.messages]
+    assert all(len(batch) <= 100 for batch in batch_client.batches)
+    assert batched < direct
+    
+    stats = publisher.stats()
+    assert stats['published'] == stats['submitted'] == len(records)
+    assert stats['dropped'] == stats['failed'] == stats['pending'] == 0
+
+
+def test_linger_and_backpressure():
+    """Lote parcial sai após linger; fila cheia descarta (block=False) e conta"""
+    client = SlowMQTTClient(latency=0)
+    with BatchPublisher(client, batch_size=50, linger=0.05) as publisher:
+        for i in range(3):
+            publisher.publish_control_data({'i': i})
+        assert publisher.flush(timeout=2)
+        assert client.batches == [[{'i': 0}, {'i': 1}, {'i': 2}]]
+    
+    client = SlowMQTTClient(latency=0)
+    client.gate.clear()  # broker "travado"
+    publisher = BatchPublisher(client, batch_size=5, linger=0, maxsize=10, block=False).start()
+    accepted = [publisher.publish_control_data({'i': i}) for i in range(100)]
+    stats = publisher.stats()
+    assert stats['dropped'] == accepted.count(False) > 0
+    assert stats['queued'] <= 10
+    assert not publisher.flush(timeout=0.05)
+    
+    client.gate.set()
+    assert publisher.flush(timeout=2)
+    publisher.stop()
+    stats = publisher.stats()
+    assert stats['published'] + stats['dropped'] == stats['submitted'] == 100
+    print(f"   • Fila cheia: {stats['published']} publicados, {stats['dropped']} descartados")
+    
+    # block=True com timeout: espera pela fila e descarta se o tempo esgotar
+    client.gate.clear()
+    publisher = BatchPublisher(client, batch_size=1, linger=0, maxsize=1, timeout=0.01).start()
+    results = [publisher.publish_control_data({'i': i}) for i in range(5)]
+    assert results.count(False) == publisher.stats()['dropped'] >= 1
+    client.gate.set()
+    publisher.stop()
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("🧪 TESTE DA PUBLICAÇÃO MQTT EM LOTES")
+    print("=" * 70)
+    test_simulation_does_not_wait_for_broker()
+    test_linger_and_backpressure()
+    print("✅ Todos os testes passaram!")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Teste da simulação em lote (vários cenários de 24h em paralelo)
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import contextlib
+import io
+import time
+import numpy as np
+
+from fuzzy_controler.fuzzy_engine import FuzzyController
+from simulation.temporal_simulation import TemporalSimulation
+
+
+def test_single_scenario_matches_scalar():
+    """Com um cenário e a mesma semente, o lote reproduz run_24h_simulation"""
+    simulation = TemporalSimulation(FuzzyController())
+    
+    scalar = simulation.run_24h_simulation(23.0, 27.0, 55.0, seed=42)
+    batch = simulation.run_batch_simulation(23.0, 27.0, 55.0, verbose=False, seed=42)
+    
+    assert batch['temperature'].shape == (1, len(scalar['time']))
+    assert np.array_equal(batch['time'], scalar['time'])
+    for key in ('temperature', 'power_crac', 'temp_externa', 'carga_termica', 'erro'):
+        assert np.max(np.abs(batch[key][0] - np.array(scalar[key]))) < 1e-9, key
+    
+    metrics = simulation.calculate_metrics(scalar)
+    batch_metrics = simulation.calculate_batch_metrics(batch)
+    for key, value in metrics.items():
+        assert abs(batch_metrics[key][0] - value) < 1e-9, key
+
+
+def test_scenarios_are_independent():
+    """Cada linha do lote é a simulação escalar com as mesmas perturbações"""
+    fuzzy = FuzzyController()
+    simulation = TemporalSimulation(fuzzy)
+    
+    rng = np.random.default_rng(0)
+    n = 200
+    temp_inicial = rng.uniform(18, 28, n)
+    temp_externa_base = rng.uniform(15, 32, n)
+    carga_base = rng.uniform(10, 90, n)
+    
+    start = time.perf_counter()
+    batch = simulation.run_batch_simulation(temp_inicial, temp_externa_base, carga_base, verbose=False)
+    elapsed = time.perf_counter() - start
+    print(f"   • {n} cenários de 24h em {elapsed:.2f}s")
+    
+    # Reexecuta alguns cenários passo a passo com as perturbações registradas
+    for k in rng.choice(n, 5, replace=False):
+        T_atual, erro_anterior = temp_inicial[k], 0.0
+        for i in range(batch['time'].size):
+            erro = T_atual - simulation.setpoint
+            P_crac = fuzzy.calculate(erro, erro - erro_anterior,
+                                     batch['temp_externa'][k, i], batch['carga_termica'][k, i])
+            T_atual = simulation.model.update_temperature(
+                T_atual, P_crac, batch['carga_termica'][k, i], batch['temp_externa'][k, i]
+            )
+            assert abs(batch['temperature'][k, i] - T_atual) < 1e-9
+            erro_anterior = erro
+    
+    # Escalares sofrem broadcast para o número de cenários; verbose=False não imprime nada
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        results = simulation.run_batch_simulation(22.0, [20.0, 25.0, 30.0], 40.0, verbose=False)
+    assert results['temperature'].shape[0] == 3 and output.getvalue() == ''
+
+
+
+def test_step_size_and_downsample():
+    """Passo configurável (1 min por padrão) e redução explícita para o dashboard"""
+    simulation = TemporalSimulation(FuzzyController())
+    
+    full = simulation.run_24h_simulation(verbose=False, seed=0)
+    assert len(full['time']) == 1441 and full['time'][1] - full['time'][0] == 1
+    
+    coarse = simulation.run_24h_simulation(verbose=False, step_size=5)
+    assert len(coarse['time']) == 289
+    
+    reduced = full.downsample(5)
+    assert np.array_equal(reduced['time'], coarse['time'])
+    assert np.array_equal(reduced['temperature'], full['temperature'][::5])
+    
+    # Conversão para o formato JSON (listas) apenas na borda da API
+    data = reduced.to_dict()
+    assert set(data) == {'time', 'temperature', 'power_crac', 'temp_externa',
+                         'carga_termica', 'erro', 'setpoint'}
+    assert data['setpoint'] == [simulation.setpoint] * 289
+    assert isinstance(data['temperature'], list) and len(data['temperature']) == 289
+    assert full.nbytes == 6 * 1441 * 8
+    
+    # Passo de 1 min: inferência escalar compilada, sem alocar detalhes
+    fuzzy = simulation.fuzzy
+    fuzzy.enable_cache(maxsize=64)
+    simulation.run_24h_simulation(verbose=False)
+    assert fuzzy.last_inference is None
+    assert fuzzy.cache_stats()['size'] == 0
+
+
+def test_step_size_discretizes_plant_and_energy():
+    """Passo maior não muda a planta nem a escala da energia"""
+    simulation = TemporalSimulation(FuzzyController())
+    model = simulation.model
+    
+    # Entradas constantes: um passo de 5 min == cinco passos de 1 min
+    T = np.array([18.0, 22.0, 30.0])
+    coarse = model.discretize(5).update_temperature(T, 40.0, 50.0, 28.0)
+    for _ in range(5):
+        T = model.update_temperature(T, 40.0, 50.0, 28.0)
+    assert np.max(np.abs(coarse - T)) < 1e-9
+    assert model.discretize(1) is model
+    
+    # Energia em %·min: mesma ordem de grandeza em qualquer resolução
+    energy = {}
+    for step_size in (1, 5):
+        results = simulation.run_24h_simulation(verbose=False, step_size=step_size, seed=0)
+        batch = simulation.run_batch_simulation(step_size=step_size, seed=0, verbose=False)
+        energy[step_size] = simulation.calculate_metrics(results)['energy_consumption']
+        assert abs(simulation.calculate_batch_metrics(batch)['energy_consumption'][0] - energy[step_size]) < 1e-6
+    print(f"   • Energia: passo de 1 min {energy[1]:.0f}, passo de 5 min {energy[5]:.0f} (%·min)")
+    assert abs(energy[5] / energy[1] - 1) < 0.05
+    
+    try:
+        simulation.run_multizone_simulation([22.0, 23.0], exchange=np.ones((2, 2)), step_size=5, verbose=False)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Zonas acopladas com step_size != 1 deveriam gerar ValueError")
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("🧪 TESTE DA SIMULAÇÃO EM LOTE")
+    print("=" * 70)
+    test_single_scenario_matches_scalar()
+    test_scenarios_are_independent()
+    test_step_size_and_downsample()
+    test_step_size_discretizes_plant_and_energy()
+    print("✅ Todos os testes passaram!")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Teste do cache LRU de FuzzyController.calculate (CalculationCache)
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+from fuzzy_controler.fuzzy_engine import FuzzyController
+from fuzzy_controler.calculation_cache import CalculationCache
+from fuzzy_controler.surface_lut import SurfaceLUT
+
+
+def test_exact_mode_counters():
+    """Modo exato: mesma saída com e sem cache, acertos/falhas contados"""
+    fuzzy = FuzzyController()
+    reference = FuzzyController()
+    fuzzy.enable_cache(maxsize=8)
+    
+    inputs = [(1.0, 0.5, 28.0, 60.0), (-2.0, -1.0, 22.0, 30.0), (1.0, 0.5, 28.0, 60.0)]
+    for args in inputs:
+        assert fuzzy.calculate(*args) == reference.calculate(*args)
+    
+    stats = fuzzy.cache_stats()
+    assert stats['enabled'] and stats['exact']
+    assert stats['hits'] == 1 and stats['misses'] == 2 and stats['size'] == 2
+    assert abs(stats['hit_rate'] - 1 / 3) < 1e-12
+    
+    # Entradas fora do universo saturam antes da chave: mesma entrada do cache
+    fuzzy.calculate(50.0, 0.5, 28.0, 60.0)
+    fuzzy.calculate(10.0, 0.5, 28.0, 60.0)
+    assert fuzzy.cache_stats()['hits'] == 2
+    
+    # use_cache=False não consulta nem altera o cache
+    fuzzy.calculate(3.0, 0.0, 25.0, 40.0, use_cache=False)
+    assert fuzzy.cache_stats()['misses'] == 3 and fuzzy.cache_stats()['size'] == 3
+    
+    fuzzy.disable_cache()
+    assert fuzzy.cache_stats() == {'enabled': False}
+
+
+def test_quantized_mode():
+    """Modo quantizado: entradas da mesma célula compartilham o resultado do ponto quantizado"""
+    cache = CalculationCache(maxsize=16, quantum=0.5)
+    key, values = cache.key([1.1, -0.2, 25.26, 40.0])
+    assert key == (2, 0, 51, 80)
+    assert values == (1.0, 0.0, 25.5, 40.0)
+    assert cache.key([0.9, 0.2, 25.4, 39.8])[0] == key
+    assert cache.key([1.3, 0.2, 25.4, 39.8])[0] != key
+    
+    fuzzy = FuzzyController(cache_size=16, cache_quantum=0.5)
+    reference = FuzzyController()
+    first = fuzzy.calculate(1.1, -0.2, 25.26, 40.0)
+    second = fuzzy.calculate(0.9, 0.2, 25.4, 39.8)
+    assert first == second == reference.calculate(1.0, 0.0, 25.5, 40.0)
+    
+    stats = fuzzy.cache_stats()
+    assert not stats['exact'] and stats['quantum'] == 0.5
+    assert stats['hits'] == 1 and stats['misses'] == 1
+    print(f"   • Quantum 0.5: (1.1, -0.2, 25.26, 40) e (0.9, 0.2, 25.4, 39.8) -> {first:.2f}")
+    
+    for maxsize, quantum in ((0, None), (8, 0), (8, -0.1)):
+        try:
+            CalculationCache(maxsize, quantum)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Parâmetros inválidos do cache deveriam gerar ValueError")
+
+
+def test_lru_eviction_order():
+    """Cheio, descarta o menos usado recentemente (get renova a entrada)"""
+    cache = CalculationCache(maxsize=3)
+    for name in 'abc':
+        cache.put(name, name.upper())
+    
+    assert cache.get('a') == 'A'   # 'b' passa a ser o menos usado
+    cache.put('d', 'D')
+    assert cache.get('b') is None
+    assert [cache.get(name) for name in 'acd'] == ['A', 'C', 'D']
+    
+    cache.put('e', 'E')            # ordem de uso: a, c, d -> 'a' sai
+    assert cache.get('a') is None and cache.get('e') == 'E'
+    
+    stats = cache.stats()
+    assert stats['evictions'] == 2 and stats['size'] == 3
+    assert stats['hits'] == 5 and stats['misses'] == 2
+
+
+def test_surface_lut_clears_cache():
+    """Trocar o modo SurfaceLUT esvazia o cache (resultados de outra superfície)"""
+    fuzzy = FuzzyController()
+    fuzzy.enable_cache(maxsize=16)
+    lut = SurfaceLUT.build(fuzzy, (11, 11, 6, 6), error_samples=100)
+    
+    fuzzy.calculate(1.0, 0.5, 28.0, 60.0)
+    fuzzy.calculate(-1.0, 0.0, 24.0, 50.0)
+    assert fuzzy.cache_stats()['size'] == 2
+    
+    fuzzy.use_surface_lut(lut)
+    stats = fuzzy.cache_stats()
+    assert stats['size'] == 0 and stats['misses'] == 2
+    assert fuzzy.calculate(1.0, 0.5, 28.0, 60.0) == lut.interpolate(1.0, 0.5, 28.0, 60.0)
+    assert fuzzy.cache_stats()['misses'] == 3
+    
+    fuzzy.use_surface_lut(None)
+    assert fuzzy.cache_stats()['size'] == 0
+    assert fuzzy.calculate(1.0, 0.5, 28.0, 60.0) == FuzzyController().calculate(1.0, 0.5, 28.0, 60.0)
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("🧪 TESTE DO CACHE DE CÁLCULOS (CalculationCache)")
+    print("=" * 70)
+    test_exact_mode_counters()
+    test_quantized_mode()
+    test_lru_eviction_order()
+    test_surface_lut_clears_cache()
+    print("✅ Todos os testes passaram!")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Teste de concorrência: um único controlador compartilhado por vários threads
+(como no app Flask com threaded=True)
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from fuzzy_controler.fuzzy_engine import FuzzyController
+from testing_utils import random_inputs
+
+WORKERS = 16
+
+
+def _random_inputs(n, seed=0):
+    """Entradas por chamada dentro dos universos, arredondadas (detalhes comparáveis)"""
+    return [
+        tuple(round(float(x), 3) for x in row)
+        for row in zip(*random_inputs(n, seed, within_universes=True))
+    ]
+
+
+def test_shared_controller_evaluate():
+    """evaluate() em paralelo deve reproduzir o cálculo sequencial"""
+    inputs = _random_inputs(2000)
+    reference = FuzzyController()
+    expected = [reference.calculate(*x) for x in inputs]
+    
+    shared = FuzzyController()
+    shared.enable_cache(maxsize=256)  # cache pequeno: muitos descartes concorrentes
+    
+    # Entradas repetidas para misturar acertos e falhas do cache
+    jobs = list(range(len(inputs))) * 3
+    np.random.default_rng(1).shuffle(jobs)
+    
+    def run(k):
+        potencia_crac, details = shared.evaluate(*inputs[k])
+        return k, potencia_crac, details
+    
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        results = list(executor.map(run, jobs))
+    
+    for k, potencia_crac, details in results:
+        assert potencia_crac == expected[k]
+        assert details['output'] == potencia_crac
+        assert tuple(details['inputs'].values()) == inputs[k]
+    
+    assert shared.last_inference is None
+    stats = shared.cache_stats()
+    assert stats['hits'] + stats['misses'] == len(jobs)
+    print(f"   • {len(jobs)} avaliações em {WORKERS} threads, "
+          f"{stats['hits']} acertos de cache, {stats['evictions']} descartes")
+
+
+def test_flask_calculate_parallel_requests():
+    """Requisições paralelas a /api/calculate recebem os próprios detalhes"""
+    import app as backend
+    
+    inputs = _random_inputs(400, seed=2)
+    reference = FuzzyController()
+    expected = [reference.calculate(*x) for x in inputs]
+    
+    def post(k):
+        erro, delta_erro, temp_externa, carga_termica = inputs[k]
+        client = backend.app.test_client()
+        response = client.post('/api/calculate', json={
+            'erro': erro,
+            'delta_erro': delta_erro,
+            'temp_externa': temp_externa,
+            'carga_termica': carga_termica
+        })
+        return k, response.status_code, response.get_json()
+    
+    count_before = backend.system_state['message_count']
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        results = list(executor.map(post, range(len(inputs))))
+    
+    for k, status, body in results:
+        assert status == 200 and body['success']
+        details = body['inference_details']
+        assert tuple(details['inputs'][var] for var in FuzzyController.INPUT_RANGES) == inputs[k]
+        assert abs(details['output'] - expected[k]) < 1e-9
+        assert body['potencia_crac'] == round(expected[k], 2)
+    
+    assert backend.system_state['message_count'] - count_before == len(inputs)
+    assert len(backend.system_state['mqtt_messages']) <= 50
+    print(f"   • {len(inputs)} requisições paralelas com detalhes consistentes")
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("🧪 TESTE DE CONCORRÊNCIA DO CONTROLADOR")
+    print("=" * 70)
+    test_shared_controller_evaluate()
+    test_flask_calculate_parallel_requests()
+    print("✅ Todos os testes passaram!")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Teste do serviço de controle via MQTT (ControlLoop) contra um broker falso
+em processo: sensores -> inferência em lote por tick -> comandos
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import json
+import threading
+import time
+import numpy as np
+
+from fuzzy_controler.fuzzy_engine import FuzzyController
+from simulation.physical_model import PhysicalModel
+from mqtt.mqtt_client import MQTTClient
+from mqtt.control_loop import ControlLoop
+from testing_utils import FakeBroker, FakePahoClient
+
+
+class CommandRecorder:
+    """Assinante dos comandos publicados pelo serviço"""
+    
+    def __init__(self, broker):
+        self.client = MQTTClient(client_factory=lambda: FakePahoClient(broker))
+        self.commands = {}
+        self.client.subscribe('datacenter/crac/+/command', self.on_command)
+        self.client.connect()
+    
+    def on_command(self, topic, payload):
+        self.commands.setdefault(topic.split('/')[2], []).append(json.loads(payload))
+
+
+def _service(broker, **kwargs):
+    client = MQTTClient(client_factory=lambda: FakePahoClient(broker))
+    loop = ControlLoop(FuzzyController(), client, **kwargs).start()
+    client.connect()
+    return loop
+
+
+def test_sensor_updates_to_commands():
+    """Cada tick avalia os dispositivos com leitura nova, com erro_anterior próprio"""
+    broker = FakeBroker()
+    recorder = CommandRecorder(broker)
+    loop = _service(broker)
+    fuzzy = FuzzyController()
+    
+    broker.publish('datacenter/sensors/crac-1/temp_externa', '30')
+    broker.publish('datacenter/sensors/crac-1/carga_termica', '{"carga_termica": 70}')
+    broker.publish('datacenter/sensors/crac-1/temperature', '24.0')
+    broker.publish('datacenter/sensors/crac-2/temperature', '21.0')
+    broker.publish('datacenter/sensors/crac-2/setpoint', '20.0')
+    broker.publish('datacenter/sensors/crac-3/humidity', '50')
+    broker.publish('datacenter/sensors/crac-3/temperature', 'quente')
+    
+    commands = loop.tick()
+    assert commands['crac-1'] == fuzzy.calculate(2.0, 0.0, 30.0, 70.0)
+    assert commands['crac-2'] == fuzzy.calculate(1.0, 0.0, 25.0, 40.0)
+    assert loop.tick() == {}  # nenhuma leitura nova
+    
+    broker.publish('datacenter/sensors/crac-1/temperature', '23.0')
+    commands = loop.tick()
+    assert list(commands) == ['crac-1']
+    assert commands['crac-1'] == fuzzy.calculate(1.0, -1.0, 30.0, 70.0)
+    
+    assert [c['potencia_crac'] for c in recorder.commands['crac-1']] == [
+        fuzzy.calculate(2.0, 0.0, 30.0, 70.0), commands['crac-1']
+    ]
+    stats = loop.stats()
+    assert stats['devices'] == 2 and stats['ignored'] == 2 and stats['commands'] == 3
+    
+    # Após reconexão o serviço volta a receber os sensores
+    broker.restart()
+    broker.publish('datacenter/sensors/crac-2/temperature', '20.5')
+    assert list(loop.tick()) == ['crac-2']
+
+
+def test_non_finite_readings_ignored():
+    """NaN e Infinity (texto ou JSON) são ignorados e não criam nem alteram dispositivos"""
+    broker = FakeBroker()
+    loop = _service(broker)
+    
+    broker.publish('datacenter/sensors/crac-1/temperature', '24.0')
+    assert loop.tick() == {'crac-1': FuzzyController().calculate(2.0, 0.0, 25.0, 40.0)}
+    
+    broker.publish('datacenter/sensors/crac-1/temperature', 'NaN')
+    broker.publish('datacenter/sensors/crac-1/temp_externa', 'Infinity')
+    broker.publish('datacenter/sensors/crac-1/setpoint', '{"setpoint": -Infinity}')
+    broker.publish('datacenter/sensors/crac-2/temperature', '{"temperature": NaN}')
+    assert loop.tick() == {}
+    
+    stats = loop.stats()
+    assert stats['ignored'] == 4 and stats['devices'] == 1
+    
+    # Próxima leitura válida: delta_erro a partir do último erro finito
+    broker.publish('datacenter/sensors/crac-1/temperature', '23.0')
+    assert loop.tick() == {'crac-1': FuzzyController().calculate(1.0, -1.0, 25.0, 40.0)}
+    print("   • Leituras NaN/Infinity ignoradas")
+
+
+def test_thousands_of_devices_closed_loop():
+    """2000 CRACs simulados fechando a malha pelo broker, uma inferência por tick"""
+    broker = FakeBroker()
+    recorder = CommandRecorder(broker)
+    loop = _service(broker, capacity=16)
+    model = PhysicalModel()
+    
+    n_devices = 2000
+    devices = [f'crac-{i:04d}' for i in range(n_devices)]
+    temperature = np.linspace(20.0, 27.0, n_devices)
+    loads = np.linspace(20.0, 80.0, n_devices)
+    for device, load in zip(devices, loads):
+        broker.publish(f'datacenter/sensors/{device}/carga_termica', str(load))
+    
+    tick_times = []
+    for _ in range(30):
+        for device, value in zip(devices, temperature):
+            broker.publish(f'datacenter/sensors/{device}/temperature', repr(float(value)))
+        start = time.perf_counter()
+        commands = loop.tick()
+        tick_times.append(time.perf_counter() - start)
+        power = np.array([commands[device] for device in devices])
+        temperature = model.update_temperature(temperature, power, loads, 25.0)
+    
+    assert loop.stats()['devices'] == n_devices
+    assert all(len(recorder.commands[device]) == 30 for device in devices)
+    print(f"   • {n_devices} dispositivos: tick médio {np.mean(tick_times) * 1000:.1f} ms; "
+          f"temperaturas finais {temperature.min():.2f}–{temperature.max():.2f}°C")
+    assert np.all((temperature > 18) & (temperature < 26))
+
+
+def test_run_until_stopped():
+    """run() executa ticks periódicos até o evento de parada"""
+    broker = FakeBroker()
+    loop = _service(broker)
+    stop_event = threading.Event()
+    thread = threading.Thread(target=loop.run, args=(0.01, stop_event))
+    thread.start()
+    
+    broker.publish('datacenter/sensors/crac-1/temperature', '25')
+    deadline = time.monotonic() + 2
+    while loop.stats()['commands'] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stop_event.set()
+    thread.join(timeout=2)
+    
+    assert not thread.is_alive()
+    assert loop.stats()['commands'] == 1 and loop.stats()['ticks'] >= 1
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("🧪 TESTE DO SERVIÇO DE CONTROLE VIA MQTT")
+    print("=" * 70)
+    test_sensor_updates_to_commands()
+    test_non_finite_readings_ignored()
+    test_thousands_of_devices_closed_loop()
+    test_run_until_stopped()
+    print("✅ Todos os testes passaram!")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Teste da defuzzificação analítica (centroid_analytic) contra o centroide
+amostrado no universo de discurso
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import numpy as np
+
+from fuzzy_controler.fuzzy_engine import FuzzyController
+from fuzzy_controler.membership_functions import MembershipFunctions
+from fuzzy_controler.defuzzification import Defuzzification
+
+
+def _random_aggregations(mf, n, seed=0):
+    """Gera agregações de saída aleatórias (alguns termos desativados)"""
+    rng = np.random.default_rng(seed)
+    activations = rng.uniform(0, 1, (n, len(mf.potencia_crac_terms)))
+    activations *= rng.uniform(size=activations.shape) < 0.6
+    return [dict(zip(mf.potencia_crac_terms, row)) for row in activations]
+
+
+def _fine_centroid(mf, output_aggregation, points=200001):
+    """Centroide por integração numérica com amostragem muito fina"""
+    universe = np.linspace(mf.potencia_crac_universe[0], mf.potencia_crac_universe[-1], points)
+    aggregated = np.zeros_like(universe)
+    for term, activation in output_aggregation.items():
+        term_mf = mf.potencia_crac_mf[term](universe)
+        aggregated = np.maximum(aggregated, np.minimum(term_mf, activation))
+    if np.sum(aggregated) == 0:
+        return 50.0
+    dx = np.diff(universe)
+    area = np.sum(dx * (aggregated[:-1] + aggregated[1:])) / 2
+    moment = np.sum(dx * (universe[:-1] * aggregated[:-1] + universe[1:] * aggregated[1:])) / 2
+    return moment / area
+
+
+def test_analytic_matches_fine_sampling():
+    """O centroide exato deve convergir para a integração numérica fina"""
+    mf = MembershipFunctions()
+    defuzz = Defuzzification()
+
+    # Casos de borda: ativações iguais às alturas dos cruzamentos, de topo e de um só termo
+    edges = [dict.fromkeys(mf.potencia_crac_terms, h) for h in (0.2, 2 / 7, 1.0)]
+    edges += [{term: 0.7} for term in mf.potencia_crac_terms]
+
+    max_diff = 0.0
+    for output_aggregation in _random_aggregations(mf, 200) + edges:
+        exact = defuzz.centroid_analytic(output_aggregation, mf)
+        max_diff = max(max_diff, abs(exact - _fine_centroid(mf, output_aggregation)))
+
+    print(f"   • Analítico vs integração fina: diferença máxima {max_diff:.2e}")
+    assert max_diff < 1e-3
+
+
+def test_analytic_close_to_sampled():
+    """O centroide amostrado (200 pontos) difere do exato só pelo erro de discretização"""
+    mf = MembershipFunctions()
+    defuzz = Defuzzification()
+
+    diffs = [
+        abs(defuzz.centroid_analytic(agg, mf) - defuzz.centroid(agg, mf))
+        for agg in _random_aggregations(mf, 2000, seed=1)
+    ]
+
+    print(f"   • Analítico vs amostrado: diferença máxima {max(diffs):.3f}, média {np.mean(diffs):.3f}")
+    assert max(diffs) < 1.0
+    assert defuzz.centroid_analytic({term: 0.0 for term in mf.potencia_crac_terms}, mf) == 50.0
+
+
+def test_controller_selects_method():
+    """O método de defuzzificação é escolhido por controlador (escalar e batch)"""
+    sampled = FuzzyController()
+    analytic = FuzzyController(defuzzification='centroid_analytic')
+
+    rng = np.random.default_rng(2)
+    erro = rng.uniform(-10, 10, 300)
+    delta_erro = rng.uniform(-5, 5, 300)
+    temp_externa = rng.uniform(10, 35, 300)
+    carga_termica = rng.uniform(0, 100, 300)
+
+    scalar = np.array([
+        analytic.calculate(*inputs)
+        for inputs in zip(erro, delta_erro, temp_externa, carga_termica)
+    ])
+    batch = analytic.calculate_batch(erro, delta_erro, temp_externa, carga_termica)
+    reference = sampled.calculate_batch(erro, delta_erro, temp_externa, carga_termica)
+
+    assert np.max(np.abs(batch - scalar)) < 1e-9
+    assert np.max(np.abs(batch - reference)) < 1.0
+
+    try:
+        FuzzyController(defuzzification='bisector')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Método desconhecido deveria gerar ValueError")
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("🧪 TESTE DA DEFUZZIFICAÇÃO ANALÍTICA")
+    print("=" * 70)
+    test_analytic_matches_fine_sampling()
+    test_analytic_close_to_sampled()
+    test_controller_selects_method()
+    print("✅ Todos os testes passaram!")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Teste dos níveis de registro da inferência (trace none/summary/full)
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+from fuzzy_controler.fuzzy_engine import FuzzyController
+from testing_utils import random_inputs
+
+
+def _random_inputs(n, seed=0):
+    """Entradas aleatórias por chamada (tuplas), incluindo valores fora dos universos"""
+    return list(zip(*random_inputs(n, seed)))
+
+
+def test_trace_levels_same_output():
+    """Todos os níveis de trace devem produzir exatamente a mesma saída"""
+    full = FuzzyController()
+    summary = FuzzyController(trace='summary')
+    silent = FuzzyController(trace='none')
+    
+    for inputs in _random_inputs(500):
+        expected = full.calculate(*inputs)
+        assert summary.calculate(*inputs) == expected
+        assert silent.calculate(*inputs) == expected
+        
+        details = summary.get_inference_details()
+        assert details['trace'] == 'summary'
+        assert details['activated_rules_count'] == full.get_inference_details()['activated_rules_count']
+        assert summary.last_inference['output_aggregation'] == full.last_inference['output_aggregation']
+    
+    assert silent.last_inference is None
+    print("   • Saídas idênticas nos três níveis de trace")
+
+
+def test_trace_per_call():
+    """O nível pode ser escolhido por chamada; 'none' não altera last_inference"""
+    fuzzy = FuzzyController(trace='none')
+    
+    fuzzy.calculate(2.0, 0.5, 28.0, 60.0, trace='full')
+    details = fuzzy.get_inference_details()
+    assert details['trace'] == 'full'
+    assert details['activated_rules_count'] == len(fuzzy.last_inference['activated_rules']) > 0
+    
+    fuzzy.calculate(-3.0, -1.0, 15.0, 20.0)
+    assert fuzzy.get_inference_details() == details
+    
+    # Com cache, o registro guardado corresponde ao nível pedido
+    fuzzy.enable_cache(maxsize=16)
+    fuzzy.calculate(2.0, 0.5, 28.0, 60.0, trace='summary')
+    fuzzy.calculate(2.0, 0.5, 28.0, 60.0, trace='full')
+    assert fuzzy.get_inference_details()['trace'] == 'full'
+    
+    try:
+        fuzzy.calculate(0.0, 0.0, 25.0, 40.0, trace='debug')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Nível de trace desconhecido deveria gerar ValueError")
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("🧪 TESTE DOS NÍVEIS DE TRACE DA INFERÊNCIA")
+    print("=" * 70)
+    test_trace_levels_same_output()
+    test_trace_per_call()
+    print("✅ Todos os testes passaram!")
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Teste da reconexão MQTT e do buffer offline (store-and-forward)
+contra um broker falso em processo
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import json
+
+from fuzzy_controler.fuzzy_engine import FuzzyController
+from simulation.temporal_simulation import TemporalSimulation
+from mqtt.mqtt_client import MQTTClient
+from mqtt.publisher import BatchPublisher
+from testing_utils import FakeBroker, FakePahoClient
+
+
+def _client(broker, **kwargs):
+    return MQTTClient(client_factory=lambda: FakePahoClient(broker), **kwargs)
+
+
+def test_connect_is_non_blocking_and_replays():
+    """Sem broker, connect() retorna na hora; o buffer é reenviado ao conectar"""
+    broker = FakeBroker(up=False)
+    client = _client(broker, reconnect_delay=(0.5, 8))
+    
+    assert client.client.reconnect_delay == (0.5, 8)
+    assert client.connect(timeout=0) is False
+    assert client.accepts_messages() and not client.is_connected()
+    
+    for i in range(5):
+        assert client.publish_control_data({'erro': float(i)})
+    assert client.buffer_stats()['pending'] == 10 and broker.received == []
+    
+    broker.start()
+    assert client.wait_until_ready(timeout=1)
+    assert [m['erro'] for m in broker.messages('control')] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert client.buffer_stats()['replayed'] == 10
+    
+    # Sem connect() (modo sem broker) nada é guardado
+    idle = _client(FakeBroker())
+    assert not idle.publish_control_data({'erro': 1.0}) and idle.buffer_stats()['pending'] == 0
+
+
+def test_broker_restart_loses_nothing():
+    """Queda do broker no meio da publicação: tudo chega, na ordem"""
+    broker = FakeBroker()
+    client = _client(broker)
+    assert client.connect(timeout=1)
+    
+    for i in range(300):
+        if i == 100:
+            broker.stop()
+        if i == 200:
+            broker.start()
+        assert client.publish_control_data({'erro': float(i)})
+    
+    assert [m['erro'] for m in broker.messages('control')] == [float(i) for i in range(300)]
+    assert broker.messages('temp') == [float(i) for i in range(300)]
+    stats = client.buffer_stats()
+    assert stats['reconnects'] == 1 and stats['dropped'] == 0 and stats['pending'] == 0
+    print(f"   • Queda do broker: {stats['replayed']} mensagens reenviadas, nenhuma perdida")
+    
+    # Conexão perdida sem aviso (publish falha antes do callback): alerta QoS 1
+    # fica na fila do paho, que o reenvia ao reconectar (uma única vez)
+    broker.up = False
+    assert client.publish_alert({'level': 'critical'})
+    assert client.buffer_stats()['pending'] == 0 and client.buffer_stats()['paho_queued'] == 1
+    broker.up = True
+    client.client.drop()
+    broker.start()
+    assert [json.loads(payload) for _, payload, _, _ in broker.on('alert')] == [{'level': 'critical'}]
+
+
+def test_publish_errors_are_not_buffered():
+    """Erros que não são falta de conexão: mensagem descartada e contada, o buffer segue"""
+    broker = FakeBroker()
+    client = _client(broker)
+    assert client.connect(timeout=1)
+    
+    # Tópico com curinga: o paho recusa (ValueError)
+    assert not client.publish('a/+/x', '1')
+    for i in range(5):
+        assert client.publish_control_data({'erro': float(i)})
+    assert [m['erro'] for m in broker.messages('control')] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    stats = client.buffer_stats()
+    assert stats['pending'] == 0 and stats['errors'] == 1 and stats['buffered'] == 0
+    
+    # Envio QoS 0 falha sem conexão e ela volta sem callback: o próximo envio esvazia o buffer antes
+    broker.up = False
+    assert client.publish('datacenter/fuzzy/log', 'warning', qos=0)
+    broker.up = True
+    assert client.publish('datacenter/fuzzy/log', 'critical', qos=0)
+    assert [payload for _, payload, _, _ in broker.on('log')] == [b'warning', b'critical']
+    assert client.buffer_stats()['pending'] == 0
+    print(f"   • Erro de publicação descartado: {stats['errors']}, buffer vazio")
+
+
+def test_disconnect_window_no_duplicates():
+    """
+    Queda percebida pelo paho antes do on_disconnect: QoS>=1 fica só na fila
+    do paho, QoS 0 só no buffer; nada chega duas vezes após reconectar
+    """
+    broker = FakeBroker()
+    client = _client(broker)
+    assert client.connect(timeout=1)
+    
+    broker.up = False
+    for i in range(5):
+        assert client.publish_control_data({'erro': float(i)})
+    stats = client.buffer_stats()
+    # Depois do primeiro QoS 0 no buffer, as seguintes esperam atrás dele (ordem)
+    assert stats['paho_queued'] == 1 and stats['pending'] == 9
+    
+    client.client.drop()
+    for i in range(5, 10):
+        assert client.publish_control_data({'erro': float(i)})
+    broker.start()
+    
+    control = [m['erro'] for m in broker.messages('control')]
+    assert sorted(control) == [float(i) for i in range(10)]
+    assert broker.messages('temp') == [float(i) for i in range(10)]
+    assert len(broker.received) == 20
+    print(f"   • Janela de desconexão: {len(control)} mensagens de controle, sem duplicatas")
+    
+    # Fila do paho limitada a buffer_size: cheia, a mensagem vai para o buffer
+    small = _client(FakeBroker(), buffer_size=3)
+    assert small.connect(timeout=1)
+    small.client.broker.up = False
+    for i in range(5):
+        assert small.publish_alert({'level': i})
+    stats = small.buffer_stats()
+    assert stats['paho_queued'] == 3 and stats['pending'] == 2
+    small.client.drop()
+    small.client.broker.start()
+    # No on_connect a fila do paho ainda está cheia: o buffer sai no envio seguinte
+    assert small.publish_alert({'level': 5})
+    levels = [json.loads(payload)['level'] for _, payload, _, _ in small.client.broker.on('alert')]
+    assert levels == [0, 1, 2, 3, 4, 5]
+
+
+def test_bounded_buffer_keeps_latest():
+    """Buffer circular limitado: descarta as mais antigas e reenvia as mais novas"""
+    broker = FakeBroker()
+    client = _client(broker, buffer_size=50)
+    client.connect()
+    broker.stop()
+    
+    for i in range(100):
+        client.publish_control_data({'erro': float(i)})
+    stats = client.buffer_stats()
+    assert stats['pending'] == 50 and stats['dropped'] == 150
+    
+    broker.start()
+    assert [m['erro'] for m in broker.messages('control')] == [float(i) for i in range(75, 100)]
+
+
+def test_simulation_through_outage():
+    """Simulação com publicação em lotes durante a queda: registros chegam após reconectar"""
+    broker = FakeBroker(up=False)
+    client = _client(broker)
+    client.connect()
+    
+    with BatchPublisher(client, batch_size=20, linger=0.01) as publisher:
+        simulation = TemporalSimulation(FuzzyController(), publisher)
+        simulation.run_24h_simulation(verbose=False, seed=6)
+        assert publisher.flush(timeout=5)
+    
+    assert broker.received == []
+    broker.start()
+    records = [record for batch in broker.messages('control') for record in batch]
+    assert [r['time_minutes'] for r in records] == [float(t) for t in range(0, 1441, 5)]
+    assert publisher.stats()['failed'] == 0
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("🧪 TESTE DE RESILIÊNCIA MQTT (RECONEXÃO E BUFFER OFFLINE)")
+    print("=" * 70)
+    test_connect_is_non_blocking_and_replays()
+    test_broker_restart_loses_nothing()
+    test_publish_errors_are_not_buffered()
+    test_disconnect_window_no_duplicates()
+    test_bounded_buffer_keeps_latest()
+    test_simulation_through_outage()
+    print("✅ Todos os testes passaram!")
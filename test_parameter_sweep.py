@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Teste da varredura de parâmetros em vários processos (ParameterSweep)
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import csv
+import os
+import tempfile
+
+from fuzzy_controler.fuzzy_engine import FuzzyController
+from simulation.physical_model import PhysicalModel
+from simulation.temporal_simulation import TemporalSimulation
+from simulation.sweep import ParameterSweep
+
+GRID = {
+    'setpoint': [21.0, 23.0],
+    'carga_base': [30.0, 60.0],
+    'seed': [0, 1],
+    'b': [-0.08, -0.1]
+}
+
+
+def test_grid_expansion():
+    """O produto cartesiano completa os parâmetros omitidos com DEFAULTS"""
+    scenarios = ParameterSweep.expand_grid(GRID)
+    assert len(scenarios) == 16
+    assert all(s['temp_externa_base'] == ParameterSweep.DEFAULTS['temp_externa_base'] for s in scenarios)
+    assert {(s['setpoint'], s['b']) for s in scenarios} == {(21.0, -0.08), (21.0, -0.1), (23.0, -0.08), (23.0, -0.1)}
+    
+    try:
+        ParameterSweep({'ganho': [1.0]})
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Parâmetro desconhecido deveria gerar ValueError")
+
+
+def test_process_pool_matches_sequential():
+    """Pool de processos e execução sequencial produzem a mesma tabela"""
+    parallel = ParameterSweep(GRID, max_workers=2, chunksize=3).run()
+    sequential = ParameterSweep(GRID, max_workers=1).run()
+    
+    assert len(parallel['rmse']) == 16
+    for column in parallel:
+        assert parallel[column] == sequential[column], column
+    
+    # Confere um cenário contra a simulação direta
+    params = ParameterSweep.expand_grid(GRID)[5]
+    simulation = TemporalSimulation(
+        FuzzyController(), setpoint=params['setpoint'],
+        model=PhysicalModel(**{k: params[k] for k in PhysicalModel.COEFFICIENTS})
+    )
+    metrics = simulation.calculate_metrics(simulation.run_24h_simulation(
+        params['temp_inicial'], params['temp_externa_base'], params['carga_base'],
+        verbose=False, seed=params['seed']
+    ))
+    for name, value in metrics.items():
+        assert parallel[name][5] == value, name
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'sweep.csv')
+        ParameterSweep.save_csv(parallel, path)
+        with open(path) as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 16 and float(rows[5]['rmse']) == parallel['rmse'][5]
+    
+    print(f"   • {len(parallel['rmse'])} cenários: RMSE entre "
+          f"{min(parallel['rmse']):.3f} e {max(parallel['rmse']):.3f}")
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("🧪 TESTE DA VARREDURA DE PARÂMETROS")
+    print("=" * 70)
+    test_grid_expansion()
+    test_process_pool_matches_sequential()
+    print("✅ Todos os testes passaram!")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Teste do cache em disco de resultados de simulação (SimulationResultCache)
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import os
+import tempfile
+import time
+import numpy as np
+
+from fuzzy_controler.fuzzy_engine import FuzzyController
+from simulation.temporal_simulation import TemporalSimulation
+from simulation.physical_model import PhysicalModel
+from simulation.result_cache import SimulationResultCache
+
+SCENARIO = dict(temp_inicial=24.0, temp_externa_base=27.0, carga_base=50.0, seed=7)
+
+
+def _run(simulation):
+    results = simulation.run_24h_simulation(verbose=False, **SCENARIO)
+    return results, simulation.calculate_metrics(results)
+
+
+def test_round_trip_and_hit():
+    """Resultado armazenado volta idêntico e sem recalcular"""
+    simulation = TemporalSimulation(FuzzyController())
+    
+    with tempfile.TemporaryDirectory() as directory:
+        cache = SimulationResultCache(directory)
+        key = cache.scenario_key(simulation, **SCENARIO)
+        
+        start = time.perf_counter()
+        results, metrics, hit = cache.get_or_run(key, lambda: _run(simulation))
+        cold = time.perf_counter() - start
+        assert not hit
+        
+        start = time.perf_counter()
+        cached, cached_metrics, hit = cache.get_or_run(key, lambda: _run(simulation))
+        warm = time.perf_counter() - start
+        assert hit
+        print(f"   • Simulação {cold * 1000:.1f} ms, cache {warm * 1000:.1f} ms")
+        
+        assert cached_metrics == metrics
+        assert cached.setpoint == results.setpoint
+        for column in results.keys():
+            assert np.array_equal(cached[column], results[column]), column
+        assert cached.to_dict() == results.to_dict()
+        
+        stats = cache.stats()
+        assert stats['hits'] == 1 and stats['misses'] == 1 and stats['size'] == 1
+
+
+def test_key_depends_on_scenario_model_and_rules():
+    """Qualquer mudança de parâmetros, modelo ou controlador muda a chave"""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = SimulationResultCache(directory)
+        simulation = TemporalSimulation(FuzzyController())
+        key = cache.scenario_key(simulation, **SCENARIO)
+        
+        assert key == cache.scenario_key(TemporalSimulation(FuzzyController()), **SCENARIO)
+        assert key != cache.scenario_key(simulation, **dict(SCENARIO, seed=8))
+        assert key != cache.scenario_key(simulation, **dict(SCENARIO, carga_base=51.0))
+        assert key != cache.scenario_key(TemporalSimulation(FuzzyController(), setpoint=23.0), **SCENARIO)
+        assert key != cache.scenario_key(
+            TemporalSimulation(FuzzyController(), model=PhysicalModel(e=3.6)), **SCENARIO
+        )
+        assert key != cache.scenario_key(
+            TemporalSimulation(FuzzyController(defuzzification='centroid_analytic')), **SCENARIO
+        )
+        
+        # Arquivo corrompido conta como falha (e é recalculado)
+        with open(os.path.join(directory, key + '.npz'), 'wb') as f:
+            f.write(b'corrompido')
+        assert cache.get(key) is None
+
+
+def test_lru_eviction_by_size():
+    """Acima de max_bytes as entradas usadas há mais tempo são descartadas"""
+    simulation = TemporalSimulation(FuzzyController())
+    results, metrics = _run(simulation)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        cache = SimulationResultCache(directory)
+        cache.put('a', results, metrics)
+        entry_size = cache.stats()['bytes']
+        cache.max_bytes = int(entry_size * 2.5)
+        
+        cache.put('b', results, metrics)
+        os.utime(os.path.join(directory, 'a.npz'), (0, 0))
+        os.utime(os.path.join(directory, 'b.npz'), (1, 1))
+        assert cache.get('a') is not None  # 'a' passa a ser a mais recente
+        cache.put('c', results, metrics)
+        
+        assert cache.get('b') is None
+        assert cache.get('a') is not None and cache.get('c') is not None
+        stats = cache.stats()
+        assert stats['evictions'] == 1 and stats['bytes'] <= cache.max_bytes
+        print(f"   • Entrada comprimida: {entry_size / 1024:.1f} KiB "
+              f"(colunas: {results.nbytes / 1024:.1f} KiB)")
+        
+        cache.clear()
+        assert cache.stats()['size'] == 0
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("🧪 TESTE DO CACHE DE RESULTADOS DE SIMULAÇÃO")
+    print("=" * 70)
+    test_round_trip_and_hit()
+    test_key_depends_on_scenario_model_and_rules()
+    test_lru_eviction_by_size()
+    print("✅ Todos os testes passaram!")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Teste da simulação em streaming (iter_simulation) e das métricas online
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import csv
+import os
+import tempfile
+import numpy as np
+
+from fuzzy_controler.fuzzy_engine import FuzzyController
+from simulation.temporal_simulation import TemporalSimulation
+from simulation.metrics import OnlineMetrics
+from simulation.streaming import CSVStepWriter, MQTTStepPublisher, consume
+from testing_utils import RecordingMQTTClient
+
+
+def test_stream_matches_full_simulation():
+    """O stream (blocos de chunk_size passos) reproduz run_24h_simulation"""
+    simulation = TemporalSimulation(FuzzyController())
+    full = simulation.run_24h_simulation(25.0, 28.0, 60.0, verbose=False, seed=11)
+    
+    metrics = OnlineMetrics()
+    steps = list(simulation.iter_simulation(
+        temp_inicial=25.0, temp_externa_base=28.0, carga_base=60.0, seed=11
+    ))
+    for step in steps:
+        metrics.add_step(step)
+    
+    assert len(steps) == len(full)
+    for column in full.keys():
+        assert np.array_equal([getattr(step, column) for step in steps], full[column]), column
+    
+    expected = simulation.calculate_metrics(full)
+    for name, value in metrics.result().items():
+        assert abs(value - expected[name]) < 1e-9 * max(1.0, abs(expected[name])), name
+    
+    # Tamanho de bloco não muda a sequência (1441 passos não é múltiplo de 100)
+    for chunk_size in (1, 100, 5000):
+        chunked = simulation.iter_simulation(temp_inicial=25.0, temp_externa_base=28.0,
+                                             carga_base=60.0, seed=11, chunk_size=chunk_size)
+        steps = [(step.temp_externa, step.carga_termica) for step in chunked]
+        assert steps == list(zip(full['temp_externa'].tolist(), full['carga_termica'].tolist())), chunk_size
+
+
+def test_multi_day_stream_with_consumers():
+    """Uma semana em blocos: métricas, arquivo CSV e MQTT plugados no stream"""
+    mqtt_client = RecordingMQTTClient()
+    simulation = TemporalSimulation(FuzzyController(), mqtt_client)
+    days = 7
+    
+    metrics = OnlineMetrics()
+    publisher = MQTTStepPublisher(simulation, interval_minutes=30)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'semana.csv')
+        with CSVStepWriter(path, every=60) as writer:
+            count = consume(
+                simulation.iter_simulation(days * 1440, dt=1, seed=5),
+                metrics.add_step, writer.write, publisher.publish
+            )
+        with open(path) as f:
+            rows = list(csv.DictReader(f))
+    
+    assert count == days * 1440 + 1
+    assert len(rows) == days * 24 + 1 and float(rows[-1]['time']) == days * 1440
+    assert len(mqtt_client.messages) == days * 48 + 1
+    
+    result = metrics.result()
+    assert metrics.count == count
+    assert 18 < result['avg_temp'] < 26 and result['min_temp'] <= result['max_temp']
+    print(f"   • {days} dias ({count} passos): RMSE {result['rmse']:.3f}, "
+          f"{result['percent_in_range']:.1f}% na faixa")
+
+
+
+def test_online_metrics_merge_and_batch():
+    """Acumuladores parciais (por bloco ou por amostra) combinados = trajetória inteira"""
+    simulation = TemporalSimulation(FuzzyController())
+    live = OnlineMetrics()
+    results = simulation.run_24h_simulation(verbose=False, seed=2, live_metrics=live)
+    expected = simulation.calculate_metrics(results)
+    
+    # Quatro "workers", cada um com um trecho da trajetória
+    parts = []
+    for chunk in np.array_split(np.arange(len(results)), 4):
+        part = OnlineMetrics()
+        if chunk[0] % 2:
+            part.update_batch(results['temperature'][chunk], results['erro'][chunk],
+                              results['power_crac'][chunk])
+        else:
+            for k in chunk:
+                part.update(results['temperature'][k], results['erro'][k], results['power_crac'][k])
+        parts.append(part)
+    merged = OnlineMetrics.combine(parts)
+    
+    for accumulator in (live, merged):
+        assert accumulator.count == len(results)
+        for name, value in accumulator.result().items():
+            assert abs(value - expected[name]) < 1e-9 * max(1.0, abs(expected[name])), name
+    
+    assert OnlineMetrics().snapshot() is None
+    assert live.snapshot()['samples'] == len(results)
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("🧪 TESTE DA SIMULAÇÃO EM STREAMING")
+    print("=" * 70)
+    test_stream_matches_full_simulation()
+    test_multi_day_stream_with_consumers()
+    test_online_metrics_merge_and_batch()
+    print("✅ Todos os testes passaram!")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Teste da superfície de controle pré-calculada (SurfaceLUT)
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import os
+import tempfile
+import numpy as np
+
+from fuzzy_controler.fuzzy_engine import FuzzyController
+from fuzzy_controler.surface_lut import SurfaceLUT
+
+# Grade pequena para o teste rodar rápido
+POINTS = (11, 11, 6, 6)
+
+
+def test_lut_exact_on_grid_nodes():
+    """Nos nós da grade a interpolação deve reproduzir a inferência exata"""
+    fuzzy = FuzzyController()
+    lut = SurfaceLUT.build(fuzzy, POINTS, error_samples=500)
+    
+    rng = np.random.default_rng(0)
+    nodes = [axis[rng.integers(0, axis.size, 200)] for axis in lut.axes]
+    exact = fuzzy.calculate_batch(*nodes, use_lut=False)
+    
+    assert np.max(np.abs(lut.interpolate(*nodes) - exact)) < 1e-9
+    for k in range(20):
+        assert abs(lut.interpolate(*[float(n[k]) for n in nodes]) - exact[k]) < 1e-9
+    
+    # Estatísticas por amostragem (não é um limite), com o número de amostras
+    estimate = lut.error_estimate
+    print(f"   • Grade {lut.table.shape}: erro máx amostrado {estimate['max_abs_sampled']:.2f} "
+          f"({estimate['samples']} pontos), médio {estimate['mean_abs']:.3f}, "
+          f"p99 {estimate['p99_abs']:.2f}, acima de 5: {estimate['fraction_over_threshold']:.1%}")
+    assert estimate['samples'] == 500
+    assert estimate['mean_abs'] <= estimate['rms'] <= estimate['max_abs_sampled']
+    assert 0 <= estimate['fraction_over_threshold'] <= 1
+
+
+def test_lut_mode_and_persistence():
+    """Modo SurfaceLUT no controlador e tabela salva/carregada com mmap"""
+    fuzzy = FuzzyController()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'surface')
+        lut = SurfaceLUT.load_or_build(fuzzy, path, POINTS)
+        assert os.path.exists(path + '.npy') and os.path.exists(path + '.json')
+        
+        loaded = SurfaceLUT.load_or_build(fuzzy, path, POINTS)
+        assert isinstance(loaded.table, np.memmap)
+        assert loaded.error_estimate == lut.error_estimate
+        
+        fuzzy.use_surface_lut(loaded)
+        rng = np.random.default_rng(1)
+        inputs = [rng.uniform(*fuzzy.INPUT_RANGES[v], 50) for v in SurfaceLUT.INPUTS]
+        
+        batch = fuzzy.calculate_batch(*inputs)
+        scalar = [fuzzy.calculate(*[x[k] for x in inputs]) for k in range(50)]
+        assert np.max(np.abs(batch - lut.interpolate(*inputs))) < 1e-9
+        assert np.max(np.abs(batch - np.array(scalar))) < 1e-9
+        assert fuzzy.get_inference_details()['activated_rules_count'] == 0
+        
+        # Tabela de outra configuração não pode ser usada
+        other = FuzzyController(defuzzification='centroid_analytic')
+        try:
+            other.use_surface_lut(loaded)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("SurfaceLUT de outra configuração deveria gerar ValueError")
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("🧪 TESTE DA SURFACE LUT")
+    print("=" * 70)
+    test_lut_exact_on_grid_nodes()
+    test_lut_mode_and_persistence()
+    print("✅ Todos os testes passaram!")
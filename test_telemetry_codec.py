@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Teste do formato binário compacto de telemetria MQTT (telemetry_codec)
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import json
+import time
+import numpy as np
+
+from fuzzy_controler.fuzzy_engine import FuzzyController
+from simulation.temporal_simulation import TemporalSimulation
+from mqtt import telemetry_codec
+from mqtt.mqtt_client import MQTTClient
+from testing_utils import FakePahoClient, RecordingMQTTClient
+
+
+def _simulation_records():
+    client = RecordingMQTTClient()
+    TemporalSimulation(FuzzyController(), client).run_24h_simulation(verbose=False, seed=2)
+    return client.messages
+
+
+def test_round_trip_and_size():
+    """Registros da simulação voltam iguais (precisão float32) e bem menores que JSON"""
+    records = _simulation_records()
+    payload = telemetry_codec.encode(records)
+    decoded = telemetry_codec.decode(payload)
+    
+    assert len(decoded) == len(records)
+    for original, record in zip(records, decoded):
+        assert record.keys() == original.keys() and record['type'] == 'simulation'
+        assert record['timestamp'] == original['timestamp']
+        for field in ('time_minutes', 'temperature', 'power_crac', 'erro', 'setpoint'):
+            assert abs(record[field] - original[field]) <= 1e-6 * max(1.0, abs(original[field])), field
+    
+    single_json = np.mean([len(json.dumps(r)) for r in records])
+    single_binary = len(telemetry_codec.encode(records[:1]))
+    batch_json = len(json.dumps(records))
+    print(f"   • Por registro: JSON {single_json:.0f} B, binário {single_binary} B; "
+          f"lote de {len(records)}: JSON {batch_json} B, binário {len(payload)} B")
+    assert single_binary * 4 < single_json and len(payload) * 5 < batch_json
+    
+    start = time.perf_counter()
+    for record in records:
+        json.dumps(record)
+    json_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for record in records:
+        telemetry_codec.encode([record])
+    binary_time = time.perf_counter() - start
+    print(f"   • Codificação por registro: JSON {json_time / len(records) * 1e6:.1f} µs, "
+          f"binário {binary_time / len(records) * 1e6:.1f} µs")
+    
+    control = {'erro': 1.5, 'delta_erro': -0.25, 'temp_externa': 30.0, 'carga_termica': 60.0,
+               'potencia_crac': 71.25, 'timestamp': 1700000000.123}
+    assert telemetry_codec.decode(telemetry_codec.encode([control])) == [control]
+    # Registro único (objeto) volta como dicionário, igual ao JSON
+    assert telemetry_codec.decode(telemetry_codec.encode(control)) == control
+
+
+def test_invalid_payloads():
+    """Registros sem esquema e pacotes corrompidos geram ValueError"""
+    record = _simulation_records()[0]
+    payload = telemetry_codec.encode([record])
+    bad_payloads = [
+        payload[:4],
+        payload[:-1],
+        payload[:2] + bytes([99]) + payload[3:],     # versão
+        payload[:3] + bytes([99]) + payload[4:],     # esquema
+        # registro único (objeto) com dois registros no corpo
+        telemetry_codec.HEADER.pack(telemetry_codec.MAGIC, telemetry_codec.VERSION, 1 | telemetry_codec.SINGLE, 2)
+        + payload[telemetry_codec.HEADER.size:] * 2,
+        b'{"erro": 1.0}'
+    ]
+    for bad in bad_payloads:
+        try:
+            telemetry_codec.decode(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"Payload inválido aceito: {bad!r}")
+    
+    for records in ([], [{'type': 'simulation_complete', 'metrics': {}}],
+                    [record, dict(record, extra=1.0)]):
+        try:
+            telemetry_codec.encode(records)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Registros sem esquema binário comum aceitos")
+
+
+def test_client_payload_format():
+    """MQTTClient binário: controle compacto, JSON para o resto, decodificável pelo subscriber"""
+    records = _simulation_records()[:3]
+    completion = {'type': 'simulation_complete', 'metrics': {'rmse': 0.5}}
+    
+    published = {}
+    for payload_format in MQTTClient.PAYLOAD_FORMATS:
+        client = MQTTClient(payload_format=payload_format, client_factory=FakePahoClient)
+        client.connect()
+        assert client.publish_control_data(records[0])
+        assert client.publish_batch(records)
+        assert client.publish_control_data(completion)
+        published[payload_format] = client.client.broker.received
+    
+    assert published['json'][0][1] == json.dumps(records[0]).encode()
+    binary = [payload for topic, payload, _, _ in published['binary'] if topic.endswith('/control')]
+    assert telemetry_codec.is_binary(binary[0]) and telemetry_codec.is_binary(binary[1])
+    assert telemetry_codec.decode_payload(binary[1])[2]['time_minutes'] == records[2]['time_minutes']
+    # Mesma forma nos dois formatos: objeto para publish_control_data, lista para publish_batch
+    for payload_format in MQTTClient.PAYLOAD_FORMATS:
+        control = [payload for topic, payload, _, _ in published[payload_format] if topic.endswith('/control')]
+        assert isinstance(telemetry_codec.decode_payload(control[0]), dict)
+        assert isinstance(telemetry_codec.decode_payload(control[1]), list)
+    assert telemetry_codec.decode_payload(binary[2]) == completion
+    assert telemetry_codec.decode_payload(b'0.25') == 0.25
+    
+    try:
+        MQTTClient(payload_format='xml')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Formato de payload desconhecido deveria gerar ValueError")
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("🧪 TESTE DO FORMATO BINÁRIO DE TELEMETRIA")
+    print("=" * 70)
+    test_round_trip_and_size()
+    test_invalid_payloads()
+    test_client_payload_format()
+    print("✅ Todos os testes passaram!")
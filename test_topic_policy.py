@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Teste das políticas de publicação por tópico MQTT (QoS, retain,
+limite de taxa e coalescência)
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import time
+
+from mqtt.mqtt_client import MQTTClient
+from mqtt.topic_policy import TopicPolicy, TopicRateLimiter
+from testing_utils import FakePahoClient
+
+
+def _client(**policies):
+    client = MQTTClient(client_factory=FakePahoClient, policies=policies)
+    client.connect()
+    return client
+
+
+def test_default_qos_per_topic():
+    """temp sai com QoS 0; control e alert continuam com QoS 1"""
+    client = _client()
+    client.publish_control_data({'erro': 0.5})
+    client.publish_alert({'level': 'critical'})
+    
+    qos = {topic.rsplit('/', 1)[-1]: q for topic, _, q, _ in client.client.broker.received}
+    assert qos == {'control': 1, 'temp': 0, 'alert': 1}
+    
+    client = _client(alert=TopicPolicy(qos=2, retain=True))
+    client.publish_alert({'level': 'critical'})
+    assert client.client.broker.on('alert')[0][2:] == (2, True)
+
+
+def test_rate_limit_and_coalescing():
+    """Rajada de 1000 amostras: descartadas acima do limite ou coalescidas no valor mais recente"""
+    client = _client(temp=TopicPolicy(qos=0, min_interval=0.05, coalesce=True),
+                     control=TopicPolicy(qos=1, min_interval=10.0))
+    
+    for i in range(1000):
+        client.publish_control_data({'erro': float(i)})
+    temp = client.client.broker.on('temp')
+    assert [payload for _, payload, _, _ in temp] == [b'0.0']
+    time.sleep(0.15)
+    temp = client.client.broker.on('temp')
+    assert [payload for _, payload, _, _ in temp] == [b'0.0', b'999.0']
+    assert len(client.client.broker.on('control')) == 1
+    
+    stats = client.topic_stats()
+    assert stats['temp']['sent'] == 2 and stats['temp']['coalesced'] == 998
+    assert stats['control']['limited'] == 999
+    print(f"   • 1000 amostras -> temp: {stats['temp']['sent']} publicações, "
+          f"control: {stats['control']['sent']}")
+    
+    # flush_pending (e disconnect) publica na hora o valor guardado
+    client.publish_control_data({'erro': -1.0})
+    client.flush_pending()
+    assert client.client.broker.on('temp')[-1][1] == b'-1.0'
+    client.disconnect()
+    assert client.topic_stats()['temp']['pending'] is False
+
+
+def test_rate_limiter_decisions():
+    """Decisões do limitador com relógio controlado"""
+    limiter = TopicRateLimiter(TopicPolicy(min_interval=1.0, coalesce=True))
+    assert limiter.offer('a', now=10.0) == ('send', 0)
+    assert limiter.offer('b', now=10.25) == ('defer', 0.75)
+    assert limiter.offer('c', now=10.5) == ('coalesced', None)
+    assert limiter.take_pending(now=11.0) == 'c'
+    assert limiter.offer('d', now=11.5) == ('defer', 0.5)
+    
+    limiter = TopicRateLimiter(TopicPolicy(min_interval=1.0))
+    assert limiter.offer('a', now=0.0)[0] == 'send'
+    assert limiter.offer('b', now=0.5)[0] == 'drop'
+    assert limiter.offer('c', now=1.0)[0] == 'send'
+    
+    for invalid in (dict(qos=3), dict(min_interval=-1)):
+        try:
+            TopicPolicy(**invalid)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"Política inválida aceita: {invalid}")
+    try:
+        _client(status=TopicPolicy())
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Política para tópico desconhecido deveria gerar ValueError")
+
+
+if __name__ == '__main__':
+    print("=" * 70)
+    print("🧪 TESTE DAS POLÍTICAS DE PUBLICAÇÃO POR TÓPICO")
+    print("=" * 70)
+    test_default_qos_per_topic()
+    test_rate_limit_and_coalescing()
+    test_rate_limiter_decisions()
+    print("✅ Todos os testes passaram!")
@@ -0,0 +1,163 @@
+"""
+Utilitários compartilhados pelos testes: entradas aleatórias do controlador
+e substitutos do MQTT (cliente que só grava, broker e cliente paho em processo)
+"""
+
+import numpy as np
+import paho.mqtt.client as mqtt
+
+from mqtt.telemetry_codec import decode_payload
+
+
+def random_inputs(n, seed=0, within_universes=False):
+    """
+    Entradas aleatórias (erro, delta_erro, temp_externa, carga_termica), um
+    array por variável. Por padrão incluem valores fora dos universos
+    (saturação); within_universes=True fica dentro deles
+    """
+    rng = np.random.default_rng(seed)
+    if within_universes:
+        ranges = ((-10, 10), (-5, 5), (10, 35), (0, 100))
+    else:
+        ranges = ((-12, 12), (-6, 6), (8, 37), (-5, 105))
+    return tuple(rng.uniform(low, high, n) for low, high in ranges)
+
+
+class RecordingMQTTClient:
+    """Cliente MQTT falso: sempre conectado, só guarda os dados de controle publicados"""
+    
+    def __init__(self):
+        self.messages = []
+    
+    def is_connected(self):
+        return True
+    
+    def publish_control_data(self, data):
+        self.messages.append(data)
+        return True
+
+
+class FakeBroker:
+    """
+    Broker MQTT em processo: guarda cada publicação (tópico, payload, qos, retain)
+    e a entrega aos clientes com assinatura compatível; pode ser parado e reiniciado
+    """
+    
+    def __init__(self, up=True):
+        self.up = up
+        self.received = []
+        self.clients = []
+    
+    def publish(self, topic, payload, qos=0, retain=False):
+        payload = payload.encode() if isinstance(payload, str) else payload
+        self.received.append((topic, payload, qos, retain))
+        for client in self.clients:
+            client.deliver(topic, payload)
+    
+    def stop(self):
+        self.up = False
+        for client in self.clients:
+            client.drop()
+    
+    def start(self):
+        self.up = True
+        for client in self.clients:
+            client.try_connect()
+    
+    def restart(self):
+        self.stop()
+        self.start()
+    
+    def on(self, name):
+        """Publicações cujo último nível do tópico é name"""
+        return [entry for entry in self.received if entry[0].rsplit('/', 1)[-1] == name]
+    
+    def messages(self, name):
+        """Payloads decodificados (binário, JSON ou texto) publicados em name"""
+        return [decode_payload(payload) for _, payload, _, _ in self.on(name)]
+
+
+class FakePahoClient:
+    """
+    Substituto do paho.mqtt.client.Client ligado a um FakeBroker (loop síncrono:
+    os callbacks rodam na thread de quem conecta/publica). Sem broker, cria um
+    Como o paho 1.6.1, guarda publicações QoS>=1 que falham por falta de conexão
+    (fila limitada por max_queued_messages_set) e as reenvia após o on_connect
+    """
+    
+    def __init__(self, broker=None):
+        self.broker = broker if broker is not None else FakeBroker()
+        self.on_connect = None
+        self.on_disconnect = None
+        self.reconnect_delay = None
+        self.callbacks = {}
+        self.subscriptions = set()
+        self.max_queued = 0
+        self._out_messages = []
+        self._connected = False
+    
+    def max_queued_messages_set(self, queue_size):
+        self.max_queued = queue_size
+    
+    def reconnect_delay_set(self, min_delay=1, max_delay=120):
+        self.reconnect_delay = (min_delay, max_delay)
+    
+    def connect_async(self, host, port=1883, keepalive=60):
+        self.broker.clients.append(self)
+    
+    def loop_start(self):
+        self.try_connect()
+    
+    def loop_stop(self):
+        pass
+    
+    def disconnect(self):
+        self._connected = False
+        self.on_disconnect(self, None, 0)
+    
+    def is_connected(self):
+        return self._connected
+    
+    def try_connect(self):
+        if self.broker.up and not self._connected:
+            self._connected = True
+            self.on_connect(self, None, {}, 0)
+            queued, self._out_messages = self._out_messages, []
+            for topic, payload, qos, retain in queued:
+                self.broker.publish(topic, payload, qos, retain)
+    
+    def drop(self):
+        """Queda da conexão; sessão limpa: o broker esquece as assinaturas"""
+        if self._connected:
+            self._connected = False
+            self.subscriptions.clear()
+            self.on_disconnect(self, None, 1)
+    
+    def message_callback_add(self, sub, callback):
+        self.callbacks[sub] = callback
+    
+    def subscribe(self, topic, qos=0):
+        self.subscriptions.add(topic)
+    
+    def publish(self, topic, payload, qos=0, retain=False):
+        # Mesma validação do paho
+        if '+' in topic or '#' in topic:
+            raise ValueError('Publish topic cannot contain wildcards.')
+        info = mqtt.MQTTMessageInfo(len(self.broker.received))
+        if qos > 0 and self.max_queued and len(self._out_messages) >= self.max_queued:
+            info.rc = mqtt.MQTT_ERR_QUEUE_SIZE
+            return info
+        if not (self._connected and self.broker.up):
+            if qos > 0:
+                self._out_messages.append((topic, payload, qos, retain))
+            info.rc = mqtt.MQTT_ERR_NO_CONN
+            return info
+        self.broker.publish(topic, payload, qos, retain)
+        return info
+    
+    def deliver(self, topic, payload):
+        for sub, callback in list(self.callbacks.items()):
+            if sub in self.subscriptions and mqtt.topic_matches_sub(sub, topic):
+                message = mqtt.MQTTMessage(topic=topic.encode())
+                message.payload = payload
+                callback(self, None, message)